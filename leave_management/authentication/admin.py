@@ -1,6 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
+from .models import Team
+
 CustomUser = get_user_model()
 
 admin.site.register(CustomUser)
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ['name', 'department', 'min_staffing']
+    list_filter = ['department']
+    search_fields = ['name', 'department']
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_delete
 
 
 class AuthenticationConfig(AppConfig):
     name = 'authentication'
+
+    def ready(self):
+        from authentication.hierarchy import detach_reports
+        from authentication.models import CustomUser
+
+        # Keep the reporting closure table correct when a manager is deleted
+        pre_delete.connect(detach_reports, sender=CustomUser, dispatch_uid='authentication_detach_reports')
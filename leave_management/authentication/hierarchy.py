@@ -0,0 +1,194 @@
+"""
+Reporting hierarchy for Leave Management.
+
+CustomUser.manager holds each user's direct manager. ReportingLine is its
+closure table: one row per (ancestor, descendant) pair at every depth,
+plus a depth-0 row pairing each user with themselves. "Everyone under X"
+is then a single indexed lookup on ancestor, whatever the depth, and
+manager-scoped leave queries are one subquery join.
+
+The table is maintained incrementally from CustomUser.save() and from a
+pre_delete signal; moving a user rewrites only the rows linking their
+subtree to the ancestors above it. ``rebuild_reporting_lines`` recomputes
+everything (after bulk updates that bypass save()).
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from authentication.models import CustomUser, ReportingLine
+from leaves.versions import HIERARCHY_VERSION_KEY, bump_data_version, get_data_version
+
+
+class ReportingCycle(ValueError):
+    """Raised when a user would end up reporting to themselves."""
+
+
+def add_user(user):
+    """Create the closure rows of a newly saved user."""
+    ReportingLine.objects.create(ancestor=user, descendant=user, depth=0)
+    if user.manager_id:
+        _attach(user.pk, user.manager_id)
+    bump_data_version(HIERARCHY_VERSION_KEY)
+
+
+def _attach(user_id, manager_id):
+    """Link the subtree rooted at ``user_id`` below ``manager_id`` and its ancestors."""
+    subtree = list(ReportingLine.objects.filter(ancestor_id=user_id).values_list('descendant_id', 'depth'))
+    above = list(ReportingLine.objects.filter(descendant_id=manager_id).values_list('ancestor_id', 'depth'))
+    ReportingLine.objects.bulk_create([
+        ReportingLine(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=up + down + 1)
+        for ancestor_id, up in above
+        for descendant_id, down in subtree
+    ], batch_size=1000)
+
+
+def _detach(user_id):
+    """Remove the rows linking the subtree rooted at ``user_id`` to anyone above it."""
+    subtree = ReportingLine.objects.filter(ancestor_id=user_id).values('descendant_id')
+    ReportingLine.objects.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+
+def move_subtree(user, manager_id):
+    """
+    Re-parent ``user`` (and everyone under them) to ``manager_id``.
+
+    Call inside the transaction that saves the new manager.
+
+    Args:
+        user: CustomUser whose manager changed
+        manager_id: New manager's id, or None for no manager
+
+    Raises:
+        ReportingCycle: If the new manager reports to ``user``
+    """
+    if manager_id is not None and ReportingLine.objects.filter(ancestor_id=user.pk, descendant_id=manager_id).exists():
+        raise ReportingCycle(f'{user.username} cannot report to someone in their own reporting line')
+
+    _detach(user.pk)
+    if manager_id is not None:
+        _attach(user.pk, manager_id)
+    bump_data_version(HIERARCHY_VERSION_KEY)
+
+
+def detach_reports(sender, instance, **kwargs):
+    """
+    pre_delete handler: the direct reports of a deleted user lose their
+    manager (SET_NULL), so unlink their subtrees first.
+    """
+    for report in CustomUser.objects.filter(manager_id=instance.pk):
+        _detach(report.pk)
+    bump_data_version(HIERARCHY_VERSION_KEY)
+
+
+def rebuild_reporting_lines():
+    """
+    Recompute the whole closure table from CustomUser.manager.
+
+    Returns:
+        int: Number of closure rows written
+
+    Raises:
+        ReportingCycle: If the manager links contain a cycle
+    """
+    managers = dict(CustomUser.objects.values_list('id', 'manager_id'))
+    rows = []
+    for user_id in managers:
+        ancestor_id, depth, seen = user_id, 0, set()
+        while ancestor_id is not None:
+            if ancestor_id in seen:
+                raise ReportingCycle(f'Reporting cycle through user {ancestor_id}')
+            seen.add(ancestor_id)
+            rows.append(ReportingLine(ancestor_id=ancestor_id, descendant_id=user_id, depth=depth))
+            ancestor_id, depth = managers.get(ancestor_id), depth + 1
+
+    with transaction.atomic():
+        ReportingLine.objects.all().delete()
+        ReportingLine.objects.bulk_create(rows, batch_size=1000)
+        bump_data_version(HIERARCHY_VERSION_KEY)
+    return len(rows)
+
+
+# Scoping -------------------------------------------------------------------
+
+def sees_everyone(user):
+    """Admins (and superusers) are not restricted to a reporting line."""
+    return user.is_superuser or getattr(user, 'role', None) == 'ADMIN'
+
+
+def is_team_manager(user):
+    """Managers (unlike admins) are scoped to their reporting line."""
+    return getattr(user, 'role', None) == 'MANAGER'
+
+
+def team_usernames(user):
+    """
+    Usernames of ``user`` and everyone reporting to them at any depth.
+
+    Returns:
+        QuerySet: ``values('username')`` subquery, for ``__in`` filters
+    """
+    return CustomUser.objects.filter(ancestor_lines__ancestor_id=user.pk).values('username')
+
+
+def scope_leaves(queryset, user, field='Employee_Name'):
+    """
+    Restrict a leave queryset to what ``user`` may see.
+
+    - Admins: everything
+    - Managers: their own leaves and those of their direct and indirect reports
+    - Everyone else: their own leaves
+
+    Args:
+        queryset: Leave_Record, Archived_Leave_Record or Daily_Absence queryset
+        user: CustomUser, or None for anonymous requests
+        field: Name of the field holding the employee's username
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    if user is None or not user.is_authenticated:
+        return queryset.none()
+    if sees_everyone(user):
+        return queryset
+    if is_team_manager(user):
+        return queryset.filter(**{f'{field}__in': team_usernames(user)})
+    return queryset.filter(**{field: user.username})
+
+
+def scope_key(user):
+    """
+    Identify what ``user`` can see, for sharing results between users with
+    the same visibility (all admins share one scope).
+    """
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    if sees_everyone(user):
+        return 'all'
+    if is_team_manager(user):
+        # The team changes whenever reporting lines move
+        return f'team:{user.pk}:{get_data_version(HIERARCHY_VERSION_KEY)}'
+    return f'user:{user.username}'
+
+
+def scope_users(queryset, user):
+    """Restrict a CustomUser queryset the same way as scope_leaves."""
+    if user is None or not user.is_authenticated:
+        return queryset.none()
+    if sees_everyone(user):
+        return queryset
+    if is_team_manager(user):
+        return queryset.filter(ancestor_lines__ancestor_id=user.pk)
+    return queryset.filter(pk=user.pk)
+
+
+def can_see_employee(user, username):
+    """Whether ``user`` may see the leaves of the employee ``username``."""
+    if user is None:
+        return False
+    if sees_everyone(user) or username == user.username:
+        return True
+    if is_team_manager(user):
+        return ReportingLine.objects.filter(
+            Q(ancestor_id=user.pk) & Q(descendant__username=username)
+        ).exists()
+    return False
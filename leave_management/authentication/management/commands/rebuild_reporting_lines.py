@@ -0,0 +1,22 @@
+"""
+Recompute the reporting closure table from CustomUser.manager.
+
+    python manage.py rebuild_reporting_lines
+
+The table is maintained on every save(); run this after bulk updates of
+the manager column (queryset.update(), imports, direct database edits).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.hierarchy import ReportingCycle, rebuild_reporting_lines
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ReportingLine rows from each user\'s manager'
+
+    def handle(self, *args, **options):
+        try:
+            total = rebuild_reporting_lines()
+        except ReportingCycle as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total} reporting line(s)'))
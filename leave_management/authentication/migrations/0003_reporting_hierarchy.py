@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_self_lines(apps, schema_editor):
+    """Every existing user gets its depth-0 closure row (nobody has a manager yet)."""
+    CustomUser = apps.get_model('authentication', 'CustomUser')
+    ReportingLine = apps.get_model('authentication', 'ReportingLine')
+    ReportingLine.objects.bulk_create([
+        ReportingLine(ancestor_id=user_id, descendant_id=user_id, depth=0)
+        for user_id in CustomUser.objects.values_list('id', flat=True)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_customuser_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='manager',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='direct_reports', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='ReportingLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_lines', to=settings.AUTH_USER_MODEL)),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_lines', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='authenticat_descend_39aa5a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_reporting_line')],
+            },
+        ),
+        migrations.RunPython(create_self_lines, migrations.RunPython.noop),
+    ]
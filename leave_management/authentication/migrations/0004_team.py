@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_reporting_hierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('department', models.CharField(blank=True, db_index=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['department', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='team',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='members', to='authentication.team'),
+        ),
+    ]
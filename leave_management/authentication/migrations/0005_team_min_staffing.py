@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_team'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='min_staffing',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 
@@ -9,6 +10,29 @@ class Role(models.TextChoices):
     EMPLOYEE = 'EMPLOYEE', 'Employee'
 
 
+class Team(models.Model):
+    """
+    A team, grouped into departments.
+    
+    Each user belongs to at most one team; the team is copied onto their
+    leave records (Leave_Record.Team) so admin views can filter by team
+    with an index range scan instead of scanning every leave.
+
+    ``min_staffing``, if set, is the number of members that must remain at
+    work on every working day; leave requests that would leave fewer are
+    refused (leaves.conflicts).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    department = models.CharField(max_length=100, blank=True, db_index=True)
+    min_staffing = models.PositiveSmallIntegerField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['department', 'name']
+    
+    def __str__(self):
+        return f"{self.department} / {self.name}" if self.department else self.name
+
+
 class CustomUser(AbstractUser):
     username = models.CharField(max_length=50, unique=True)
     email = models.EmailField(max_length=100, unique=True)
@@ -22,6 +46,22 @@ class CustomUser(AbstractUser):
     )
     is_verified = models.BooleanField(default=False)
     
+    # Reporting line - ReportingLine keeps the full chain for fast lookups
+    manager = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='direct_reports',
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='members',
+    )
+    
     # Social auth fields
     social_id = models.CharField(max_length=100, blank=True, null=True)
     social_provider = models.CharField(max_length=20, blank=True, null=True)
@@ -40,6 +80,47 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return f"{self.email} ({self.get_role_display()})"
     
+    def clean(self):
+        super().clean()
+        if self.pk and self.manager_id:
+            if ReportingLine.objects.filter(ancestor_id=self.pk, descendant_id=self.manager_id).exists():
+                raise ValidationError({'manager': 'A user cannot report to someone in their own reporting line.'})
+    
+    def save(self, *args, **kwargs):
+        from authentication.hierarchy import add_user, move_subtree
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {'manager', 'team'} & set(update_fields):
+            # e.g. last_login updates - reporting line and team untouched
+            return super().save(*args, **kwargs)
+        
+        with transaction.atomic():
+            is_new = self._state.adding
+            old_manager_id = old_team_id = None
+            if not is_new:
+                old_manager_id, old_team_id = (
+                    CustomUser.objects.filter(pk=self.pk).values_list('manager_id', 'team_id').first()
+                    or (None, None)
+                )
+            super().save(*args, **kwargs)
+            if is_new:
+                add_user(self)
+            elif old_manager_id != self.manager_id:
+                move_subtree(self, self.manager_id)
+            if not is_new and old_team_id != self.team_id:
+                self.move_leaves_to_team()
+    
+    def move_leaves_to_team(self):
+        """
+        Copy the user's team onto their leave records.
+        
+        Only the hot table follows the user; archived leaves keep the team
+        they had when they were archived.
+        """
+        from leaves.models import Leave_Record
+        
+        Leave_Record.objects.filter(Employee_Name=self.username).update(Team=self.team_id)
+    
     @property
     def is_admin(self):
         return self.role == Role.ADMIN or self.is_superuser
@@ -51,3 +132,28 @@ class CustomUser(AbstractUser):
     @property
     def is_employee(self):
         return self.role == Role.EMPLOYEE
+
+
+class ReportingLine(models.Model):
+    """
+    Closure table of the reporting hierarchy.
+    
+    One row per (ancestor, descendant) pair at any depth, including each
+    user paired with themselves at depth 0, so "everyone under X" is a
+    single indexed lookup on ancestor. Maintained by authentication.hierarchy
+    whenever a user's manager changes.
+    """
+    ancestor = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='descendant_lines')
+    descendant = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='ancestor_lines')
+    depth = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='unique_reporting_line'),
+        ]
+        indexes = [
+            models.Index(fields=['descendant', 'depth']),
+        ]
+    
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
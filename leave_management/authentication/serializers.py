@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from .models import CustomUser, Role
+from .models import CustomUser, Role, Team
+
+
+class TeamSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Team
+        fields = ['id', 'name', 'department', 'min_staffing']
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -8,9 +14,9 @@ class UserSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
-            'role', 'is_verified', 'is_active', 'created_at', 'updated_at'
+            'role', 'manager', 'team', 'is_verified', 'is_active', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'is_verified', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'manager', 'team', 'is_verified', 'created_at', 'updated_at']
 
 
 class LoginSerializer(serializers.Serializer):
@@ -1,3 +1,165 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.hierarchy import (
+    ReportingCycle, can_see_employee, rebuild_reporting_lines, scope_key,
+)
+from authentication.models import CustomUser, ReportingLine, Team
+
+
+def make_user(username, role='EMPLOYEE', manager=None, team=None):
+    return CustomUser.objects.create_user(
+        username=username, email=f'{username}@example.com', password=None,
+        role=role, manager=manager, team=team,
+    )
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def weekday_after(days):
+    day = date.today() + timedelta(days=days)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def submit(user, day):
+    return client_for(user).post('/leaves/leaves/', {
+        'Employee_Name': user.username, 'Leave_Type': 'SICK',
+        'Start_Date': day.isoformat(), 'End_Date': day.isoformat(),
+    }, format='json')
+
+
+def closure(user):
+    """Usernames at or below ``user``, with their depth."""
+    return set(
+        ReportingLine.objects.filter(ancestor=user).values_list('descendant__username', 'depth')
+    )
+
+
+class HierarchyTests(TestCase):
+    """The closure table follows manager changes and scopes visibility."""
+
+    def setUp(self):
+        self.admin = make_user('admin', role='ADMIN')
+        self.director = make_user('director', role='MANAGER')
+        self.lead = make_user('lead', role='MANAGER', manager=self.director)
+        self.dev = make_user('dev', manager=self.lead)
+        self.other = make_user('other')
+
+    def test_closure_follows_manager_changes(self):
+        self.assertEqual(closure(self.director), {('director', 0), ('lead', 1), ('dev', 2)})
+        self.lead.manager = self.other
+        self.lead.save()
+        self.assertEqual(closure(self.director), {('director', 0)})
+        self.assertEqual(closure(self.other), {('other', 0), ('lead', 1), ('dev', 2)})
+
+        rows = set(ReportingLine.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+        rebuild_reporting_lines()
+        self.assertEqual(set(ReportingLine.objects.values_list('ancestor_id', 'descendant_id', 'depth')), rows)
+
+    def test_cycles_are_refused(self):
+        self.director.manager = self.dev
+        with self.assertRaises(ReportingCycle):
+            self.director.save()
+
+    def test_deleting_a_manager_detaches_their_reports(self):
+        self.lead.delete()
+        self.assertEqual(closure(self.director), {('director', 0)})
+        self.assertEqual(closure(self.dev), {('dev', 0)})
+
+    def test_visibility(self):
+        self.assertTrue(can_see_employee(self.director, 'dev'))
+        self.assertFalse(can_see_employee(self.director, 'other'))
+        self.assertFalse(can_see_employee(self.dev, 'lead'))
+        self.assertTrue(can_see_employee(self.admin, 'other'))
+
+        for user in (self.dev, self.other):
+            submit(user, weekday_after(30))
+        names = [leave['Employee_Name'] for leave in client_for(self.director).get('/leaves/leaves/').json()]
+        self.assertEqual(names, ['dev'])
+
+    def test_scope_key_changes_with_the_reporting_line(self):
+        key = scope_key(self.director)
+        self.assertEqual(scope_key(self.admin), 'all')
+        self.assertEqual(scope_key(self.dev), 'user:dev')
+        self.dev.manager = None
+        self.dev.save()
+        self.assertNotEqual(scope_key(self.director), key)
+
+
+class SetManagerViewTests(TestCase):
+
+    def setUp(self):
+        self.admin = make_user('admin', role='ADMIN')
+        self.manager = make_user('manager', role='MANAGER')
+        self.employee = make_user('employee')
+        self.client = client_for(self.admin)
+
+    def post(self, client=None, **data):
+        return (client or self.client).post('/api/auth/manager/', data, format='json')
+
+    def test_sets_and_clears_the_manager(self):
+        response = self.post(user_id=self.employee.id, manager_id=self.manager.id)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn(('employee', 1), closure(self.manager))
+        self.assertEqual(self.post(user_id=self.employee.id, manager_id=None).status_code, 200)
+        self.assertEqual(closure(self.manager), {('manager', 0)})
+
+    def test_errors(self):
+        self.assertEqual(self.post(client_for(self.manager), user_id=self.employee.id).status_code, 403)
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post(user_id='abc').status_code, 400)
+        self.assertEqual(self.post(user_id=self.employee.id, manager_id='abc').status_code, 400)
+        self.assertEqual(self.post(user_id=999999).status_code, 404)
+        self.post(user_id=self.manager.id, manager_id=self.employee.id)
+        self.assertEqual(self.post(user_id=self.employee.id, manager_id=self.manager.id).status_code, 400)
+
+
+class TeamTests(TestCase):
+    """Leaves carry their employee's team, and follow team moves."""
+
+    def setUp(self):
+        self.admin = make_user('admin', role='ADMIN')
+        self.backend = Team.objects.create(name='Backend', department='Engineering')
+        self.sales = Team.objects.create(name='Field', department='Sales')
+        self.dev = make_user('dev', team=self.backend)
+        self.seller = make_user('seller', team=self.sales)
+        self.client = client_for(self.admin)
+        self.leave_ids = {user.username: submit(user, weekday_after(30)).json()['id'] for user in (self.dev, self.seller)}
+
+    def names(self, **params):
+        return sorted(leave['Employee_Name'] for leave in self.client.get('/leaves/leaves/', params).json())
+
+    def test_filter_by_team_and_department(self):
+        self.assertEqual(self.names(Team=self.backend.id), ['dev'])
+        self.assertEqual(self.names(Team__department='Sales'), ['seller'])
+
+    def test_moving_a_user_moves_their_leaves(self):
+        response = self.client.post('/api/auth/team/', {'user_id': self.dev.id, 'team_id': self.sales.id}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.names(Team__department='Sales'), ['dev', 'seller'])
+        self.client.post('/api/auth/team/', {'user_id': self.dev.id, 'team_id': None}, format='json')
+        self.assertEqual(self.names(Team=self.sales.id), ['seller'])
+
+    def test_set_team_errors(self):
+        url = '/api/auth/team/'
+        self.assertEqual(client_for(self.dev).post(url, {'user_id': self.dev.id}, format='json').status_code, 403)
+        for data, code in (
+            ({}, 400),
+            ({'user_id': 'abc'}, 400),
+            ({'user_id': self.dev.id, 'team_id': 'abc'}, 400),
+            ({'user_id': self.dev.id, 'team_id': 999999}, 404),
+        ):
+            self.assertEqual(self.client.post(url, data, format='json').status_code, code, data)
 
-# Create your tests here.
+    def test_teams_list(self):
+        self.assertEqual(client_for(self.dev).get('/api/teams/').status_code, 403)
+        teams = self.client.get('/api/teams/').json()['teams']
+        self.assertEqual([team['name'] for team in teams], ['Backend', 'Field'])
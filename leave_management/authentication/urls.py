@@ -2,7 +2,7 @@ from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     LoginView, RegisterView, LogoutView, UserMeView,
-    PromoteUserView, UsersListView
+    PromoteUserView, SetManagerView, SetTeamView, TeamsListView, UsersListView
 )
 
 urlpatterns = [
@@ -11,7 +11,10 @@ urlpatterns = [
     path('auth/logout/', LogoutView.as_view(), name='logout'),
     path('auth/me/', UserMeView.as_view(), name='me'),
     path('auth/promote/', PromoteUserView.as_view(), name='promote'),
+    path('auth/manager/', SetManagerView.as_view(), name='set_manager'),
+    path('auth/team/', SetTeamView.as_view(), name='set_team'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('users/', UsersListView.as_view(), name='users'),
+    path('teams/', TeamsListView.as_view(), name='teams'),
 ]
 
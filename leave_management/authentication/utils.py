@@ -6,8 +6,11 @@ the application, including JWT token handling and user authentication.
 """
 
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Count, Q
 
-from authentication.models import CustomUser
+from authentication.hierarchy import scope_leaves
+from authentication.models import CustomUser, Team
+from leave_management.singleflight import coalesce
 from leaves.models import Leave_Record
 
 
@@ -76,10 +79,49 @@ def get_user_from_request(request):
     return None
 
 
+def leave_stats(user, params=None):
+    """
+    Leave statistics for a user, computed in a single query.
+    
+    Args:
+        user: CustomUser, or None
+        params: Optional query params (team, department)
+        
+    Returns:
+        dict: Leave statistics with total, pending, approved, rejected counts
+    """
+    if not user:
+        return {'total': 0, 'pending': 0, 'approved': 0, 'rejected': 0}
+    
+    params = params or {}
+    
+    # Admins count everything, managers their reporting line, employees their own
+    queryset = scope_leaves(Leave_Record.objects.all(), user)
+    
+    team = params.get('team')
+    if team and team.isdigit():
+        queryset = queryset.filter(Team_id=int(team))
+    department = params.get('department')
+    if department:
+        queryset = queryset.filter(Team__in=Team.objects.filter(department=department))
+    
+    # One pass over the rows instead of a COUNT per status
+    return queryset.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(Status='PENDING')),
+        approved=Count('id', filter=Q(Status='APPROVED')),
+        rejected=Count('id', filter=Q(Status='REJECTED')),
+    )
+
+
 def get_leave_stats(request):
     """
     Get leave statistics for the authenticated user.
     
+    Query params (optional):
+    - team: Team id
+    - department: Department name
+    
     Args:
         request: HTTP request object
         
@@ -88,18 +130,5 @@ def get_leave_stats(request):
     """
     user = get_user_from_request(request)
     
-    if not user:
-        return {'total': 0, 'pending': 0, 'approved': 0, 'rejected': 0}
-    
-    if user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER']:
-        queryset = Leave_Record.objects.all()
-    else:
-        queryset = Leave_Record.objects.filter(Employee_Name=user.username)
-    
-    return {
-        'total': queryset.count(),
-        'pending': queryset.filter(Status='PENDING').count(),
-        'approved': queryset.filter(Status='APPROVED').count(),
-        'rejected': queryset.filter(Status='REJECTED').count(),
-    }
-
+    # Identical concurrent requests (same params, scope and data) share one query
+    return coalesce('api_stats', request, user, lambda: leave_stats(user, request.GET))
@@ -9,9 +9,11 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.db import models
 
-from .models import CustomUser, Role
+from leave_management.db import replica_reads
+from .hierarchy import ReportingCycle, scope_users
+from .models import CustomUser, Role, Team
 from .serializers import (
-    UserSerializer, LoginSerializer, RegisterSerializer
+    UserSerializer, LoginSerializer, RegisterSerializer, TeamSerializer
 )
 
 
@@ -157,6 +159,117 @@ class PromoteUserView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
 
 
+class SetManagerView(APIView):
+    """
+    POST /api/auth/manager/
+    Set or clear a user's manager (admin only)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        # Check if current user is admin
+        if not (request.user.is_superuser or getattr(request.user, 'role', None) == 'ADMIN'):
+            return Response({
+                'error': 'Only admins can change reporting lines'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        user_id = request.data.get('user_id')
+        manager_id = request.data.get('manager_id')
+        
+        if not user_id:
+            return Response({
+                'error': 'user_id is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            user = CustomUser.objects.get(id=user_id)
+            manager = CustomUser.objects.get(id=manager_id) if manager_id else None
+        except (ValueError, TypeError):
+            return Response({
+                'error': 'user_id and manager_id must be user ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except CustomUser.DoesNotExist:
+            return Response({
+                'error': 'User not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        user.manager = manager
+        try:
+            user.save()
+        except ReportingCycle as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': f"{user.username} now reports to {manager.username if manager else 'nobody'}",
+            'user': UserSerializer(user).data
+        })
+
+
+class SetTeamView(APIView):
+    """
+    POST /api/auth/team/
+    Move a user to a team, or out of any team (admin only)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        # Check if current user is admin
+        if not (request.user.is_superuser or getattr(request.user, 'role', None) == 'ADMIN'):
+            return Response({
+                'error': 'Only admins can change teams'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        user_id = request.data.get('user_id')
+        team_id = request.data.get('team_id')
+        
+        if not user_id:
+            return Response({
+                'error': 'user_id is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            user = CustomUser.objects.get(id=user_id)
+            team = Team.objects.get(id=team_id) if team_id else None
+        except (ValueError, TypeError):
+            return Response({
+                'error': 'user_id and team_id must be ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except (CustomUser.DoesNotExist, Team.DoesNotExist):
+            return Response({
+                'error': 'User or team not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Also moves the user's leave records to the new team
+        user.team = team
+        user.save()
+        
+        return Response({
+            'message': f"{user.username} moved to {team.name if team else 'no team'}",
+            'user': UserSerializer(user).data
+        })
+
+
+class TeamsListView(APIView):
+    """
+    GET /api/teams/
+    List teams (admins and managers)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if not (request.user.is_superuser or getattr(request.user, 'role', None) in ['ADMIN', 'MANAGER']):
+            return Response({
+                'error': 'Only admins and managers can view teams'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        with replica_reads():
+            return Response({
+                'teams': TeamSerializer(Team.objects.all(), many=True).data
+            })
+
+
 class UsersListView(APIView):
     """
     GET /api/users/
@@ -171,10 +284,12 @@ class UsersListView(APIView):
                 'error': 'Only admins can view all users'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        users = CustomUser.objects.all().order_by('-created_at')
-        return Response({
-            'users': UserSerializer(users, many=True).data
-        })
+        with replica_reads():
+            # Managers see their reporting line, admins everyone
+            users = scope_users(CustomUser.objects.all(), request.user).order_by('-created_at')
+            return Response({
+                'users': UserSerializer(users, many=True).data
+            })
 
 
 class TokenRefreshView(APIView):
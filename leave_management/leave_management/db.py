@@ -0,0 +1,91 @@
+"""
+Database utilities for Leave Management.
+
+This module provides the SQLite connection-setup hook and the
+primary/replica database router used by the project settings.
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+REPLICA_ALIAS = 'replica'
+
+# Set while a read-only view is running; reads are then sent to the replica
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Apply the pragmas from settings.SQLITE_PRAGMAS to a new SQLite connection.
+
+    Connected to the ``connection_created`` signal, so it runs once per
+    physical connection (connections are persistent, see CONN_MAX_AGE).
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def replica_configured():
+    """Return True if a replica database alias is configured."""
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """
+    Send ORM reads made inside this block to the replica database.
+
+    Writes always go to the primary. Without a configured replica this
+    is a no-op.
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def read_only_view(view_func):
+    """
+    Decorator for read-only views (tables, stats, lists) that can be served
+    from the replica database.
+    """
+    @functools.wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads from read-only views to the replica and everything else
+    to the primary ('default') database.
+
+    Reads outside a ``replica_reads()`` block stay on the primary, so a
+    request that writes and then re-reads always sees its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is populated from the primary, never migrated directly
+        return db == 'default'
@@ -0,0 +1,57 @@
+"""
+Fast REST framework renderers.
+
+- ORJSONRenderer: drop-in replacement for DRF's JSONRenderer built on
+  orjson, which encodes dicts, lists, strings, numbers, dates, datetimes
+  and UUIDs in native code. Anything else (Decimal, lazy strings,
+  querysets, ...) goes through DRF's JSONEncoder, so responses are the
+  same as before apart from whitespace.
+- MessagePackRenderer: the same data as MessagePack, for clients that send
+  ``Accept: application/msgpack`` (or ``?format=msgpack``). Dates and
+  datetimes are sent as the same ISO 8601 strings as in JSON.
+"""
+import msgpack
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+_encoder = JSONEncoder()
+
+# orjson writes UTC as "Z", like DRF
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def encode_default(obj):
+    """Fallback for types the fast encoders do not handle natively."""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer using orjson; honours ``indent`` (as 2 spaces)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=encode_default, option=options)
+
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders the response data as MessagePack."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -55,7 +55,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, '..', 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -63,17 +62,64 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept in memory (filled at boot by
+            # leave_management.warmup); APP_DIRS is replaced by the
+            # app_directories loader
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'leave_management.wsgi.application'
 
-# Database - SQLite for development
+# Database - SQLite for development. The file is not tracked (connections
+# switch it to WAL); create it with `manage.py migrate`.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DATABASE_PATH', BASE_DIR / 'db.sqlite3'),
+        # Keep connections open between requests and check them before reuse
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock up front instead of failing on lock upgrade
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Optional read replica (e.g. a second SQLite file for local testing)
+DATABASE_REPLICA_PATH = os.environ.get('DATABASE_REPLICA_PATH')
+if DATABASE_REPLICA_PATH:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DATABASE_REPLICA_PATH,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['leave_management.db.PrimaryReplicaRouter']
+
+# Pragmas applied to every new SQLite connection (see leave_management.db)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),
+}
+
+# Cache - holds cached calendar feeds and read results. Data versions are
+# kept in the database (leaves.versions), so a per-process cache never
+# serves stale data; a shared backend (e.g. Redis) lets workers share hits.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'leave-management'),
     }
 }
 
@@ -118,6 +164,19 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    # orjson for JSON; MessagePack for clients that ask for it through
+    # Accept / Content-Type (see leave_management.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'leave_management.renderers.ORJSONRenderer',
+        'leave_management.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'leave_management.parsers.ORJSONParser',
+        'leave_management.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # JWT settings
@@ -146,3 +205,77 @@ CORS_ALLOW_CREDENTIALS = True
 
 # Allow all origins for development (uncomment for development only)
 # CORS_ALLOW_ALL_ORIGINS = True
+
+# Leave archival - closed leaves that ended this many days ago move to the archive table
+LEAVE_ARCHIVE_AFTER_DAYS = int(os.environ.get('LEAVE_ARCHIVE_AFTER_DAYS', 365))
+
+# Leave notifications - written to an outbox and sent by `manage.py dispatch_notifications`
+NOTIFICATIONS = {
+    # leaves.notifications.EmailBackend / ConsoleBackend / FileBackend, or a custom class
+    'BACKEND': os.environ.get('NOTIFICATION_BACKEND', 'leaves.notifications.ConsoleBackend'),
+    'FILE_PATH': os.environ.get('NOTIFICATION_FILE_PATH', BASE_DIR / 'notifications.log'),
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 30,
+    'RETRY_MAX_SECONDS': 3600,
+}
+
+# Leave reports - built by `manage.py run_report_jobs`, downloadable until they expire
+REPORTS = {
+    'DIR': os.environ.get('REPORTS_DIR', BASE_DIR / 'reports'),
+    'CHUNK_SIZE': 2000,
+    'TTL_SECONDS': int(os.environ.get('REPORTS_TTL_SECONDS', 86400)),
+    'CLAIM_TIMEOUT_SECONDS': 900,
+}
+
+# Email (used by leaves.notifications.EmailBackend)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'leaves@localhost')
+
+# Idempotency keys - responses to writes sent with an Idempotency-Key header
+# are replayed for retries within this many seconds
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+
+# Single-leave read cache - leave rows kept in memory per worker process
+# (see leaves.leave_cache); 0 disables it
+LEAVE_CACHE_SIZE = int(os.environ.get('LEAVE_CACHE_SIZE', 2048))
+
+# Change feed - tombstones of deleted leaves are kept this many days; clients
+# that last synced earlier must sync from the start (`manage.py purge_leave_tombstones`)
+LEAVE_TOMBSTONE_TTL_DAYS = int(os.environ.get('LEAVE_TOMBSTONE_TTL_DAYS', 90))
+
+# Calendar feed URLs stop working after this many days (0: never); users
+# fetch new ones from /leaves/calendar/feeds/. Changing the password also
+# revokes them.
+CALENDAR_FEED_MAX_AGE_DAYS = int(os.environ.get('CALENDAR_FEED_MAX_AGE_DAYS', 365))
+
+# Leave policies - compiled once at startup by leaves.policy; re-check stored
+# leaves after a change with `manage.py check_leave_policies`
+LEAVE_POLICIES = [
+    # {'name': 'casual-max-3', 'rule': 'max_days', 'days': 3, 'leave_types': ['CASUAL']},
+    # {'name': 'earned-notice', 'rule': 'notice', 'days': 14, 'leave_types': ['EARNED']},
+    # {'name': 'year-end-freeze', 'rule': 'blackout', 'start': '2026-12-24', 'end': '2026-12-31'},
+    # {'name': 'employee-sick-max', 'rule': 'max_days', 'days': 10, 'roles': ['EMPLOYEE'], 'leave_types': ['SICK']},
+]
+
+# Working days - weekday numbers (Monday=0) that never count as leave days
+LEAVE_WEEKEND_DAYS = (5, 6)
+
+# First and last year leaves may fall in; the working-day calendar never
+# grows past them
+LEAVE_YEAR_RANGE = (2000, 2100)
+
+# Worker warm-up - precompile templates, populate URL resolvers and build
+# serializers/filtersets when the WSGI/ASGI application is loaded
+WARM_UP_ON_BOOT = os.environ.get('WARM_UP_ON_BOOT', 'True').lower() in ('true', '1', 'yes')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'leave_management.warmup': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,140 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+Many admins looking at the same dashboard (plus debounced search and tab
+switches) send identical table and stats requests at the same moment.
+``coalesce`` lets the first of them (the leader) compute the result while
+identical requests that arrive before it finishes wait and share it,
+instead of each running the same queries and template render.
+
+Requests are identical when they have the same endpoint, normalized
+query params, visibility scope and data version. The data version moves
+on every committed leave write, so a request that starts after a write
+never receives a result computed before it.
+
+Coalescing is per worker process (threads of one process share results).
+Counters are kept per endpoint and reported by ``metrics()``.
+"""
+import threading
+from collections import defaultdict
+
+# Query params that never change the result (cache busters)
+IGNORED_PARAMS = frozenset({'t', '_'})
+
+# Followers give up waiting after this long and compute the result themselves
+WAIT_TIMEOUT = 10.0
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time; concurrent callers share it."""
+
+    def __init__(self, wait_timeout=WAIT_TIMEOUT):
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = defaultdict(lambda: {'leaders': 0, 'coalesced': 0, 'errors': 0, 'timeouts': 0})
+
+    def do(self, key, compute, name='default'):
+        """
+        Return ``compute()``, sharing one in-flight computation per ``key``.
+
+        If the leader fails, or does not finish within ``wait_timeout``,
+        waiting callers compute the result themselves.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters[name]['leaders'] += 1
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = compute()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.event.set()
+
+        if call.event.wait(self.wait_timeout) and call.error is None:
+            with self._lock:
+                self._counters[name]['coalesced'] += 1
+            return call.result
+
+        with self._lock:
+            self._counters[name]['errors' if call.event.is_set() else 'timeouts'] += 1
+        return compute()
+
+    def metrics(self):
+        """
+        Counters per endpoint name.
+
+        Returns:
+            dict: {'endpoints': name -> {'leaders', 'coalesced', 'errors',
+                'timeouts', 'requests', 'coalesced_ratio'}, 'in_flight': int}
+        """
+        with self._lock:
+            endpoints = {}
+            for name, counters in self._counters.items():
+                requests = sum(counters.values())
+                endpoints[name] = dict(
+                    counters,
+                    requests=requests,
+                    coalesced_ratio=round(counters['coalesced'] / requests, 4) if requests else 0.0,
+                )
+            return {'endpoints': endpoints, 'in_flight': len(self._calls)}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+single_flight = SingleFlight()
+
+
+def request_key(name, request, user):
+    """
+    Coalescing key for a read request.
+
+    Args:
+        name: Endpoint name
+        request: HTTP request (its GET params are normalized)
+        user: Authenticated user (None for anonymous) - determines scope
+
+    Returns:
+        tuple: Hashable key
+    """
+    from authentication.hierarchy import scope_key
+    from leaves.versions import get_data_version
+
+    params = tuple(sorted(
+        (param, tuple(values))
+        for param, values in request.GET.lists()
+        if param not in IGNORED_PARAMS
+    ))
+    return (name, params, scope_key(user), get_data_version())
+
+
+def coalesce(name, request, user, compute):
+    """Compute a read result once for all identical concurrent requests."""
+    return single_flight.do(request_key(name, request, user), compute, name=name)
+
+
+def metrics():
+    return single_flight.metrics()
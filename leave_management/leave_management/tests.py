@@ -0,0 +1,258 @@
+import io
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import msgpack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from leave_management.db import (
+    PrimaryReplicaRouter, apply_sqlite_pragmas, read_only_view, replica_configured, replica_reads,
+)
+from leave_management.parsers import MessagePackParser, ORJSONParser
+from leave_management.renderers import MessagePackRenderer, ORJSONRenderer
+from leave_management.singleflight import SingleFlight, request_key
+from leave_management.warmup import STEPS, warm_up
+
+
+def _pragmas(*names):
+    """Open a new connection (firing connection_created) and read pragmas from it."""
+    fresh = connections.create_connection('default')
+    try:
+        with fresh.cursor() as cursor:
+            values = []
+            for name in names:
+                cursor.execute(f'PRAGMA {name}')
+                values.append(cursor.fetchone()[0])
+            return values
+    finally:
+        fresh.close()
+
+
+class SqlitePragmaTests(TestCase):
+
+    def test_new_connections_get_the_configured_pragmas(self):
+        self.assertEqual(
+            _pragmas('busy_timeout', 'cache_size'),
+            [settings.SQLITE_PRAGMAS['busy_timeout'], settings.SQLITE_PRAGMAS['cache_size']],
+        )
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234, 'synchronous': 'FULL'})
+    def test_uses_the_current_settings(self):
+        self.assertEqual(_pragmas('busy_timeout', 'synchronous'), [1234, 2])
+
+    def test_other_databases_are_left_alone(self):
+        class OtherConnection:
+            vendor = 'postgresql'
+
+            def cursor(self):
+                raise AssertionError('no pragmas outside SQLite')
+
+        apply_sqlite_pragmas(sender=None, connection=OtherConnection())
+
+
+REPLICA_DATABASES = {
+    **settings.DATABASES,
+    'replica': {**settings.DATABASES['default'], 'NAME': 'replica.sqlite3'},
+}
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_without_replica_everything_uses_the_primary(self):
+        self.assertFalse(replica_configured())
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(None), 'default')
+
+    @override_settings(DATABASES=REPLICA_DATABASES)
+    def test_reads_go_to_the_replica_only_inside_replica_reads(self):
+        self.assertEqual(self.router.db_for_read(None), 'default')
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(None), 'replica')
+            self.assertEqual(self.router.db_for_write(None), 'default')
+        self.assertEqual(self.router.db_for_read(None), 'default')
+
+    @override_settings(DATABASES=REPLICA_DATABASES)
+    def test_read_only_view(self):
+        view = read_only_view(lambda request: self.router.db_for_read(None))
+        self.assertEqual(view(None), 'replica')
+        self.assertEqual(self.router.db_for_read(None), 'default')
+
+    def test_only_the_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate('default', 'leaves'))
+        self.assertFalse(self.router.allow_migrate('replica', 'leaves'))
+
+
+class WarmUpTests(SimpleTestCase):
+    """SimpleTestCase: warm-up must not touch the database."""
+
+    def test_runs_every_step(self):
+        with self.assertLogs('leave_management.warmup', 'INFO'):
+            report = warm_up()
+        self.assertEqual(list(report), [name for name, _ in STEPS] + ['total'])
+        self.assertGreater(report['templates']['compiled'], 0)
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 'result'
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('key', compute, name='table')))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let the followers join the leader before it finishes
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            call = flight._calls.get('key')
+            if call is not None and call.waiters == 3:
+                break
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((len(calls), results), (1, ['result'] * 4))
+        counters = flight.metrics()['endpoints']['table']
+        self.assertEqual((counters['leaders'], counters['coalesced'], counters['coalesced_ratio']), (1, 3, 0.75))
+        self.assertEqual(flight.metrics()['in_flight'], 0)
+
+    def test_followers_recompute_after_a_failure_or_timeout(self):
+        flight = SingleFlight(wait_timeout=0.01)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'leader'
+
+        leader = threading.Thread(target=flight.do, args=('key', slow))
+        leader.start()
+        started.wait(5)
+        self.assertEqual(flight.do('key', lambda: 'follower'), 'follower')
+        release.set()
+        leader.join()
+        self.assertEqual(flight.metrics()['endpoints']['default']['timeouts'], 1)
+
+        with self.assertRaises(ZeroDivisionError):
+            flight.do('other', lambda: 1 / 0)
+        self.assertEqual(flight.do('other', lambda: 'again'), 'again')
+
+
+class RequestKeyTests(TestCase):
+
+    def test_keys(self):
+        factory = RequestFactory()
+        User = get_user_model()
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        employee = User.objects.create_user(username='employee', email='employee@example.com', password=None)
+
+        key = request_key('table', factory.get('/', {'status': 'PENDING', 't': '1'}), admin)
+        self.assertEqual(key, request_key('table', factory.get('/', {'status': 'PENDING', '_': '2'}), admin))
+        self.assertNotEqual(key, request_key('table', factory.get('/', {'status': 'APPROVED'}), admin))
+        self.assertNotEqual(key, request_key('table', factory.get('/', {'status': 'PENDING'}), employee))
+
+
+class RendererTests(SimpleTestCase):
+    """orjson and MessagePack give the same data as DRF's JSON renderer."""
+
+    data = {
+        'id': 1,
+        'day': date(2030, 1, 2),
+        'moment': datetime(2030, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        'uuid': uuid.UUID(int=1),
+        'amount': Decimal('1.50'),
+        'label': gettext_lazy('Leave'),
+        'nested': [{'a': None, 'b': 1.5}],
+    }
+
+    def test_json_matches_drf(self):
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(ORJSONRenderer().render(self.data))),
+            ORJSONParser().parse(io.BytesIO(JSONRenderer().render(self.data))),
+        )
+        self.assertIn(b'"2030-01-02T03:04:05Z"', ORJSONRenderer().render(self.data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_json_escapes_line_separators(self):
+        self.assertEqual(ORJSONRenderer().render({'a': '\u2028\u2029'}), b'{"a":"\\u2028\\u2029"}')
+
+    def test_json_indent(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_msgpack_round_trip(self):
+        rendered = MessagePackRenderer().render(self.data)
+        parsed = MessagePackParser().parse(io.BytesIO(rendered))
+        self.assertEqual(parsed['day'], '2030-01-02')
+        self.assertEqual(parsed['amount'], 1.5)
+        self.assertEqual(parsed['label'], 'Leave')
+        self.assertEqual(parsed['nested'], [{'a': None, 'b': 1.5}])
+
+    def test_parse_errors(self):
+        for parser, body in (
+            (ORJSONParser(), b'{"a": '),
+            (ORJSONParser(), b'{"a": NaN}'),
+            (MessagePackParser(), b'\xc1'),
+            (MessagePackParser(), b'\x92\x01'),
+        ):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+    def test_json_in_other_encodings(self):
+        parsed = ORJSONParser().parse(io.BytesIO('{"a": "é"}'.encode('latin-1')), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(parsed, {'a': 'é'})
+
+
+class ContentNegotiationTests(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username='admin', email='admin@example.com', password=None, role='ADMIN',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_msgpack_request_and_response(self):
+        body = msgpack.packb({
+            'Employee_Name': 'admin', 'Leave_Type': 'SICK', 'Start_Date': '2031-03-03', 'End_Date': '2031-03-03',
+        })
+        response = self.client.post(
+            '/leaves/leaves/', body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['Start_Date'], '2031-03-03')
+
+        response = self.client.get('/leaves/leaves/', {'format': 'msgpack'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(msgpack.unpackb(response.content)), 1)
+
+        response = self.client.get('/leaves/leaves/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.json()), 1)
@@ -27,10 +27,13 @@ from leaves.htmx_views.htmx import (
     render_edit_leave_form,
     update_leave,
     cancel_leave,
+    render_absence_widget,
 )
+from leaves.htmx_views.bootstrap import dashboard_bootstrap
 
 # Import authentication utilities
 from authentication.utils import get_leave_stats
+from leave_management.db import read_only_view
 
 
 urlpatterns = [
@@ -44,6 +47,7 @@ urlpatterns = [
     # HTMX endpoints for admin dashboard
     path('htmx/leaves/', render_leaves_table, name='htmx_leaves'),
     path('htmx/leaves/<int:id>/', render_leave_detail, name='htmx_leave_detail'),
+    path('htmx/absences/', render_absence_widget, name='htmx_absences'),
     
     # HTMX endpoints for employee dashboard
     path('htmx/my-leaves/', render_my_leaves_table, name='htmx_my_leaves'),
@@ -52,6 +56,9 @@ urlpatterns = [
     path('htmx/my-leaves/<int:leave_id>/update/', update_leave, name='htmx_update_leave'),
     path('htmx/my-leaves/<int:leave_id>/cancel/', cancel_leave, name='htmx_cancel_leave'),
     
+    # Dashboard first paint (stats + leaves + users in one response)
+    path('api/bootstrap/', dashboard_bootstrap, name='api_bootstrap'),
+    
     # Stats endpoint
-    path('api/stats/', lambda request: JsonResponse(get_leave_stats(request)), name='api_stats'),
+    path('api/stats/', read_only_view(lambda request: JsonResponse(get_leave_stats(request))), name='api_stats'),
 ]
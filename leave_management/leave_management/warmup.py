@@ -0,0 +1,230 @@
+"""
+Worker warm-up for Leave Management.
+
+A fresh worker pays for a lot of one-off work on its first requests:
+template compilation, URL resolver population, model metadata, and the
+DRF serializer and django-filter FilterSet classes built for each view.
+``warm_up`` does all of it up front. The WSGI and ASGI entry modules call
+it right after the application is loaded (unless WARM_UP_ON_BOOT is off),
+so the cost moves from the first user requests to worker boot.
+
+Each step is timed and the timings are logged and returned, so cold and
+warm boots can be compared (``manage.py warm_up`` prints them).
+
+No database queries are made: workers may be forked after warm-up, and
+connections must not be shared between processes.
+"""
+import logging
+import os
+import time
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+logger = logging.getLogger(__name__)
+
+# Modules imported lazily by views and services on first use
+LAZY_MODULES = [
+    'leaves.absences',
+    'leaves.archive',
+    'leaves.calendar',
+    'leaves.notifications',
+    'leaves.rollups',
+    'leaves.services',
+    'leaves.workdays',
+    'rest_framework_simplejwt.authentication',
+    'rest_framework_simplejwt.tokens',
+]
+
+
+def _template_dirs(engine):
+    """Directories searched by the engine's loaders (inside the cached loader too)."""
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            if hasattr(inner, 'get_dirs'):
+                dirs.extend(str(directory) for directory in inner.get_dirs())
+    return dirs
+
+
+def _template_names(engine):
+    """Every template name the engine's loaders can find."""
+    names = set()
+    for directory in _template_dirs(engine):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt', '.xml', '.ics')):
+                    path = os.path.join(root, filename)
+                    names.add(os.path.relpath(path, directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    """
+    Compile every template into the cached loader.
+
+    Returns:
+        dict: compiled and failed counts (templates that only compile with
+            optional libraries, e.g. other admin themes, fail harmlessly)
+    """
+    compiled = failed = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for name in _template_names(engine):
+            try:
+                engine.get_template(name)
+                compiled += 1
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                failed += 1
+    return {'compiled': compiled, 'failed': failed}
+
+
+def _iter_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_patterns(pattern)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def warm_urls():
+    """
+    Import every view and populate the URL resolvers' reverse lookups.
+
+    Returns:
+        dict: number of URL patterns
+    """
+    resolver = get_resolver()
+    patterns = list(_iter_patterns(resolver))
+    # Builds the reverse/namespace dicts for the root and included resolvers
+    resolver.reverse_dict, resolver.namespace_dict, resolver.app_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            pattern.reverse_dict
+    return {'patterns': len(patterns)}
+
+
+def warm_models():
+    """
+    Build model metadata caches (field lists, reverse relations).
+
+    Returns:
+        dict: number of models
+    """
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+        model._meta.concrete_fields
+        model._meta.related_objects
+    return {'models': len(models)}
+
+
+def _api_views():
+    """DRF view classes reachable from the URLconf."""
+    views = []
+    for pattern in _iter_patterns(get_resolver()):
+        view_class = getattr(pattern.callback, 'cls', None)
+        if view_class is not None and view_class not in views:
+            views.append(view_class)
+    return views
+
+
+def warm_api():
+    """
+    Build the serializers and FilterSet classes of every DRF view.
+
+    Returns:
+        dict: serializer and filterset counts
+    """
+    from django_filters.rest_framework import DjangoFilterBackend
+
+    serializers = filtersets = 0
+    for view_class in _api_views():
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        if serializer_class is not None:
+            serializer_class().fields
+            serializer_class(many=True).child.fields
+            serializers += 1
+
+        queryset = getattr(view_class, 'queryset', None)
+        if queryset is None:
+            continue
+        querysets = [queryset]
+        archive_model = getattr(view_class, 'archive_model', None)
+        if archive_model is not None:
+            querysets.append(archive_model.objects.all())
+
+        view = view_class()
+        for backend_class in getattr(view_class, 'filter_backends', []):
+            if not issubclass(backend_class, DjangoFilterBackend):
+                continue
+            backend = backend_class()
+            for model_queryset in querysets:
+                filterset_class = backend.get_filterset_class(view, model_queryset)
+                if filterset_class is not None:
+                    filterset_class(data={}, queryset=model_queryset.none()).form
+                    filtersets += 1
+    return {'serializers': serializers, 'filtersets': filtersets}
+
+
+def warm_imports():
+    """
+    Import modules that are otherwise loaded on first use.
+
+    Returns:
+        dict: number of modules imported
+    """
+    for module in LAZY_MODULES:
+        import_module(module)
+    return {'modules': len(LAZY_MODULES)}
+
+
+STEPS = [
+    ('imports', warm_imports),
+    ('models', warm_models),
+    ('urls', warm_urls),
+    ('templates', warm_templates),
+    ('api', warm_api),
+]
+
+
+def warm_up():
+    """
+    Run every warm-up step and log its timing.
+
+    Returns:
+        dict: step name -> {'seconds': float, ...step counts}, plus 'total'
+    """
+    report = {}
+    started = time.perf_counter()
+    for name, step in STEPS:
+        step_started = time.perf_counter()
+        result = step()
+        result['seconds'] = round(time.perf_counter() - step_started, 4)
+        report[name] = result
+    report['total'] = {'seconds': round(time.perf_counter() - started, 4)}
+
+    # Nothing above should touch the database, but never hand an open
+    # connection to forked workers
+    connections.close_all()
+
+    logger.info(
+        'Worker warm-up finished in %.3fs (pid %s): %s',
+        report['total']['seconds'], os.getpid(),
+        ', '.join(f"{name} {result['seconds']:.3f}s" for name, result in report.items() if name != 'total'),
+    )
+    return report
+
+
+def warm_up_on_boot():
+    """Entry point for wsgi.py/asgi.py; honours settings.WARM_UP_ON_BOOT."""
+    if getattr(settings, 'WARM_UP_ON_BOOT', True):
+        warm_up()
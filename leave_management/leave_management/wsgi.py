@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'leave_management.settings')
 
 application = get_wsgi_application()
+
+# Precompile templates, resolve URLs and build serializers before the
+# first request (see leave_management/warmup.py)
+from leave_management.warmup import warm_up_on_boot  # noqa: E402
+
+warm_up_on_boot()
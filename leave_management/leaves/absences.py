@@ -0,0 +1,120 @@
+"""
+Materialized daily absence index for Leave Management.
+
+Daily_Absence holds one row per employee per day of every APPROVED leave.
+It is rewritten for a leave whenever the leave enters, leaves or changes
+while in the APPROVED state, inside the same transaction as the change.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+
+from leaves.models import Leave_Record, Daily_Absence
+
+
+def absence_rows(leave_id, employee, leave_type, start, end):
+    """Build the Daily_Absence rows for one approved leave."""
+    days = (end - start).days + 1
+    return [
+        Daily_Absence(Date=start + timedelta(days=offset), Employee_Name=employee, Leave_Type=leave_type, Leave_Id=leave_id)
+        for offset in range(days)
+    ]
+
+
+def sync_leave_absences(leave_id, leave=None):
+    """
+    Rewrite the absence rows of a single leave.
+
+    Args:
+        leave_id: Leave_Record id
+        leave: The leave's current state, or None if it was deleted;
+            rows are only written while it is APPROVED
+    """
+    Daily_Absence.objects.filter(Leave_Id=leave_id).delete()
+    if leave is not None and leave.Status == 'APPROVED':
+        Daily_Absence.objects.bulk_create(
+            absence_rows(leave_id, leave.Employee_Name, leave.Leave_Type, leave.Start_Date, leave.End_Date)
+        )
+
+
+def sync_many_absences(leaves):
+    """Rewrite absence rows for many leaves with one delete and one insert."""
+    leaves = list(leaves)
+    Daily_Absence.objects.filter(Leave_Id__in=[leave.id for leave in leaves]).delete()
+    rows = []
+    for leave in leaves:
+        if leave.Status == 'APPROVED':
+            rows.extend(absence_rows(leave.id, leave.Employee_Name, leave.Leave_Type, leave.Start_Date, leave.End_Date))
+    Daily_Absence.objects.bulk_create(rows, batch_size=1000)
+
+
+def rebuild_absences():
+    """
+    Recompute the whole index from approved leaves in Leave_Record.
+
+    Rows of archived leaves are kept; they can no longer change.
+
+    Returns:
+        int: Number of absence rows written
+    """
+    approved = (
+        Leave_Record.objects.filter(Status='APPROVED')
+        .values_list('id', 'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date')
+    )
+    with transaction.atomic():
+        Daily_Absence.objects.filter(
+            Leave_Id__in=Leave_Record.objects.values('id')
+        ).delete()
+        total = 0
+        rows = []
+        for row in approved.iterator(chunk_size=2000):
+            rows.extend(absence_rows(*row))
+            if len(rows) >= 5000:
+                Daily_Absence.objects.bulk_create(rows, batch_size=1000)
+                total += len(rows)
+                rows = []
+        Daily_Absence.objects.bulk_create(rows, batch_size=1000)
+        total += len(rows)
+    return total
+
+
+def absent_on(day, queryset=None):
+    """
+    Employees out on ``day``.
+
+    Args:
+        day: Date to look up
+        queryset: Daily_Absence queryset to read from (e.g. scoped to a team)
+
+    Returns:
+        QuerySet: Daily_Absence rows for that day, ordered by employee
+    """
+    queryset = Daily_Absence.objects.all() if queryset is None else queryset
+    return queryset.filter(Date=day).order_by('Employee_Name')
+
+
+def absence_counts(start, end, queryset=None):
+    """
+    Number of employees out on each day from ``start`` to ``end``.
+
+    Args:
+        start: First day
+        end: Last day
+        queryset: Daily_Absence queryset to count (e.g. scoped to a team)
+
+    Returns:
+        dict: date -> count (days with nobody out are included as 0)
+    """
+    queryset = Daily_Absence.objects.all() if queryset is None else queryset
+    counts = dict(
+        queryset
+        .filter(Date__gte=start, Date__lte=end)
+        .values('Date')
+        .annotate(total=Count('Employee_Name', distinct=True))
+        .values_list('Date', 'total')
+    )
+    return {
+        start + timedelta(days=offset): counts.get(start + timedelta(days=offset), 0)
+        for offset in range((end - start).days + 1)
+    }
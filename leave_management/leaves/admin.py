@@ -1,5 +1,197 @@
-from django.contrib import admin
-from .models import Leave_Record
+from datetime import date, datetime, time, timedelta
+
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Q
+from django.utils import formats, timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import capfirst
+
+from .audit import audited_atomic, leave_values, record_created, record_deleted, record_updated
+from .models import Leave_Record, Holiday, Leave_Audit_Event
+from .notifications import enqueue_leave_event
+from .rollups import snapshot
+from .services import leave_changed, transition_leaves
+
+
+# Changelist counts stop here ("10000+ leaves")
+COUNT_CAP = 10000
+
+# Keyset cursors: show the page older than / newer than this row
+AFTER_VAR = 'after'
+BEFORE_VAR = 'before'
+
+
+def _cursor(leave):
+    return f'{leave.Applied_On.isoformat()}_{leave.id}'
+
+
+def _parse_cursor(value):
+    moment, _, leave_id = value.rpartition('_')
+    moment = parse_datetime(moment)
+    if moment is None or not leave_id.isdigit():
+        raise IncorrectLookupParameters(f'Invalid page cursor {value!r}')
+    return moment, int(leave_id)
+
+
+def _next_period(day, kind):
+    if kind == 'year':
+        return date(day.year + 1, 1, 1)
+    if kind == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+
+def _periods(queryset, field_name, kind):
+    """
+    Distinct local years, months or days of ``field_name`` in ``queryset``.
+
+    Instead of a DISTINCT over every row, each period is found with one
+    ``ORDER BY field LIMIT 1`` seek on the field's index, starting after the
+    previous period.
+    """
+    periods = []
+    moment = None
+    while True:
+        rows = queryset if moment is None else queryset.filter(**{f'{field_name}__gte': moment})
+        found = rows.order_by(field_name).values_list(field_name, flat=True).first()
+        if found is None:
+            return periods
+        day = timezone.localtime(found).date()
+        if kind == 'year':
+            day = day.replace(month=1, day=1)
+        elif kind == 'month':
+            day = day.replace(day=1)
+        periods.append(day)
+        moment = timezone.make_aware(datetime.combine(_next_period(day, kind), time.min))
+
+
+class LeaveChangeList(ChangeList):
+    """
+    Changelist for large leave tables.
+
+    - Rows are paged with (Applied_On, id) keyset cursors instead of
+      OFFSET, so every page is one index range read.
+    - The row count is capped at COUNT_CAP.
+    - Date hierarchy choices come from index seeks (see ``_periods``).
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        lookup_params.pop(BEFORE_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        per_page = self.list_per_page
+        queryset = self.queryset
+        after = self.params.get(AFTER_VAR)
+        before = self.params.get(BEFORE_VAR)
+
+        if before:
+            moment, leave_id = _parse_cursor(before)
+            rows = list(
+                queryset.filter(Applied_On__gte=moment)
+                .filter(Q(Applied_On__gt=moment) | Q(id__gt=leave_id))
+                .order_by('Applied_On', 'id')[:per_page + 1]
+            )
+            has_newer, has_older = len(rows) > per_page, True
+            rows = rows[:per_page][::-1]
+        else:
+            if after:
+                moment, leave_id = _parse_cursor(after)
+                queryset = (
+                    queryset.filter(Applied_On__lte=moment)
+                    .filter(Q(Applied_On__lt=moment) | Q(id__lt=leave_id))
+                )
+            rows = list(queryset[:per_page + 1])
+            has_newer, has_older = bool(after), len(rows) > per_page
+            rows = rows[:per_page]
+
+        result_count = self.queryset.order_by()[:COUNT_CAP + 1].count()
+        self.result_count = min(result_count, COUNT_CAP)
+        self.result_count_capped = result_count > COUNT_CAP
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.result_list = rows
+        self.can_show_all = False
+        self.show_all = False
+        self.multi_page = has_newer or has_older
+        self.paginator = None
+
+        cursors = [AFTER_VAR, BEFORE_VAR]
+        self.newer_link = self.get_query_string({BEFORE_VAR: _cursor(rows[0])}, cursors) if has_newer and rows else None
+        self.older_link = self.get_query_string({AFTER_VAR: _cursor(rows[-1])}, cursors) if has_older and rows else None
+        self.date_links = self.get_date_links()
+
+    def get_date_links(self):
+        """Context of admin/date_hierarchy.html, like the admin's date_hierarchy tag."""
+        if not self.date_hierarchy:
+            return {'show': False}
+        field_name = self.date_hierarchy
+        year_field, month_field, day_field = (f'{field_name}__{part}' for part in ('year', 'month', 'day'))
+        year = self.params.get(year_field)
+        month = self.params.get(month_field)
+        day = self.params.get(day_field)
+
+        def link(filters):
+            return self.get_query_string(filters, [f'{field_name}__', AFTER_VAR, BEFORE_VAR])
+
+        if not (year or month or day):
+            # Start at the narrowest level that still has a choice
+            first = self.queryset.order_by(field_name).values_list(field_name, flat=True).first()
+            last = self.queryset.order_by(f'-{field_name}').values_list(field_name, flat=True).first()
+            if first and last:
+                first, last = timezone.localtime(first), timezone.localtime(last)
+                if first.year == last.year:
+                    year = first.year
+                    if first.month == last.month:
+                        month = first.month
+
+        if year and month and day:
+            selected = date(int(year), int(month), int(day))
+            return {
+                'show': True,
+                'back': {
+                    'link': link({year_field: year, month_field: month}),
+                    'title': capfirst(formats.date_format(selected, 'YEAR_MONTH_FORMAT')),
+                },
+                'choices': [{'title': capfirst(formats.date_format(selected, 'MONTH_DAY_FORMAT'))}],
+            }
+        if year and month:
+            return {
+                'show': True,
+                'back': {'link': link({year_field: year}), 'title': str(year)},
+                'choices': [
+                    {
+                        'link': link({year_field: year, month_field: month, day_field: period.day}),
+                        'title': capfirst(formats.date_format(period, 'MONTH_DAY_FORMAT')),
+                    }
+                    for period in _periods(self.queryset, field_name, 'day')
+                ],
+            }
+        if year:
+            return {
+                'show': True,
+                'back': {'link': link({}), 'title': 'All dates'},
+                'choices': [
+                    {
+                        'link': link({year_field: year, month_field: period.month}),
+                        'title': capfirst(formats.date_format(period, 'YEAR_MONTH_FORMAT')),
+                    }
+                    for period in _periods(self.queryset, field_name, 'month')
+                ],
+            }
+        return {
+            'show': True,
+            'back': None,
+            'choices': [
+                {'link': link({year_field: period.year}), 'title': str(period.year)}
+                for period in _periods(self.queryset, field_name, 'year')
+            ],
+        }
 
 
 @admin.register(Leave_Record)
@@ -7,23 +199,122 @@ class LeaveRecordAdmin(admin.ModelAdmin):
     """Admin configuration for Leave_Record model"""
     list_display = ['id', 'Employee_Name', 'Leave_Type', 'Status', 'Start_Date', 'End_Date', 'Applied_On']
     list_filter = ['Status', 'Leave_Type']
-    search_fields = ['Employee_Name', 'Reason']
-    ordering = ['-Applied_On']
-    readonly_fields = ['Applied_On']
+    # Facet counts would run one COUNT per filter choice
+    show_facets = admin.ShowFacets.NEVER
+    date_hierarchy = 'Applied_On'
+    search_fields = ['Employee_Name']
+    search_help_text = 'Employee name prefix (case-sensitive) or leave id'
+    # Keyset paging needs one fixed order, backed by the (Applied_On, id) index
+    ordering = ['-Applied_On', '-id']
+    sortable_by = ()
+    show_full_result_count = False
+    # Status only moves through the actions below (the state machine)
+    readonly_fields = ['Applied_On', 'No_of_Days', 'Status', 'Cancelled_By', 'Cancelled_On']
+    raw_id_fields = ['Team']
+    actions = ['approve_leaves', 'reject_leaves', 'cancel_leaves']
 
     # Organize fields in fieldsets
     fieldsets = (
         ('Employee Information', {
-            'fields': ('Employee_Name',)
+            'fields': ('Employee_Name', 'Team')
         }),
         ('Leave Details', {
-            'fields': ('Leave_Type', 'Start_Date', 'End_Date', 'No_of_Days', 'Reason')
+            'fields': ('Leave_Type', 'Start_Date', 'End_Date', 'No_of_Days')
         }),
         ('Status', {
             'fields': ('Status', 'Applied_On')
         }),
-        ('Manager Response', {
-            'fields': ('Manager_Response', 'Manager_Name', 'Responded_On', 'cancelled_by', 'cancelled_on'),
+        ('Cancellation', {
+            'fields': ('Cancelled_By', 'Cancelled_On'),
             'classes': ('collapse',)  # Collapsible section
         }),
     )
+
+    def get_changelist(self, request, **kwargs):
+        return LeaveChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match a leave id or an Employee_Name prefix.
+
+        The prefix is a plain range on the (Employee_Name, ...) index;
+        the default icontains search would scan every row.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        matches = Q(Employee_Name__gte=term, Employee_Name__lt=term + '\U0010ffff')
+        if term.isdigit():
+            matches |= Q(id=int(term))
+        return queryset.filter(matches), False
+
+    # Bulk actions move the selected leaves with one conditional UPDATE
+    def _transition(self, request, queryset, to_status):
+        moved = transition_leaves(queryset.values('id'), to_status, actor=request.user.username)
+        self.message_user(request, f'{moved} leave(s) {to_status.lower()}.', messages.SUCCESS)
+
+    @admin.action(description='Approve selected pending leaves', permissions=['change'])
+    def approve_leaves(self, request, queryset):
+        self._transition(request, queryset, 'APPROVED')
+
+    @admin.action(description='Reject selected pending leaves', permissions=['change'])
+    def reject_leaves(self, request, queryset):
+        self._transition(request, queryset, 'REJECTED')
+
+    @admin.action(description='Cancel selected leaves', permissions=['change'])
+    def cancel_leaves(self, request, queryset):
+        self._transition(request, queryset, 'CANCELLED')
+
+    # Admin edits are audited, rolled up and indexed like API edits
+    def save_model(self, request, obj, form, change):
+        with audited_atomic():
+            stored = Leave_Record.objects.select_for_update().get(pk=obj.pk) if change else None
+            super().save_model(request, obj, form, change)
+            if change:
+                leave_changed(snapshot(stored), obj)
+                record_updated(obj, leave_values(stored), leave_values(obj), actor=request.user.username)
+            else:
+                leave_changed(None, obj)
+                record_created(obj, actor=request.user.username)
+                enqueue_leave_event(obj, 'SUBMITTED', actor=request.user.username)
+
+    def delete_model(self, request, obj):
+        with audited_atomic():
+            stored = Leave_Record.objects.select_for_update().get(pk=obj.pk)
+            super().delete_model(request, obj)
+            leave_changed(snapshot(stored), None, leave_id=stored.pk)
+            record_deleted(stored.pk, leave_values(stored), actor=request.user.username)
+
+    def delete_queryset(self, request, queryset):
+        with audited_atomic():
+            deleted = list(queryset.select_for_update())
+            super().delete_queryset(request, queryset)
+            for leave in deleted:
+                leave_changed(snapshot(leave), None, leave_id=leave.pk)
+                record_deleted(leave.pk, leave_values(leave), actor=request.user.username)
+
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    """Admin configuration for Holiday model"""
+    list_display = ['Date', 'Name']
+    date_hierarchy = 'Date'
+
+
+@admin.register(Leave_Audit_Event)
+class LeaveAuditEventAdmin(admin.ModelAdmin):
+    """Read-only admin for the append-only audit log"""
+    list_display = ['Occurred_On', 'Leave_Id', 'Employee_Name', 'Action', 'Actor']
+    list_filter = ['Action']
+    search_fields = ['Employee_Name', 'Actor']
+    date_hierarchy = 'Occurred_On'
+    ordering = ['-Occurred_On', '-id']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class LeavesConfig(AppConfig):
     name = 'leaves'
+
+    def ready(self):
+        from leave_management.db import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='apply_sqlite_pragmas')
+
+        # Compile LEAVE_POLICIES now so a bad definition fails at startup
+        from leaves.policy import get_policy
+        get_policy()
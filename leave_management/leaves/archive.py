@@ -0,0 +1,162 @@
+"""
+Hot/cold archival for Leave Management.
+
+Closed leaves that ended before a cutoff are moved from Leave_Record (hot)
+into Archived_Leave_Record (cold) in small batches. Read paths that filter
+by date call ``reaches_archive`` to decide whether the archive must be
+consulted as well, so the common "current and upcoming" views never touch it.
+"""
+from datetime import timedelta
+from functools import cmp_to_key
+from heapq import merge
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from leaves.models import Leave_Record, Archived_Leave_Record
+
+
+CLOSED_STATUSES = ('APPROVED', 'REJECTED', 'CANCELLED')
+
+# Cache key for the latest End_Date held in the archive
+HORIZON_CACHE_KEY = 'leaves:archive:horizon'
+HORIZON_CACHE_TIMEOUT = 300
+
+# Query params that bound the date range (lower bounds can exclude the archive)
+LOWER_BOUND_PARAMS = ('Start_Date', 'Start_Date__gte', 'End_Date', 'End_Date__gte')
+UPPER_BOUND_PARAMS = ('Start_Date__lte', 'End_Date__lte')
+
+
+def default_cutoff():
+    """Leaves that ended before this date are eligible for archival."""
+    days = getattr(settings, 'LEAVE_ARCHIVE_AFTER_DAYS', 365)
+    return timezone.localdate() - timedelta(days=days)
+
+
+def archived_fields():
+    """Field names shared by the hot and the archive table."""
+    archive_names = {f.attname for f in Archived_Leave_Record._meta.concrete_fields}
+    return [f.attname for f in Leave_Record._meta.concrete_fields if f.attname in archive_names]
+
+
+def archive_closed_leaves(cutoff=None, batch_size=1000):
+    """
+    Move closed leaves ending before ``cutoff`` into the archive table.
+
+    Each batch is copied and deleted in its own short transaction, so other
+    writers are only blocked for one batch at a time.
+
+    Args:
+        cutoff: Date; leaves with End_Date before it are archived
+            (default: today minus settings.LEAVE_ARCHIVE_AFTER_DAYS)
+        batch_size: Number of rows moved per transaction
+
+    Returns:
+        int: Total number of leaves archived
+    """
+    cutoff = cutoff or default_cutoff()
+    fields = archived_fields()
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Leave_Record.objects
+                .filter(Status__in=CLOSED_STATUSES, End_Date__lt=cutoff)
+                .order_by('id')
+                .values(*fields)[:batch_size]
+            )
+            if not batch:
+                break
+
+            Archived_Leave_Record.objects.bulk_create(
+                [Archived_Leave_Record(**row) for row in batch],
+                ignore_conflicts=True,
+            )
+            Leave_Record.objects.filter(id__in=[row['id'] for row in batch]).delete(reason='ARCHIVED')
+
+        total += len(batch)
+
+    if total:
+        cache.delete(HORIZON_CACHE_KEY)
+    return total
+
+
+def archive_horizon():
+    """
+    Return the latest End_Date stored in the archive, or None if it is empty.
+
+    Cached, since it only moves when archive_closed_leaves runs.
+    """
+    horizon = cache.get(HORIZON_CACHE_KEY)
+    if horizon is None:
+        horizon = Archived_Leave_Record.objects.aggregate(latest=Max('End_Date'))['latest'] or ''
+        cache.set(HORIZON_CACHE_KEY, horizon, HORIZON_CACHE_TIMEOUT)
+    return horizon or None
+
+
+def reaches_archive(params):
+    """
+    Check whether a date filter can match archived leaves.
+
+    Requests without a date filter only see the hot table. A lower bound
+    after the archive horizon rules the archive out, since every archived
+    leave starts and ends on or before it.
+
+    Args:
+        params: Request query params (QueryDict or dict)
+
+    Returns:
+        bool: True if the archive must be read as well
+    """
+    has_date_filter = False
+
+    for name in LOWER_BOUND_PARAMS + UPPER_BOUND_PARAMS:
+        if params.get(name):
+            has_date_filter = True
+            break
+
+    if not has_date_filter:
+        return False
+
+    horizon = archive_horizon()
+    if horizon is None:
+        return False
+
+    for name in LOWER_BOUND_PARAMS:
+        value = parse_date(params.get(name) or '')
+        if value and value > horizon:
+            return False
+
+    return True
+
+
+def merge_records(sources, ordering):
+    """
+    Merge hot and archived records that are each already sorted by ``ordering``.
+
+    Lazy: rows are pulled from the sources one at a time, so slicing the
+    result only reads as far as the slice reaches.
+
+    Args:
+        sources: Iterables of Leave_Record / Archived_Leave_Record instances,
+            each ordered by ``ordering`` in the database
+        ordering: List of field names, '-' prefix for descending
+
+    Returns:
+        iterator: Records in ``ordering`` order
+    """
+    fields = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+
+    def compare(a, b):
+        for name, descending in fields:
+            x, y = getattr(a, name), getattr(b, name)
+            if x != y:
+                return (-1 if x < y else 1) * (-1 if descending else 1)
+        return 0
+
+    return merge(*sources, key=cmp_to_key(compare))
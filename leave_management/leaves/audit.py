@@ -0,0 +1,158 @@
+"""
+Audit log of leave changes for Leave Management.
+
+Every write path reports its changes with ``record_*``. Inside an
+``audited_atomic()`` block, events are buffered in memory and written
+with one bulk INSERT when the outermost audited block finishes, right
+before its transaction commits (or earlier, once AUDIT_BUFFER_SIZE events
+are waiting). The events therefore commit, or roll back, together with
+the change they describe. Outside such a block each event is inserted
+immediately.
+
+``audit_events`` is the query API (by leave, actor and time range).
+"""
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from django.db import transaction
+
+from leaves.models import Leave_Audit_Event
+
+
+# Events buffered before an early flush inside one transaction
+AUDIT_BUFFER_SIZE = 500
+
+# Leave columns captured in audit events
+AUDITED_FIELDS = (
+    'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date', 'Status',
+    'Cancelled_By', 'Cancelled_On', 'No_of_Days', 'Team_id',
+)
+
+_local = threading.local()
+
+
+def _state():
+    if not hasattr(_local, 'buffer'):
+        _local.buffer = []
+        _local.depth = 0
+    return _local
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def leave_values(leave, fields=AUDITED_FIELDS):
+    """JSON-ready values of a leave's audited columns."""
+    return {field: _json_value(getattr(leave, field)) for field in fields}
+
+
+def _add(event):
+    state = _state()
+    if state.depth == 0:
+        # Not in an audited block - write through
+        event.save()
+        return
+    state.buffer.append(event)
+    # Early flushes only at the outermost level, where no audited savepoint
+    # can roll back rows written on behalf of an enclosing block
+    if state.depth == 1 and len(state.buffer) >= AUDIT_BUFFER_SIZE:
+        flush()
+
+
+def flush():
+    """Write all buffered events with one bulk INSERT."""
+    state = _state()
+    if state.buffer:
+        events, state.buffer = state.buffer, []
+        Leave_Audit_Event.objects.bulk_create(events, batch_size=AUDIT_BUFFER_SIZE)
+
+
+@contextmanager
+def audited_atomic():
+    """
+    ``transaction.atomic()`` that buffers audit events and flushes them just
+    before the outermost audited block commits. Events recorded inside a
+    block that rolls back are discarded with it.
+    """
+    state = _state()
+    mark = len(state.buffer)
+    state.depth += 1
+    try:
+        with transaction.atomic():
+            yield
+            if state.depth == 1:
+                flush()
+    except BaseException:
+        del state.buffer[mark:]
+        raise
+    finally:
+        state.depth -= 1
+
+
+def record_created(leave, actor=None):
+    _add(Leave_Audit_Event(
+        Leave_Id=leave.id, Employee_Name=leave.Employee_Name, Action='CREATED',
+        Actor=actor, New_Values=leave_values(leave),
+    ))
+
+
+def record_deleted(leave_id, old_values, actor=None):
+    _add(Leave_Audit_Event(
+        Leave_Id=leave_id, Employee_Name=old_values.get('Employee_Name', ''), Action='DELETED',
+        Actor=actor, Old_Values=old_values,
+    ))
+
+
+def record_updated(leave, old_values, new_values, actor=None, action='UPDATED'):
+    """
+    Record the columns that differ between ``old_values`` and ``new_values``
+    (nothing is recorded if none do).
+    """
+    changed = [field for field in new_values if old_values.get(field) != new_values[field]]
+    if not changed:
+        return
+    _add(Leave_Audit_Event(
+        Leave_Id=leave.id, Employee_Name=leave.Employee_Name, Action=action, Actor=actor,
+        Old_Values={field: old_values.get(field) for field in changed},
+        New_Values={field: new_values[field] for field in changed},
+    ))
+
+
+def record_transition(leave, from_status, fields, actor=None):
+    """Record a status transition; ``leave`` still holds the pre-transition values."""
+    old_values = {field: _json_value(getattr(leave, field)) for field in fields}
+    old_values['Status'] = from_status
+    new_values = {field: _json_value(value) for field, value in fields.items()}
+    record_updated(leave, old_values, new_values, actor=actor, action='STATUS_CHANGED')
+
+
+def audit_events(leave_id=None, actor=None, since=None, until=None, employees=None):
+    """
+    Query the audit log, newest first.
+
+    Args:
+        leave_id: Only events of this leave (uses the (Leave_Id, Occurred_On) index)
+        actor: Only events by this username (uses the (Actor, Occurred_On) index)
+        since: Only events at or after this datetime
+        until: Only events before this datetime
+        employees: Optional usernames (or subquery) whose leaves may be seen
+
+    Returns:
+        QuerySet: Leave_Audit_Event rows
+    """
+    events = Leave_Audit_Event.objects.all()
+    if leave_id is not None:
+        events = events.filter(Leave_Id=leave_id)
+    if actor:
+        events = events.filter(Actor=actor)
+    if since:
+        events = events.filter(Occurred_On__gte=since)
+    if until:
+        events = events.filter(Occurred_On__lt=until)
+    if employees is not None:
+        events = events.filter(Employee_Name__in=employees)
+    return events.order_by('-Occurred_On', '-id')
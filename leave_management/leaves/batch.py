@@ -0,0 +1,294 @@
+"""
+Parallel batch-job engine for Leave Management.
+
+Year-end and monthly jobs process every employee. The engine:
+- partitions users into contiguous id ranges (chunks), stored as
+  Batch_Chunk rows so progress survives a crash
+- runs the chunks on a process pool, each worker with its own DB connection
+- resumes the latest unfinished run of the same job and parameters,
+  skipping chunks already DONE
+- reports throughput as chunks complete
+
+Jobs subclass BatchJob, implement ``process_chunk`` and are registered
+with ``@register_job``. Models are imported inside functions because this
+module is imported by freshly started worker processes before Django is set up.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import django
+from django.db import connections
+
+
+JOBS = {}
+
+
+def register_job(job_class):
+    """Class decorator adding a BatchJob to the registry by its ``name``."""
+    JOBS[job_class.name] = job_class
+    return job_class
+
+
+def get_job(name):
+    try:
+        return JOBS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown batch job: {name}. Available: {', '.join(sorted(JOBS))}")
+
+
+class BatchJob:
+    """
+    Base class for batch jobs.
+
+    ``process_chunk`` receives the ids of the users in one chunk and must be
+    idempotent: a resumed run may process a chunk again.
+    """
+    name = None
+
+    def clean_params(self, params):
+        """Validate and normalize job parameters (stored on the run)."""
+        return params
+
+    def process_chunk(self, user_ids, params):
+        """Process one chunk and return the number of users processed."""
+        raise NotImplementedError
+
+
+# Worker side ---------------------------------------------------------------
+
+def _init_worker():
+    """Process pool initializer: set up Django and start without DB connections."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'leave_management.settings')
+    django.setup()
+    # Never reuse a connection inherited from the parent process
+    connections.close_all()
+
+
+def run_chunk(chunk_id):
+    """
+    Process a single chunk and checkpoint the outcome on its Batch_Chunk row.
+
+    Returns:
+        tuple: (chunk_id, processed users, seconds, error or None)
+    """
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+    from leaves.models import Batch_Chunk
+
+    chunk = Batch_Chunk.objects.select_related('Run').get(id=chunk_id)
+    job = get_job(chunk.Run.Job_Name)
+    started = time.perf_counter()
+
+    try:
+        user_ids = list(
+            get_user_model().objects
+            .filter(id__gte=chunk.First_User_Id, id__lte=chunk.Last_User_Id)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        processed = job.process_chunk(user_ids, chunk.Run.Params)
+    except Exception as e:
+        seconds = time.perf_counter() - started
+        Batch_Chunk.objects.filter(id=chunk_id).update(Status='FAILED', Error=str(e)[:1000], Seconds=seconds)
+        return chunk_id, 0, seconds, str(e)
+
+    seconds = time.perf_counter() - started
+    Batch_Chunk.objects.filter(id=chunk_id).update(
+        Status='DONE', Processed=processed, Seconds=seconds, Error=None, Finished_On=timezone.now(),
+    )
+    return chunk_id, processed, seconds, None
+
+
+# Coordinator side ----------------------------------------------------------
+
+def partition_users(chunk_size):
+    """
+    Split all users into contiguous id ranges of ``chunk_size`` users.
+
+    Returns:
+        list: (first_user_id, last_user_id) tuples
+    """
+    from django.contrib.auth import get_user_model
+
+    ranges = []
+    ids = get_user_model().objects.order_by('id').values_list('id', flat=True)
+    first = last = None
+    count = 0
+    for user_id in ids.iterator(chunk_size=10000):
+        if first is None:
+            first = user_id
+        last = user_id
+        count += 1
+        if count == chunk_size:
+            ranges.append((first, last))
+            first, count = None, 0
+    if first is not None:
+        ranges.append((first, last))
+    return ranges
+
+
+def start_or_resume_run(job, params, chunk_size, fresh=False):
+    """
+    Return the run to execute, creating it and its chunks if needed.
+
+    The latest unfinished run of the same job and parameters is resumed
+    unless ``fresh`` is set.
+
+    Returns:
+        tuple: (Batch_Run, resumed bool)
+    """
+    from django.db import transaction
+    from leaves.models import Batch_Run, Batch_Chunk
+
+    if not fresh:
+        run = (
+            Batch_Run.objects
+            .filter(Job_Name=job.name, Params=params)
+            .exclude(Status='DONE')
+            .order_by('-id')
+            .first()
+        )
+        if run:
+            run.chunks.filter(Status='FAILED').update(Status='PENDING', Error=None)
+            Batch_Run.objects.filter(id=run.id).update(Status='RUNNING', Finished_On=None)
+            return run, True
+
+    with transaction.atomic():
+        run = Batch_Run.objects.create(Job_Name=job.name, Params=params)
+        Batch_Chunk.objects.bulk_create([
+            Batch_Chunk(Run=run, First_User_Id=first, Last_User_Id=last)
+            for first, last in partition_users(chunk_size)
+        ])
+    return run, False
+
+
+def execute_run(run, workers=None, progress=None):
+    """
+    Process every pending chunk of ``run`` on a process pool.
+
+    Args:
+        run: Batch_Run to execute
+        workers: Number of worker processes (default: CPU count); 1 runs
+            chunks in the current process
+        progress: Optional callable receiving a stats dict after each chunk
+
+    Returns:
+        dict: Final stats (chunks, users, seconds, users_per_second, failed)
+    """
+    from django.utils import timezone
+    from leaves.models import Batch_Run
+
+    chunk_ids = list(run.chunks.exclude(Status='DONE').order_by('id').values_list('id', flat=True))
+    total_chunks = run.chunks.count()
+    stats = {
+        'run_id': run.id,
+        'chunks_total': total_chunks,
+        'chunks_done': total_chunks - len(chunk_ids),
+        'users': 0,
+        'failed': 0,
+        'seconds': 0.0,
+        'users_per_second': 0.0,
+    }
+    started = time.perf_counter()
+
+    def record(result):
+        _, processed, _, error = result
+        stats['chunks_done'] += 1
+        stats['users'] += processed
+        stats['failed'] += 1 if error else 0
+        stats['seconds'] = time.perf_counter() - started
+        stats['users_per_second'] = stats['users'] / stats['seconds'] if stats['seconds'] else 0.0
+        if progress:
+            progress(dict(stats))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunk_ids) <= 1:
+        for chunk_id in chunk_ids:
+            record(run_chunk(chunk_id))
+    else:
+        # Workers must open their own connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(run_chunk, chunk_id) for chunk_id in chunk_ids]
+            for future in as_completed(futures):
+                record(future.result())
+
+    Batch_Run.objects.filter(id=run.id).update(
+        Status='FAILED' if stats['failed'] else 'DONE',
+        Finished_On=timezone.now(),
+    )
+    return stats
+
+
+# Jobs ----------------------------------------------------------------------
+
+@register_job
+class AnnualLeaveSummaryJob(BatchJob):
+    """
+    Per-employee totals for a calendar year, written to Annual_Leave_Summary.
+
+    Approved leaves are clipped to the year and counted in working days.
+    Archived leaves are included, so past years stay complete after archival.
+    """
+    name = 'annual_leave_summary'
+
+    DAY_FIELDS = {'SICK': 'Sick_Days', 'CASUAL': 'Casual_Days', 'EARNED': 'Earned_Days'}
+    COUNT_FIELDS = {
+        'PENDING': 'Pending_Count',
+        'APPROVED': 'Approved_Count',
+        'REJECTED': 'Rejected_Count',
+        'CANCELLED': 'Cancelled_Count',
+    }
+
+    def clean_params(self, params):
+        from leaves.workdays import check_supported
+
+        year = int(params.get('year') or date.today().year)
+        check_supported(date(year, 1, 1))
+        return {'year': year}
+
+    def process_chunk(self, user_ids, params):
+        from django.contrib.auth import get_user_model
+        from leaves.models import Leave_Record, Archived_Leave_Record, Annual_Leave_Summary
+
+        from leaves.workdays import get_calendar
+
+        year = params['year']
+        year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+        calendar = get_calendar(year_start, year_end)
+
+        usernames = dict(
+            get_user_model().objects.filter(id__in=user_ids).values_list('username', 'id')
+        )
+        summaries = {
+            user_id: Annual_Leave_Summary(Employee_id=user_id, Year=year)
+            for user_id in usernames.values()
+        }
+
+        columns = ('Employee_Name', 'Leave_Type', 'Status', 'Start_Date', 'End_Date')
+        for model in (Leave_Record, Archived_Leave_Record):
+            rows = (
+                model.objects
+                .filter(Employee_Name__in=list(usernames), Start_Date__lte=year_end, End_Date__gte=year_start)
+                .values_list(*columns)
+            )
+            for name, leave_type, status, start, end in rows.iterator(chunk_size=2000):
+                summary = summaries[usernames[name]]
+                count_field = self.COUNT_FIELDS[status]
+                setattr(summary, count_field, getattr(summary, count_field) + 1)
+
+                if status == 'APPROVED':
+                    days = calendar.count(max(start, year_start), min(end, year_end))
+                    day_field = self.DAY_FIELDS[leave_type]
+                    setattr(summary, day_field, getattr(summary, day_field) + days)
+                    summary.Total_Days += days
+
+        Annual_Leave_Summary.objects.bulk_create(
+            summaries.values(),
+            update_conflicts=True,
+            unique_fields=['Employee', 'Year'],
+            update_fields=list(self.DAY_FIELDS.values()) + list(self.COUNT_FIELDS.values()) + ['Total_Days', 'Generated_On'],
+        )
+        return len(summaries)
@@ -0,0 +1,262 @@
+"""
+iCalendar feeds for Leave Management.
+
+Calendar apps poll feed URLs every few minutes, so feeds are:
+- addressed by a signed token (no login); every request still checks that
+  the token's user is active before anything is served, even a 304.
+  Tokens expire after settings.CALENDAR_FEED_MAX_AGE_DAYS and are revoked
+  when their user's password changes
+- versioned by the feed's own last relevant write - the highest change
+  number (leaves.changes) among its leaves and their tombstones - so a
+  write elsewhere does not invalidate it; the body cache and the ETag for
+  304 replies use that version
+- streamed event by event on a cache miss, so large team feeds are never
+  built as one big string
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from authentication.hierarchy import is_team_manager, scope_leaves, sees_everyone
+from django.db.models import Max
+
+from leaves.models import Leave_Record, Leave_Tombstone
+from leaves.versions import HIERARCHY_VERSION_KEY, get_data_version
+
+
+FEED_SALT = 'leaves.calendar.feed'
+FEED_KINDS = ('user', 'team')
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+# Feeds larger than this are streamed on every miss instead of being cached
+FEED_CACHE_MAX_BYTES = 1024 * 1024
+
+LEAVE_TYPE_LABELS = dict(Leave_Record.LEAVE_TYPES)
+
+
+def make_feed_token(kind, user):
+    """
+    Create the URL token for a user's feed.
+
+    Args:
+        kind: 'user' (own leaves) or 'team' (leaves the user manages)
+        user: CustomUser owning the feed
+
+    Returns:
+        str: URL-safe signed token
+    """
+    return signing.dumps([kind, user.id, _owner_stamp(user)], salt=FEED_SALT)
+
+
+def _owner_stamp(user):
+    """Changes with the user's password, revoking the feeds made before."""
+    return salted_hmac(FEED_SALT, f'{user.pk}:{user.password}').hexdigest()[:16]
+
+
+def read_feed_token(token):
+    """
+    Decode a feed token.
+
+    Returns:
+        tuple: (kind, user_id, owner stamp), or None if the token is
+        invalid or older than settings.CALENDAR_FEED_MAX_AGE_DAYS
+    """
+    max_age = getattr(settings, 'CALENDAR_FEED_MAX_AGE_DAYS', 365)
+    try:
+        kind, user_id, stamp = signing.loads(
+            token, salt=FEED_SALT, max_age=timedelta(days=max_age) if max_age else None,
+        )
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    if kind not in FEED_KINDS:
+        return None
+    return kind, user_id, stamp
+
+
+def feed_owner(token):
+    """
+    Decode a feed token and load its owner.
+
+    Returns:
+        tuple: (kind, CustomUser), or None if the token is invalid, has
+        expired or been revoked, or its user no longer exists or has been
+        deactivated
+    """
+    feed = read_feed_token(token)
+    if not feed:
+        return None
+    kind, user_id, stamp = feed
+    user = get_user_model().objects.filter(id=user_id, is_active=True).first()
+    if user is None or not constant_time_compare(stamp, _owner_stamp(user)):
+        return None
+    return kind, user
+
+
+def _feed_scope(queryset, kind, user):
+    """Restrict a Leave_Record or Leave_Tombstone queryset to the employees of a feed."""
+    if kind == 'team':
+        if not (sees_everyone(user) or is_team_manager(user)):
+            return queryset.none()
+        # Managers get their reporting line, admins everyone
+        return scope_leaves(queryset, user)
+    return queryset.filter(Employee_Name=user.username)
+
+
+def feed_queryset(kind, user):
+    """
+    APPROVED leaves that belong in a feed.
+
+    Args:
+        kind: 'user' or 'team'
+        user: CustomUser owning the feed
+
+    Returns:
+        QuerySet: Leave records, only the columns the feed needs
+    """
+    return (
+        _feed_scope(Leave_Record.objects.filter(Status='APPROVED'), kind, user)
+        .only('id', 'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date')
+        .order_by('Start_Date', 'id')
+    )
+
+
+def feed_version(kind, user):
+    """
+    Version of one feed: the highest change number among the leaves
+    (of any status) and tombstones of its employees. Every write that can
+    alter the feed raises it; writes to other employees' leaves do not.
+    Team feeds also change with reporting lines.
+
+    Recomputed at most once per leave data version and feed.
+    """
+    key = f'leaves:ics-version:{kind}:{user.id}:{get_data_version()}'
+    version = cache.get(key)
+    if version is None:
+        version = max(
+            _feed_scope(Leave_Record.objects.all(), kind, user).aggregate(seq=Max('Change_Seq'))['seq'] or 0,
+            _feed_scope(Leave_Tombstone.objects.all(), kind, user).aggregate(seq=Max('Change_Seq'))['seq'] or 0,
+        )
+        cache.set(key, version, FEED_CACHE_TIMEOUT)
+    if kind == 'team':
+        return f'{version}.{get_data_version(HIERARCHY_VERSION_KEY)}'
+    return version
+
+
+def feed_cache_key(kind, user_id, version):
+    return f'leaves:ics:{kind}:{user_id}:{version}'
+
+
+def feed_etag(kind, user):
+    """ETag for a feed, derived from the feed identity and its version."""
+    version = feed_version(kind, user)
+    digest = hashlib.sha1(f'{kind}:{user.id}:{version}'.encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def escape_text(value):
+    """Escape a TEXT value as required by RFC 5545."""
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """
+    Fold a content line to at most 75 octets (UTF-8) per physical line,
+    never inside a multibyte character; continuation lines start with a
+    space, which counts toward their 75.
+    """
+    if len(line.encode('utf-8')) <= 75:
+        return line + '\r\n'
+    parts = []
+    current = []
+    size = 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > 75:
+            parts.append(''.join(current))
+            current = [' ']
+            size = 1
+        current.append(char)
+        size += width
+    parts.append(''.join(current))
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def render_event(leave, stamp):
+    """Render a single leave as a VEVENT block."""
+    summary = f"{leave.Employee_Name} - {LEAVE_TYPE_LABELS.get(leave.Leave_Type, leave.Leave_Type)}"
+    # DTEND is exclusive for all-day events
+    end = leave.End_Date + timedelta(days=1)
+    return ''.join([
+        'BEGIN:VEVENT\r\n',
+        f'UID:leave-{leave.id}@leave-management\r\n',
+        f'DTSTAMP:{stamp}\r\n',
+        f'DTSTART;VALUE=DATE:{leave.Start_Date:%Y%m%d}\r\n',
+        f'DTEND;VALUE=DATE:{end:%Y%m%d}\r\n',
+        fold_line(f'SUMMARY:{escape_text(summary)}'),
+        'TRANSP:OPAQUE\r\n',
+        'END:VEVENT\r\n',
+    ])
+
+
+def iter_feed(queryset, name):
+    """
+    Yield the feed as text chunks, one event at a time.
+
+    Args:
+        queryset: Leave records to include
+        name: Calendar display name
+    """
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+    yield (
+        'BEGIN:VCALENDAR\r\n'
+        'VERSION:2.0\r\n'
+        'PRODID:-//Team Leave Management//Leave Feed//EN\r\n'
+        'CALSCALE:GREGORIAN\r\n'
+        'METHOD:PUBLISH\r\n'
+        + fold_line(f'X-WR-CALNAME:{escape_text(name)}')
+    )
+    for leave in queryset.iterator(chunk_size=500):
+        yield render_event(leave, stamp)
+    yield 'END:VCALENDAR\r\n'
+
+
+def iter_cached_feed(kind, user, name):
+    """
+    Stream a feed and store it in the cache once complete.
+
+    Chunks are only buffered until FEED_CACHE_MAX_BYTES; bigger feeds are
+    streamed without being cached.
+    """
+    key = feed_cache_key(kind, user.id, feed_version(kind, user))
+    buffer = []
+    size = 0
+
+    for chunk in iter_feed(feed_queryset(kind, user), name):
+        data = chunk.encode()
+        if buffer is not None:
+            size += len(data)
+            if size <= FEED_CACHE_MAX_BYTES:
+                buffer.append(data)
+            else:
+                buffer = None
+        yield data
+
+    if buffer is not None:
+        cache.set(key, b''.join(buffer), FEED_CACHE_TIMEOUT)
+
+
+def get_cached_feed(kind, user):
+    """Return the cached feed body for the feed's current version, if any."""
+    return cache.get(feed_cache_key(kind, user.id, feed_version(kind, user)))
@@ -0,0 +1,192 @@
+"""
+Change feed for incremental leave sync.
+
+Every write to a leave stamps it with a change sequence number
+(Leave_Record.Change_Seq) taken from a single counter row inside the
+writing transaction, so numbers are committed in order; deletes and
+archival leave a Leave_Tombstone stamped the same way. A client that
+remembers its position only asks for what changed after it:
+
+    GET /leaves/leaves/changes/                      first sync, from the start
+    GET /leaves/leaves/changes/?since=<next token>   everything after that
+
+Each page lists the changed leaves and the ids of deleted ones, ordered
+by (Change_Seq, id), with the token to continue from. One bulk write
+stamps all its rows with the same number, so the id breaks ties and a
+page may end in the middle of a write. Each page is one index range
+scan, so a sync costs the number of changes, not the size of the table.
+
+Tokens are signed and carry the caller's visibility (authentication.
+hierarchy.scope_key). If that changed - a manager's reporting line moved,
+an employee became a manager - or tombstones the client still needed
+have been purged, ``changes_since`` raises ResyncRequired and the client
+has to start over without a token.
+
+A first sync skips tombstones written before it started: the client
+never held those leaves.
+"""
+from datetime import timedelta
+from heapq import merge
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from authentication.hierarchy import scope_key, scope_leaves
+from leaves.models import Leave_Change_Counter, Leave_Record, Leave_Tombstone
+
+
+CHANGES_SALT = 'leaves.changes'
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+class ResyncRequired(Exception):
+    """The client's position can no longer be continued; it must sync from scratch."""
+
+
+def _counter():
+    return Leave_Change_Counter.objects.filter(pk=1).values_list('Last_Seq', 'Purged_Through').first() or (0, 0)
+
+
+def make_change_token(user, change_seq, leave_id, floor):
+    """
+    Create a change-feed position token.
+
+    Args:
+        user: CustomUser syncing
+        change_seq: Change_Seq of the last change returned
+        leave_id: Leave id of the last change returned
+        floor: Last_Seq when the first sync started; older tombstones are skipped
+
+    Returns:
+        str: URL-safe signed token
+    """
+    return signing.dumps([change_seq, leave_id, floor, scope_key(user)], salt=CHANGES_SALT)
+
+
+def read_change_token(token):
+    """
+    Decode a token from make_change_token.
+
+    Returns:
+        tuple: (change_seq, leave_id, floor, scope key), or None if invalid
+    """
+    try:
+        change_seq, leave_id, floor, scope = signing.loads(token, salt=CHANGES_SALT)
+        return int(change_seq), int(leave_id), int(floor), scope
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+def _after(seq_field, id_field, change_seq, leave_id):
+    """Rows after (change_seq, leave_id) in change order, as one index range."""
+    return Q(**{f'{seq_field}__gte': change_seq}) & (
+        Q(**{f'{seq_field}__gt': change_seq}) | Q(**{f'{id_field}__gt': leave_id})
+    )
+
+
+def changes_since(user, token=None, limit=DEFAULT_LIMIT):
+    """
+    Leaves changed and deleted after the position in ``token``.
+
+    Args:
+        user: CustomUser syncing; only leaves they may see are returned
+        token: Token from a previous page, or None for a first sync
+        limit: Maximum number of changes (changed plus deleted) in the page
+
+    Returns:
+        dict: {
+            'changed': [Leave_Record],
+            'deleted': [{'id', 'reason', 'deleted_on'}],
+            'next': token to continue from,
+            'has_more': bool,
+        }
+
+    Raises:
+        ValueError: If the token is malformed
+        ResyncRequired: If the client must start over without a token
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+
+    last_seq, purged_through = _counter()
+    if token is None:
+        change_seq, leave_id, floor = 0, 0, last_seq
+    else:
+        position = read_change_token(token)
+        if position is None:
+            raise ValueError('Invalid change token')
+        change_seq, leave_id, floor, scope = position
+        if scope != scope_key(user):
+            raise ResyncRequired('Visible leaves have changed, sync again from the start')
+        if purged_through > max(change_seq, floor):
+            raise ResyncRequired('Change token has expired, sync again from the start')
+
+    # Numbers up to last_seq are all committed (they are handed out under
+    # the counter row lock), so capping both queries there gives them the
+    # same consistent view without a transaction
+    changed = list(
+        scope_leaves(Leave_Record.objects.all(), user)
+        .filter(_after('Change_Seq', 'id', change_seq, leave_id), Change_Seq__lte=last_seq)
+        .order_by('Change_Seq', 'id')[:limit + 1]
+    )
+    deleted = list(
+        scope_leaves(Leave_Tombstone.objects.all(), user)
+        .filter(_after('Change_Seq', 'Leave_Id', change_seq, leave_id), Change_Seq__gt=floor, Change_Seq__lte=last_seq)
+        .order_by('Change_Seq', 'Leave_Id')
+        .values_list('Change_Seq', 'Leave_Id', 'Reason', 'Deleted_On')[:limit + 1]
+    )
+
+    page = list(merge(
+        ((leave.Change_Seq, leave.id, leave) for leave in changed),
+        ((seq, deleted_id, (reason, deleted_on)) for seq, deleted_id, reason, deleted_on in deleted),
+        key=lambda change: change[:2],
+    ))
+    has_more = len(page) > limit
+    page = page[:limit]
+    if page:
+        change_seq, leave_id = page[-1][:2]
+
+    return {
+        'changed': [item for _, _, item in page if isinstance(item, Leave_Record)],
+        'deleted': [
+            {'id': deleted_id, 'reason': item[0], 'deleted_on': item[1]}
+            for _, deleted_id, item in page if not isinstance(item, Leave_Record)
+        ],
+        'next': make_change_token(user, change_seq, leave_id, floor),
+        'has_more': has_more,
+    }
+
+
+def purge_tombstones(days=None, batch_size=5000):
+    """
+    Delete tombstones older than ``days`` in batches.
+
+    Clients whose position predates a purged tombstone are told to resync.
+
+    Args:
+        days: Age in days (default: settings.LEAVE_TOMBSTONE_TTL_DAYS)
+        batch_size: Rows deleted per statement
+
+    Returns:
+        int: Number of tombstones deleted
+    """
+    days = getattr(settings, 'LEAVE_TOMBSTONE_TTL_DAYS', 90) if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Leave_Tombstone.objects
+                .filter(Deleted_On__lt=cutoff)
+                .values_list('id', 'Change_Seq')[:batch_size]
+            )
+            if not rows:
+                return total
+            # Record the horizon before the tombstones disappear
+            highest = max(seq for _, seq in rows)
+            Leave_Change_Counter.objects.get_or_create(pk=1)
+            Leave_Change_Counter.objects.filter(pk=1, Purged_Through__lt=highest).update(Purged_Through=highest)
+            total += Leave_Tombstone.objects.filter(id__in=[row_id for row_id, _ in rows]).delete()[0]
@@ -0,0 +1,101 @@
+"""
+Conflict checks for new and edited leaves.
+
+- Overlap: an employee cannot hold two active (PENDING or APPROVED)
+  leaves on the same day. Checked with one interval query on the
+  (Employee_Name, Start_Date, End_Date) index.
+- Minimum staffing: if the employee's team sets ``min_staffing``, every
+  working day of the leave must still leave that many members at work.
+  Absences are counted from the daily absence index (approved leaves).
+
+``check_leave_conflicts`` must run inside the write transaction, before
+the leave is written. It first locks the employee's user row, so two
+submissions for the same employee are checked one after the other (on
+SQLite the IMMEDIATE transaction already holds the write lock).
+"""
+from django.contrib.auth import get_user_model
+
+from leaves.absences import absence_counts
+from leaves.models import Daily_Absence, Leave_Record
+from leaves.workdays import get_calendar
+
+
+ACTIVE_STATUSES = ('PENDING', 'APPROVED')
+
+
+class LeaveConflict(ValueError):
+    """The leave overlaps another leave or breaks the team's minimum staffing."""
+
+
+def overlapping_leaves(employee, start, end, exclude_id=None):
+    """
+    Active leaves of ``employee`` sharing at least one day with [start, end].
+
+    Returns:
+        QuerySet: Leave_Record rows, earliest first
+    """
+    leaves = Leave_Record.objects.filter(
+        Employee_Name=employee, Start_Date__lte=end, End_Date__gte=start, Status__in=ACTIVE_STATUSES,
+    )
+    if exclude_id is not None:
+        leaves = leaves.exclude(id=exclude_id)
+    return leaves.order_by('Start_Date')
+
+
+def understaffed_days(team, employee, start, end):
+    """
+    Working days in [start, end] on which ``employee`` being away would
+    leave ``team`` below its minimum staffing.
+
+    Returns:
+        list: Dates, empty if the team sets no minimum
+    """
+    if team is None or team.min_staffing is None:
+        return []
+
+    members = get_user_model().objects.filter(team=team, is_active=True)
+    headcount = members.count()
+    absences = Daily_Absence.objects.filter(
+        Employee_Name__in=members.exclude(username=employee).values('username'),
+    )
+    calendar = get_calendar(start, end)
+    return [
+        day for day, absent in absence_counts(start, end, absences).items()
+        if calendar.is_working_day(day) and headcount - absent - 1 < team.min_staffing
+    ]
+
+
+def check_leave_conflicts(employee, start, end, exclude_id=None):
+    """
+    Refuse a leave that overlaps another one or understaffs the team.
+
+    Call inside the transaction that writes the leave.
+
+    Args:
+        employee: Employee_Name of the leave
+        start: Start date
+        end: End date
+        exclude_id: Id of the leave being edited
+
+    Raises:
+        LeaveConflict: With a message for the user
+    """
+    # Serialize concurrent submissions for the same employee
+    user = (
+        get_user_model().objects.select_for_update(of=('self',))
+        .select_related('team')
+        .filter(username=employee)
+        .first()
+    )
+
+    overlap = overlapping_leaves(employee, start, end, exclude_id=exclude_id).first()
+    if overlap is not None:
+        raise LeaveConflict(
+            f'Overlaps your {overlap.Status.lower()} {overlap.Leave_Type.lower()} leave '
+            f'from {overlap.Start_Date} to {overlap.End_Date}'
+        )
+
+    days = understaffed_days(user.team if user else None, employee, start, end)
+    if days:
+        shown = ', '.join(str(day) for day in days[:5]) + (' ...' if len(days) > 5 else '')
+        raise LeaveConflict(f'Team {user.team.name} would be below its minimum staffing on {shown}')
@@ -0,0 +1,26 @@
+"""
+Filter backends for Leave Management.
+
+DjangoFilterBackend generates a FilterSet class from ``filterset_fields``
+on every request. The generated class only depends on the view and the
+model being filtered, so it is built once and reused.
+"""
+from django_filters.rest_framework import DjangoFilterBackend
+
+
+class CachedDjangoFilterBackend(DjangoFilterBackend):
+    """DjangoFilterBackend that builds each view's FilterSet class once per model."""
+
+    _filterset_classes = {}
+
+    def get_filterset_class(self, view, queryset=None):
+        if getattr(view, 'filterset_class', None) is not None or queryset is None:
+            return super().get_filterset_class(view, queryset)
+
+        key = (type(view), queryset.model)
+        try:
+            return self._filterset_classes[key]
+        except KeyError:
+            filterset_class = super().get_filterset_class(view, queryset)
+            self._filterset_classes[key] = filterset_class
+            return filterset_class
@@ -3,11 +3,15 @@ from .htmx import (
     render_leaves_table,
     render_leave_detail,
     render_my_leaves_table,
+    render_absence_widget,
 )
+from .bootstrap import dashboard_bootstrap
 
 __all__ = [
     'render_leaves_table',
     'render_leave_detail',
     'render_my_leaves_table',
+    'render_absence_widget',
+    'dashboard_bootstrap',
 ]
 
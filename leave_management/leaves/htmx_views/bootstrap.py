@@ -0,0 +1,84 @@
+"""
+Dashboard bootstrap endpoint.
+
+The dashboards used to make three or four requests on first paint (stats,
+leaves table, users), each re-authenticating the JWT and opening its own
+database work. ``dashboard_bootstrap`` authenticates once and returns
+everything first paint needs in one response.
+"""
+from django.http import JsonResponse
+
+from authentication.hierarchy import scope_users
+from authentication.models import CustomUser
+from authentication.serializers import UserSerializer
+from authentication.utils import get_user_from_request, leave_stats
+from leave_management.db import read_only_view
+from .htmx import filter_leaves, filter_my_leaves, leaves_table_html, my_leaves_table_html
+
+
+# Rows rendered on first paint; the table offers a "show all" link after that
+BOOTSTRAP_PAGE_SIZE = 50
+
+
+def first_page(queryset, size=BOOTSTRAP_PAGE_SIZE):
+    """
+    Fetch the first ``size`` rows of a queryset in one query.
+
+    Returns:
+        tuple: (list of rows, whether more rows exist)
+    """
+    rows = list(queryset[:size + 1])
+    return rows[:size], len(rows) > size
+
+
+@read_only_view
+def dashboard_bootstrap(request):
+    """
+    GET /api/bootstrap/
+    Everything a dashboard needs for first paint, in one round trip.
+    
+    Query params:
+    - view: 'admin' (admin dashboard) or 'employee' (employee dashboard);
+      defaults to 'admin' for admins and managers
+    - the admin leaves table filters (see render_leaves_table)
+    
+    Returns:
+        JsonResponse: {
+            'user': current user,
+            'stats': same as /api/stats/,
+            'leaves_html': first page of the leaves table fragment,
+            'leaves_has_more': bool,
+            'users': first page of users (admin view only),
+            'users_has_more': bool (admin view only),
+        }
+    """
+    # Authenticate once for every part of the response
+    user = get_user_from_request(request)
+    if not user:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    is_admin = user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER']
+    view = request.GET.get('view') or ('admin' if is_admin else 'employee')
+    
+    if view == 'admin' and is_admin:
+        leaves, leaves_has_more = first_page(filter_leaves(request, user))
+        users, users_has_more = first_page(
+            scope_users(CustomUser.objects.all(), user).order_by('-created_at')
+        )
+        return JsonResponse({
+            'user': UserSerializer(user).data,
+            'stats': leave_stats(user, request.GET),
+            'leaves_html': leaves_table_html(request, leaves, has_more=leaves_has_more),
+            'leaves_has_more': leaves_has_more,
+            'users': UserSerializer(users, many=True).data,
+            'users_has_more': users_has_more,
+        })
+    
+    # Employee dashboard - their own leaves, stats as on /api/stats/
+    leaves, leaves_has_more = first_page(filter_my_leaves(request, user))
+    return JsonResponse({
+        'user': UserSerializer(user).data,
+        'stats': leave_stats(user),
+        'leaves_html': my_leaves_table_html(leaves, has_more=leaves_has_more),
+        'leaves_has_more': leaves_has_more,
+    })
@@ -9,50 +9,49 @@ from django.http import QueryDict
 
 from django.http import HttpResponse
 from django.template.loader import render_to_string
+from django.utils.html import escape
+from datetime import timedelta
+
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from leaves.models import Leave_Record
+from leaves.absences import absence_counts, absent_on
+from leaves.conflicts import LeaveConflict
+from leaves.idempotency import idempotent
+from leaves.leave_cache import get_leave
+from leaves.models import Daily_Absence, Leave_Record
+from leaves.services import transition_leave, update_pending_leave
+from leaves.workdays import check_supported
+from authentication.hierarchy import can_see_employee, scope_leaves
+from authentication.models import Team
 from authentication.utils import get_user_from_request
+from leave_management.db import read_only_view
+from leave_management.singleflight import coalesce
 
 
-def render_leaves_table(request):
+def filter_leaves(request, user):
     """
-    Render HTMX fragment for leaves table (admin view).
-    
-    Supports filtering by:
-    - Employee_Name: Filter by employee name (case-insensitive contains)
-    - Leave_Type: Filter by leave type
-    - Status: Filter by leave status (PENDING, APPROVED, REJECTED)
-    - Start_Date__gte: Start date greater than or equal
-    - End_Date__lte: End date less than or equal
-    - search: General search on employee name
-    - ordering: Sort field (default: -Start_Date)
+    Leaves for the admin table, scoped to ``user`` and filtered/ordered by
+    the request's query params (see render_leaves_table).
     
     Returns:
-        HttpResponse: HTML fragment for the leaves table
+        QuerySet: Filtered, ordered leave records
     """
-    # Build query params for filters
-    query_params = request.GET.copy()
-    
-    # Remove HTMX headers
-    query_params.pop('ordering', None)
-    
     # Get ordering
     ordering = request.GET.get('ordering', '-Start_Date')
     
-    # Get authenticated user (supports JWT and session)
-    user = get_user_from_request(request)
+    # Base queryset - admins see all, managers their reporting line,
+    # employees only theirs
+    queryset = scope_leaves(Leave_Record.objects.all(), user)
     
-    # Check if user is admin
-    is_admin = user and (user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER'])
+    # Team filters first - the (Team, Status, Start_Date) index narrows the scan
+    team = request.GET.get('team')
+    if team and team.isdigit():
+        queryset = queryset.filter(Team_id=int(team))
     
-    # Base queryset - admins see all, employees see only theirs
-    if is_admin:
-        queryset = Leave_Record.objects.all()
-    elif user:
-        queryset = Leave_Record.objects.filter(Employee_Name=user.username)
-    else:
-        queryset = Leave_Record.objects.none()
+    department = request.GET.get('department')
+    if department:
+        queryset = queryset.filter(Team__in=Team.objects.filter(department=department))
     
     # Apply filters
     employee_name = request.GET.get('Employee_Name__icontains')
@@ -82,18 +81,46 @@ def render_leaves_table(request):
         queryset = queryset.filter(Employee_Name__icontains=search)
     
     # Apply ordering
-    queryset = queryset.order_by(ordering)
-    
-    # Get search for results count
-    search_param = request.GET.get('search', '')
-    status_param = request.GET.get('Status', '')
-    
-    html = render_to_string('partials/leaves_table.html', {
+    return queryset.order_by(ordering)
+
+
+def leaves_table_html(request, queryset, has_more=False):
+    """Render the admin leaves table fragment for an already filtered queryset."""
+    return render_to_string('partials/leaves_table.html', {
         'leaves': queryset,
-        'search': search_param,
-        'status_filter': status_param,
+        'search': request.GET.get('search', ''),
+        'status_filter': request.GET.get('Status', ''),
+        'has_more': has_more,
     })
+
+
+@read_only_view
+def render_leaves_table(request):
+    """
+    Render HTMX fragment for leaves table (admin view).
     
+    Supports filtering by:
+    - Employee_Name: Filter by employee name (case-insensitive contains)
+    - Leave_Type: Filter by leave type
+    - Status: Filter by leave status (PENDING, APPROVED, REJECTED)
+    - Start_Date__gte: Start date greater than or equal
+    - End_Date__lte: End date less than or equal
+    - team: Team id (served from the team-leading indexes)
+    - department: Department name
+    - search: General search on employee name
+    - ordering: Sort field (default: -Start_Date)
+    
+    Returns:
+        HttpResponse: HTML fragment for the leaves table
+    """
+    # Get authenticated user (supports JWT and session)
+    user = get_user_from_request(request)
+    
+    # Identical concurrent requests (same filters, scope and data) share one render
+    html = coalesce(
+        'htmx_leaves', request, user,
+        lambda: leaves_table_html(request, filter_leaves(request, user)),
+    )
     return HttpResponse(html)
 
 
@@ -111,10 +138,14 @@ def render_leave_detail(request, id):
     user = get_user_from_request(request)
     
     try:
-        leave = Leave_Record.objects.get(id=id)
+        leave = get_leave(id)
     except Leave_Record.DoesNotExist:
         return HttpResponse('<p class="text-red-500">Leave request not found</p>')
     
+    # Managers only see leaves within their reporting line
+    if not can_see_employee(user, leave.Employee_Name):
+        return HttpResponse('<p class="text-red-500">Leave request not found</p>')
+    
     # Check if current user can edit this leave
     can_edit = user and leave.Employee_Name == user.username
     
@@ -129,25 +160,17 @@ def render_leave_detail(request, id):
     return HttpResponse(html)
 
 
-def render_my_leaves_table(request):
+def filter_my_leaves(request, user):
     """
-    Render HTMX fragment for employee's own leaves table.
-    
-    Shows all leaves for the authenticated employee (no default pending filter).
-    Supports filtering by Leave_Type and Status.
-    
-    Args:
-        request: HTTP request
+    The employee's own leaves, filtered by Leave_Type and Status and
+    ordered by the request's query params (see render_my_leaves_table).
     
     Returns:
-        HttpResponse: HTML fragment for the employee's leaves table
+        QuerySet: Filtered, ordered leave records
     """
     # Get ordering
     ordering = request.GET.get('ordering', '-Start_Date')
     
-    # Get authenticated user (supports JWT and session)
-    user = get_user_from_request(request)
-    
     # Base queryset - employees see only their own leaves
     if user:
         queryset = Leave_Record.objects.filter(Employee_Name=user.username)
@@ -165,13 +188,35 @@ def render_my_leaves_table(request):
     # Note: No default status filter - show all leaves for employee
     
     # Apply ordering
-    queryset = queryset.order_by(ordering)
-    
-    html = render_to_string('partials/employee_leaves_table.html', {
+    return queryset.order_by(ordering)
+
+
+def my_leaves_table_html(queryset, has_more=False):
+    """Render the employee leaves table fragment for an already filtered queryset."""
+    return render_to_string('partials/employee_leaves_table.html', {
         'leaves': queryset,
+        'has_more': has_more,
     })
+
+
+@read_only_view
+def render_my_leaves_table(request):
+    """
+    Render HTMX fragment for employee's own leaves table.
     
-    return HttpResponse(html)
+    Shows all leaves for the authenticated employee (no default pending filter).
+    Supports filtering by Leave_Type and Status.
+    
+    Args:
+        request: HTTP request
+    
+    Returns:
+        HttpResponse: HTML fragment for the employee's leaves table
+    """
+    # Get authenticated user (supports JWT and session)
+    user = get_user_from_request(request)
+    
+    return HttpResponse(my_leaves_table_html(filter_my_leaves(request, user)))
 
 
 def render_edit_leave_form(request, leave_id):
@@ -191,7 +236,7 @@ def render_edit_leave_form(request, leave_id):
         return HttpResponse('<p class="text-red-500">Please log in to edit leave</p>')
     
     try:
-        leave = Leave_Record.objects.get(id=leave_id)
+        leave = get_leave(leave_id)
     except Leave_Record.DoesNotExist:
         return HttpResponse('<p class="text-red-500">Leave request not found</p>')
     
@@ -210,6 +255,7 @@ def render_edit_leave_form(request, leave_id):
     return HttpResponse(html)
 
 
+@idempotent
 def update_leave(request, leave_id):
     """
     Handle leave update via HTMX (PATCH request).
@@ -228,7 +274,7 @@ def update_leave(request, leave_id):
         return HttpResponse('<p class="text-red-500">Please log in to update leave</p>')
     
     try:
-        leave = Leave_Record.objects.get(id=leave_id)
+        leave = get_leave(leave_id)
     except Leave_Record.DoesNotExist:
         return HttpResponse('<p class="text-red-500">Leave request not found</p>')
     
@@ -260,11 +306,30 @@ def update_leave(request, leave_id):
     if not leave_type or not start_date or not end_date:
         return HttpResponse('<p class="text-red-500">All fields are required</p>')
     
-    # Update the leave
-    leave.Leave_Type = leave_type
-    leave.Start_Date = start_date
-    leave.End_Date = end_date
-    leave.save()
+    try:
+        # parse_date returns None for a malformed date, raises for an impossible one
+        start_date = parse_date(start_date)
+        end_date = parse_date(end_date)
+    except ValueError:
+        start_date = end_date = None
+    if not start_date or not end_date:
+        return HttpResponse('<p class="text-red-500">Invalid date format</p>')
+    if start_date > end_date:
+        return HttpResponse('<p class="text-red-500">End Date must be after Start Date</p>')
+    try:
+        check_supported(start_date, end_date)
+    except ValueError as e:
+        return HttpResponse(f'<p class="text-red-500">{escape(str(e))}</p>')
+    
+    # Update the leave - only wins if it is still PENDING and conflict-free
+    try:
+        updated = update_pending_leave(
+            leave, actor=user.username, Leave_Type=leave_type, Start_Date=start_date, End_Date=end_date,
+        )
+    except LeaveConflict as e:
+        return HttpResponse(f'<p class="text-red-500">{escape(str(e))}</p>')
+    if not updated:
+        return HttpResponse('<p class="text-red-500">Only PENDING leaves can be updated</p>')
     
     # Return updated detail with context
     can_edit = True  # User just edited, so they can still edit
@@ -278,6 +343,7 @@ def update_leave(request, leave_id):
     return HttpResponse(html)
 
 
+@idempotent
 def cancel_leave(request, leave_id):
     """
     Handle leave cancellation via HTMX (PATCH request).
@@ -295,7 +361,7 @@ def cancel_leave(request, leave_id):
         return HttpResponse('<p class="text-red-500">Please log in to cancel leave</p>')
     
     try:
-        leave = Leave_Record.objects.get(id=leave_id)
+        leave = get_leave(leave_id)
     except Leave_Record.DoesNotExist:
         return HttpResponse('<p class="text-red-500">Leave request not found</p>')
     
@@ -303,16 +369,10 @@ def cancel_leave(request, leave_id):
     if leave.Employee_Name != user.username:
         return HttpResponse('<p class="text-red-500">You can only cancel your own leave requests</p>')
     
-    # Check if cancellable
-    if leave.Status not in ['PENDING', 'APPROVED']:
+    # Cancel the leave - a single conditional UPDATE, so a racing approval cannot be overwritten
+    if not transition_leave(leave, 'CANCELLED', actor=user.username):
         return HttpResponse(f'<p class="text-red-500">Cannot cancel leave with status: {leave.Status}</p>')
     
-    # Cancel the leave
-    leave.Status = 'CANCELLED'
-    leave.Cancelled_By = user.username
-    leave.Cancelled_On = timezone.now()
-    leave.save()
-    
     # Return updated detail with context
     can_edit = False  # Cancelled leaves can't be edited
     is_admin = user and (user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER'])
@@ -324,3 +384,41 @@ def cancel_leave(request, leave_id):
     })
     return HttpResponse(html)
 
+
+@read_only_view
+def render_absence_widget(request):
+    """
+    Render HTMX fragment for the "who's out" widget (admin view).
+    
+    Shows who is out on the selected day and the number of people out on
+    each of the following 7 days, read from the daily absence index.
+    Managers only see their reporting line.
+    
+    Query params:
+    - date: Day to show (YYYY-MM-DD, default: today)
+    
+    Returns:
+        HttpResponse: HTML fragment for the absence widget
+    """
+    user = get_user_from_request(request)
+    is_admin = user and (user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER'])
+    
+    if not is_admin:
+        return HttpResponse('<p class="text-red-500">Only admins and managers can view absences</p>')
+    
+    try:
+        day = parse_date(request.GET.get('date', ''))
+    except ValueError:
+        # Well-formed but impossible, e.g. 2026-02-30
+        day = None
+    # The following week must stay within date's range
+    if day is None or day.year >= 9999:
+        day = timezone.localdate()
+    absences = scope_leaves(Daily_Absence.objects.all(), user)
+    
+    html = render_to_string('partials/absence_widget.html', {
+        'day': day,
+        'absences': absent_on(day, absences),
+        'upcoming': sorted(absence_counts(day + timedelta(days=1), day + timedelta(days=7), absences).items()),
+    })
+    return HttpResponse(html)
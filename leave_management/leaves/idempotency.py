@@ -0,0 +1,150 @@
+"""
+Idempotency keys for Leave Management write endpoints.
+
+Clients on flaky networks retry writes. A write sent with an
+``Idempotency-Key`` header runs at most once per user, endpoint and key:
+
+- the stored response is looked up inside the write's transaction; if
+  found it is replayed (with ``Idempotent-Replayed: true``) without
+  running the view
+- otherwise the view runs and its response is inserted into
+  Idempotency_Key in the same transaction, so the write and its key commit
+  together. A concurrent duplicate either waits for that commit (SQLite
+  takes the write lock at BEGIN) or fails on the unique key, rolls back its
+  own write and replays the winner's response.
+
+Reusing a key with a different body is rejected with 422. Exceptions are
+not stored, so a retry after a failure executes again. Requests without
+the header are unaffected.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from django.views import View
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from authentication.utils import get_user_from_request
+from leave_management.renderers import ORJSONRenderer
+from leaves.models import Idempotency_Key
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _digest(*parts):
+    return hashlib.sha256(b'\x00'.join(
+        part if isinstance(part, bytes) else str(part).encode() for part in parts
+    )).hexdigest()
+
+
+def _request_hash(request):
+    try:
+        body = request.body
+    except RawPostDataException:
+        # Body already consumed as a multipart/form stream
+        body = repr(sorted(request.POST.lists())).encode()
+    return _digest(body)
+
+
+def _stored_response(key):
+    return Idempotency_Key.objects.filter(Key=key, Expires_On__gt=timezone.now()).first()
+
+
+def _replay(stored, request_hash):
+    if stored.Request_Hash != request_hash:
+        return JsonResponse(
+            {'error': f'{IDEMPOTENCY_HEADER} was already used with a different request'}, status=422,
+        )
+    response = HttpResponse(stored.Body, status=stored.Status_Code, content_type=stored.Content_Type)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _store(key, request_hash, response):
+    if isinstance(response, Response):
+        # DRF responses are rendered later by the view; store them as JSON
+        body, content_type = ORJSONRenderer().render(response.data), 'application/json'
+    else:
+        body, content_type = response.content, response.get('Content-Type', 'text/html')
+
+    now = timezone.now()
+    # An expired row with the same key may still be waiting for the purge
+    Idempotency_Key.objects.filter(Key=key, Expires_On__lte=now).delete()
+    Idempotency_Key.objects.create(
+        Key=key,
+        Request_Hash=request_hash,
+        Status_Code=response.status_code,
+        Content_Type=content_type,
+        Body=body.decode('utf-8', errors='replace'),
+        Created_On=now,
+        Expires_On=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+    )
+
+
+def idempotent(view):
+    """
+    Make a write view replay its response for retries with the same
+    ``Idempotency-Key``.
+
+    Works on function views (``request`` first) and on DRF view methods
+    (``self, request``). Responses with a 5xx status are not stored.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request = args[1] if isinstance(args[0], View) else args[0]
+        header = request.headers.get(IDEMPOTENCY_HEADER)
+        if not header:
+            return view(*args, **kwargs)
+        if len(header) > MAX_KEY_LENGTH:
+            return JsonResponse({'error': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'}, status=400)
+
+        user = request.user if isinstance(request, Request) else get_user_from_request(request)
+        if not user or not user.is_authenticated:
+            # The view reports the missing login
+            return view(*args, **kwargs)
+
+        key = _digest(user.pk, request.method, request.path, header)
+        request_hash = _request_hash(request)
+        try:
+            with transaction.atomic():
+                stored = _stored_response(key)
+                if stored is None:
+                    response = view(*args, **kwargs)
+                    if response.status_code < 500:
+                        _store(key, request_hash, response)
+                    return response
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            stored = _stored_response(key)
+            if stored is None:
+                raise
+        return _replay(stored, request_hash)
+
+    return wrapper
+
+
+def purge_expired_keys(batch_size=5000):
+    """
+    Delete expired idempotency keys in batches.
+
+    Returns:
+        int: Number of keys deleted
+    """
+    total = 0
+    while True:
+        ids = list(
+            Idempotency_Key.objects
+            .filter(Expires_On__lte=timezone.now())
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += Idempotency_Key.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,110 @@
+"""
+Read-through cache of single leave rows.
+
+The detail panel of a leave is opened, edited and re-rendered many times
+in a session, and every render used to load the row again. ``get_leave``
+keeps the column values of recently read leaves in a per-process LRU of
+at most settings.LEAVE_CACHE_SIZE entries, stamped with the leave data
+version (leaves.versions) they were read under.
+
+Every write path - save(), delete(), queryset update()/delete()/
+bulk_create()/bulk_update() - advances that version in its transaction,
+so an entry from an older version is never served: it is treated as a
+miss and replaced. The version is stored in the database and shared by
+every process, so a write in one worker invalidates every worker's
+entries, whatever cache backend is configured.
+
+Inside a transaction the cache is bypassed. The transaction may hold
+writes whose version bump has not happened yet, and rows it reads must
+not be stored before they are committed.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connections, router
+
+from leaves.models import Leave_Record
+from leaves.versions import get_data_version
+
+
+class _LRU:
+    """Thread-safe, size-bounded map of leave id -> (version, db alias, row)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+_cache = _LRU(getattr(settings, 'LEAVE_CACHE_SIZE', 2048))
+_field_names = tuple(field.attname for field in Leave_Record._meta.concrete_fields)
+
+
+def get_leave(leave_id):
+    """
+    Leave_Record ``leave_id``, from memory when the cached row is current.
+
+    Each call returns a new instance, so callers may modify it freely.
+
+    Args:
+        leave_id: Leave record ID
+
+    Returns:
+        Leave_Record
+
+    Raises:
+        Leave_Record.DoesNotExist: If there is no such leave
+    """
+    leave_id = int(leave_id)
+    if _cache.maxsize <= 0 or connections[router.db_for_write(Leave_Record)].in_atomic_block:
+        return Leave_Record.objects.get(id=leave_id)
+
+    version = get_data_version()
+    entry = _cache.get(leave_id, version)
+    if entry is not None:
+        _, alias, row = entry
+        return Leave_Record.from_db(alias, _field_names, row)
+
+    leave = Leave_Record.objects.get(id=leave_id)
+    _cache.put(leave_id, (version, leave._state.db, tuple(getattr(leave, name) for name in _field_names)))
+    return leave
+
+
+def cache_info():
+    """Hit and miss counts and the current size, for monitoring."""
+    return {
+        'hits': _cache.hits,
+        'misses': _cache.misses,
+        'size': len(_cache.entries),
+        'maxsize': _cache.maxsize,
+    }
+
+
+def clear_leave_cache():
+    """Drop every cached row (e.g. after editing the database by hand)."""
+    _cache.clear()
@@ -0,0 +1,438 @@
+"""
+Write-contention load harness for Leave Management.
+
+Reproduces write-heavy bursts (employees submitting leaves while managers
+approve them) by calling the real WSGI or ASGI application in-process
+from many threads, each request authenticated as one of many simulated
+users with a JWT. Writer threads pick operations from the write mix,
+reader threads from the read mix:
+
+- create        POST /leaves/leaves/                      (employee)
+- approve       PATCH /leaves/leaves/<id>/ Status=APPROVED (admin)
+- cancel        PATCH /htmx/my-leaves/<id>/cancel/         (owner)
+- htmx_leaves   GET /htmx/leaves/                          (admin)
+- stats         GET /api/stats/                            (any user)
+
+Per operation it reports throughput, 4xx rejections, errors (5xx), lock
+timeouts ("database is locked") and latency percentiles.
+
+The harness writes to the configured database: it creates ``loadtest-``
+users and their leaves, and deletes the leaves again (keeping rollups and
+the absence index consistent) unless asked to keep them. Run it against a
+copy of the database (DATABASE_PATH=...).
+"""
+import asyncio
+import io
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.core.signals import got_request_exception
+from django.db import connections, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import CustomUser
+from leaves.models import Leave_Record, Notification_Outbox
+from leaves.rollups import snapshot
+from leaves.services import leave_changed
+
+
+USER_PREFIX = 'loadtest-'
+
+# Sent as cookie and header on every request, as the browser pages do
+CSRF_TOKEN = 'loadtest' * 4
+
+WRITE_OPERATIONS = ('create', 'approve', 'cancel')
+READ_OPERATIONS = ('htmx_leaves', 'stats')
+DEFAULT_WRITE_MIX = {'create': 6, 'approve': 3, 'cancel': 1}
+DEFAULT_READ_MIX = {'htmx_leaves': 1, 'stats': 1}
+
+
+def parse_mix(value, allowed):
+    """
+    Parse 'create=6,approve=3' into {'create': 6, 'approve': 3}.
+
+    Raises:
+        ValueError: On unknown operations or non-positive totals
+    """
+    mix = {}
+    for part in filter(None, (part.strip() for part in value.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in allowed:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {', '.join(allowed)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError('The mix needs at least one operation with a positive weight')
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# Calling the application ---------------------------------------------------
+
+class WsgiDriver:
+    """Calls a WSGI application with hand-built environs."""
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, url, headers, body=b''):
+        parts = urlsplit(url)
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_LENGTH': str(len(body)),
+            'CONTENT_TYPE': headers.get('Content-Type', ''),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': io.StringIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in headers.items():
+            if name != 'Content-Type':
+                environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        status = {}
+
+        def start_response(status_line, response_headers, exc_info=None):
+            status['code'] = int(status_line.split(' ', 1)[0])
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status['code'], content
+
+
+class AsgiDriver:
+    """Calls an ASGI application, one event loop per calling thread."""
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, url, headers, body=b''):
+        return asyncio.run(self._request(method, url, headers, body))
+
+    async def _request(self, method, url, headers, body):
+        parts = urlsplit(url)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': parts.path,
+            'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(),
+            'root_path': '',
+            'headers': [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+            + [(b'content-length', str(len(body)).encode())],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 0),
+        }
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            # The client never disconnects
+            await asyncio.Event().wait()
+
+        status = {}
+        chunks = []
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.application(scope, receive, send)
+        return status['code'], b''.join(chunks)
+
+
+def get_driver(interface):
+    if interface == 'asgi':
+        from leave_management.asgi import application
+        return AsgiDriver(application)
+    from leave_management.wsgi import application
+    return WsgiDriver(application)
+
+
+# Simulated users -----------------------------------------------------------
+
+def create_users(employees, admins):
+    """
+    Create (or reuse) the load-test users and mint an access token for each.
+
+    Returns:
+        tuple: (employee list, admin list) of (username, Authorization header)
+    """
+    def ensure(username, role):
+        user = CustomUser.objects.filter(username=username).first()
+        if user is None:
+            user = CustomUser.objects.create_user(
+                username=username, email=f'{username}@loadtest.invalid', password=None, role=role,
+            )
+        return username, f'Bearer {RefreshToken.for_user(user).access_token}'
+
+    return (
+        [ensure(f'{USER_PREFIX}user-{index}', 'EMPLOYEE') for index in range(employees)],
+        [ensure(f'{USER_PREFIX}admin-{index}', 'ADMIN') for index in range(admins)],
+    )
+
+
+def cleanup(leave_ids=None):
+    """
+    Delete the load-test users' leaves through the normal delete path
+    (rollups and absence index updated) and their queued notifications.
+
+    Returns:
+        int: Number of leaves deleted
+    """
+    leaves = Leave_Record.objects.filter(Employee_Name__startswith=USER_PREFIX)
+    if leave_ids is not None:
+        leaves = leaves.filter(id__in=leave_ids)
+    deleted = []
+    for leave in leaves.iterator(chunk_size=500):
+        with transaction.atomic():
+            leave_id, before = leave.id, snapshot(leave)
+            leave.delete()
+            leave_changed(before, None, leave_id=leave_id)
+        deleted.append(leave_id)
+    Notification_Outbox.objects.filter(Leave_Id__in=deleted, Status='PENDING').delete()
+    return len(deleted)
+
+
+# The run -------------------------------------------------------------------
+
+class OperationStats:
+    def __init__(self):
+        self.latencies = []
+        self.ok = 0
+        self.rejected = 0
+        self.errors = 0
+        self.lock_timeouts = 0
+        self.skipped = 0
+
+    def summary(self, seconds):
+        latencies = sorted(self.latencies)
+        total = len(latencies)
+        ms = lambda value: round(value * 1000, 2) if value is not None else None
+        return {
+            'requests': total,
+            'throughput': round(total / seconds, 2) if seconds else 0.0,
+            'ok': self.ok,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'lock_timeouts': self.lock_timeouts,
+            'error_rate': round(self.errors / total, 4) if total else 0.0,
+            'lock_timeout_rate': round(self.lock_timeouts / total, 4) if total else 0.0,
+            'skipped': self.skipped,
+            'p50_ms': ms(percentile(latencies, 0.50)),
+            'p90_ms': ms(percentile(latencies, 0.90)),
+            'p99_ms': ms(percentile(latencies, 0.99)),
+            'max_ms': ms(latencies[-1] if latencies else None),
+        }
+
+
+class LoadTest:
+    """
+    One load-test run.
+
+    Args:
+        driver: WsgiDriver or AsgiDriver
+        employees: (username, auth header) pairs submitting and cancelling leaves
+        admins: (username, auth header) pairs approving and reading
+        write_mix / read_mix: operation -> weight
+        seed: Random seed, for repeatable operation sequences
+    """
+
+    def __init__(self, driver, employees, admins, write_mix=None, read_mix=None, seed=None):
+        self.driver = driver
+        self.employees = employees
+        self.admins = admins
+        self.write_mix = write_mix or DEFAULT_WRITE_MIX
+        self.read_mix = read_mix or DEFAULT_READ_MIX
+        self.seed = seed
+        self.stats = defaultdict(OperationStats)
+        self.lock = threading.Lock()
+        self.pending = []  # (leave id, owner auth) available to approve or cancel
+        self.created = []
+        self.cursors = {}  # employee -> next free start date
+        self.request_ids = itertools.count(1)
+        self.exceptions = {}  # request id -> exception raised by the view
+
+    # Exceptions raised inside views never reach the caller (the handler
+    # answers 500), so they are collected by request id to spot lock timeouts.
+    # Under ASGI the view runs on another thread, hence the id header.
+    def _on_exception(self, sender, request=None, **kwargs):
+        request_id = request.headers.get('X-Loadtest-Request') if request is not None else None
+        if request_id:
+            self.exceptions[request_id] = sys.exc_info()[1]
+
+    def _call(self, operation, method, url, auth, payload=None):
+        request_id = str(next(self.request_ids))
+        headers = {
+            'Authorization': auth,
+            'Cookie': f'csrftoken={CSRF_TOKEN}',
+            'X-CSRFToken': CSRF_TOKEN,
+            'X-Loadtest-Request': request_id,
+        }
+        body = b''
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+            body = json.dumps(payload).encode()
+
+        started = time.perf_counter()
+        try:
+            status, content = self.driver.request(method, url, headers, body)
+        except Exception as e:
+            status, content = 599, b''
+            self.exceptions[request_id] = e
+        elapsed = time.perf_counter() - started
+
+        error = self.exceptions.pop(request_id, None)
+        locked = error is not None and 'database is locked' in str(error)
+        with self.lock:
+            stats = self.stats[operation]
+            stats.latencies.append(elapsed)
+            if status >= 500:
+                stats.errors += 1
+                stats.lock_timeouts += 1 if locked else 0
+            elif status >= 400:
+                stats.rejected += 1
+            else:
+                stats.ok += 1
+        return status, content
+
+    def _skip(self, operation):
+        with self.lock:
+            self.stats[operation].skipped += 1
+
+    def _take_pending(self, rng):
+        with self.lock:
+            if not self.pending:
+                return None
+            return self.pending.pop(rng.randrange(len(self.pending)))
+
+    # Operations
+
+    def op_create(self, rng):
+        username, auth = rng.choice(self.employees)
+        length = rng.randint(1, 3)
+        with self.lock:
+            start = self.cursors.get(username) or timezone.localdate() + timedelta(days=rng.randint(7, 60))
+            self.cursors[username] = start + timedelta(days=length + 1)
+        status, content = self._call('create', 'POST', '/leaves/leaves/', auth, {
+            'Employee_Name': username,
+            'Leave_Type': rng.choice(['SICK', 'CASUAL', 'EARNED']),
+            'Start_Date': start.isoformat(),
+            'End_Date': (start + timedelta(days=length - 1)).isoformat(),
+        })
+        if status == 201:
+            leave_id = json.loads(content)['id']
+            with self.lock:
+                self.pending.append((leave_id, auth))
+                self.created.append(leave_id)
+
+    def op_approve(self, rng):
+        taken = self._take_pending(rng)
+        if taken is None:
+            return self._skip('approve')
+        _, auth = rng.choice(self.admins)
+        self._call('approve', 'PATCH', f'/leaves/leaves/{taken[0]}/', auth, {'Status': 'APPROVED'})
+
+    def op_cancel(self, rng):
+        taken = self._take_pending(rng)
+        if taken is None:
+            return self._skip('cancel')
+        leave_id, owner_auth = taken
+        self._call('cancel', 'PATCH', f'/htmx/my-leaves/{leave_id}/cancel/', owner_auth)
+
+    def op_htmx_leaves(self, rng):
+        _, auth = rng.choice(self.admins)
+        status = rng.choice(['', 'PENDING', 'APPROVED'])
+        self._call('htmx_leaves', 'GET', f'/htmx/leaves/?status={status}', auth)
+
+    def op_stats(self, rng):
+        _, auth = rng.choice(self.employees + self.admins)
+        self._call('stats', 'GET', '/api/stats/', auth)
+
+    def _worker(self, index, mix, deadline, request_budget):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        operations = list(mix)
+        weights = [mix[name] for name in operations]
+        done = 0
+        while time.perf_counter() < deadline and (request_budget is None or done < request_budget):
+            getattr(self, f'op_{rng.choices(operations, weights)[0]}')(rng)
+            done += 1
+
+    def run(self, writers=8, readers=8, duration=30.0, requests_per_thread=None):
+        """
+        Run writer and reader threads until ``duration`` seconds pass (or each
+        thread has sent ``requests_per_thread`` requests).
+
+        Returns:
+            dict: {'seconds', 'writers', 'readers', 'operations': {name: summary}, 'total': summary}
+        """
+        got_request_exception.connect(self._on_exception, dispatch_uid='leaves-loadtest')
+        threads = []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+
+        def target(index, mix):
+            try:
+                self._worker(index, mix, deadline, requests_per_thread)
+            finally:
+                connections.close_all()
+
+        for index in range(writers):
+            threads.append(threading.Thread(target=target, args=(index, self.write_mix)))
+        for index in range(readers):
+            threads.append(threading.Thread(target=target, args=(writers + index, self.read_mix)))
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            got_request_exception.disconnect(dispatch_uid='leaves-loadtest')
+        seconds = time.perf_counter() - started
+
+        total = OperationStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            for field in ('ok', 'rejected', 'errors', 'lock_timeouts', 'skipped'):
+                setattr(total, field, getattr(total, field) + getattr(stats, field))
+        return {
+            'seconds': round(seconds, 2),
+            'writers': writers,
+            'readers': readers,
+            'operations': {name: stats.summary(seconds) for name, stats in sorted(self.stats.items())},
+            'total': total.summary(seconds),
+        }
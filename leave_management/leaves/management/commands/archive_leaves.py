@@ -0,0 +1,33 @@
+"""
+Move closed leaves that ended before a cutoff into the archive table.
+
+    python manage.py archive_leaves
+    python manage.py archive_leaves --before 2025-01-01 --batch-size 5000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from leaves.archive import archive_closed_leaves, default_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Archive closed leaves (approved, rejected, cancelled) that ended before a cutoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            help='Cutoff date YYYY-MM-DD (default: today minus LEAVE_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        cutoff = default_cutoff()
+        if options['before']:
+            cutoff = parse_date(options['before'])
+            if cutoff is None:
+                raise CommandError('--before must be a date in YYYY-MM-DD format')
+
+        archived = archive_closed_leaves(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} leave(s) that ended before {cutoff}'
+        ))
@@ -0,0 +1,79 @@
+"""
+Compare the API renderers and parsers on large leave and user lists.
+
+    python manage.py benchmark_renderers --rows 10000 --repeat 5
+
+Serializes up to --rows Leave_Record rows (LeaveRecordSerializer) and
+users (UserSerializer, as /api/users/ returns them), then times rendering
+and parsing the result with DRF's default JSON renderer/parser, the
+orjson ones and MessagePack. Fill the database first, e.g. with
+`manage.py generate_data`.
+"""
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from authentication.models import CustomUser
+from authentication.serializers import UserSerializer
+from leave_management.parsers import MessagePackParser, ORJSONParser
+from leave_management.renderers import MessagePackRenderer, ORJSONRenderer
+from leaves.models import Leave_Record
+from leaves.serializers import LeaveRecordSerializer
+
+
+FORMATS = (
+    ('drf-json', JSONRenderer, JSONParser),
+    ('orjson', ORJSONRenderer, ORJSONParser),
+    ('msgpack', MessagePackRenderer, MessagePackParser),
+)
+
+
+def _best(function, repeat):
+    """Fastest of ``repeat`` runs, in milliseconds, and the last result."""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON (DRF and orjson) and MessagePack rendering and parsing of leave and user lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows per list')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (the fastest is reported)')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], max(1, options['repeat'])
+        payloads = []
+
+        leaves = list(Leave_Record.objects.order_by('id')[:rows])
+        if leaves:
+            serialize_ms, data = _best(lambda: LeaveRecordSerializer(leaves, many=True).data, repeat)
+            payloads.append(('leaves', len(leaves), serialize_ms, data))
+        users = list(CustomUser.objects.order_by('id')[:rows])
+        if users:
+            serialize_ms, data = _best(lambda: {'users': UserSerializer(users, many=True).data}, repeat)
+            payloads.append(('users', len(users), serialize_ms, data))
+        if not payloads:
+            raise CommandError('No leaves or users to benchmark; run `manage.py generate_data` first')
+
+        self.stdout.write(f"{'payload':<8} {'rows':>7} {'format':<9} {'render ms':>10} {'parse ms':>9} {'bytes':>10} {'speedup':>8}")
+        for name, count, serialize_ms, data in payloads:
+            baseline = None
+            for label, renderer_class, parser_class in FORMATS:
+                renderer, parser = renderer_class(), parser_class()
+                render_ms, body = _best(lambda: renderer.render(data), repeat)
+                parse_ms, _ = _best(lambda: parser.parse(io.BytesIO(body)), repeat)
+                baseline = baseline or render_ms
+                self.stdout.write(
+                    f'{name:<8} {count:>7} {label:<9} {render_ms:>10.1f} {parse_ms:>9.1f} {len(body):>10} '
+                    f'{baseline / render_ms:>7.1f}x'
+                )
+            self.stdout.write(f'{name:<8} {count:>7} {"(serializer)":<9} {serialize_ms:>10.1f}')
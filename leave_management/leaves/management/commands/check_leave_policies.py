@@ -0,0 +1,48 @@
+"""
+Re-validate stored leaves against LEAVE_POLICIES and list the violations.
+
+    python manage.py check_leave_policies
+    python manage.py check_leave_policies --rule earned-notice --all-statuses
+"""
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from leaves.conflicts import ACTIVE_STATUSES
+from leaves.models import Leave_Record
+from leaves.policy import find_violations, get_policy
+
+
+class Command(BaseCommand):
+    help = 'List leaves that break the configured leave policies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rule', action='append', dest='rules', help='Only check this rule (repeatable)')
+        parser.add_argument(
+            '--all-statuses', action='store_true',
+            help='Also check rejected and cancelled leaves (default: pending and approved only)',
+        )
+        parser.add_argument('--quiet', action='store_true', help='Only print the totals per rule')
+
+    def handle(self, *args, **options):
+        names = {rule.name for rule in get_policy().rules}
+        unknown = set(options['rules'] or []) - names
+        if unknown:
+            raise CommandError(f"Unknown rule(s): {', '.join(sorted(unknown))}. Configured: {', '.join(sorted(names)) or 'none'}")
+
+        statuses = [status for status, _ in Leave_Record.STATUS_TYPES] if options['all_statuses'] else ACTIVE_STATUSES
+        started = time.perf_counter()
+        totals = Counter()
+        for violation in find_violations(rule_names=options['rules'], statuses=statuses):
+            totals[violation['rule']] += 1
+            if not options['quiet']:
+                self.stdout.write(
+                    f"#{violation['leave_id']} {violation['employee']}: {violation['rule']} - {violation['message']}"
+                )
+
+        for name in sorted(totals):
+            self.stdout.write(f'{name}: {totals[name]} violation(s)')
+        self.stdout.write(self.style.SUCCESS(
+            f'{sum(totals.values())} violation(s) found in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,37 @@
+"""
+Background worker that drains the notification outbox.
+
+    python manage.py dispatch_notifications            # run forever
+    python manage.py dispatch_notifications --once     # drain due rows and exit
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from leaves.notifications import dispatch_notifications, get_setting
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending leave notifications from the outbox as per-recipient digests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain due notifications and exit')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when idle')
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or get_setting('BATCH_SIZE')
+
+        while True:
+            result = dispatch_notifications(batch_size=batch_size)
+            if result['claimed']:
+                self.stdout.write(
+                    f"Claimed {result['claimed']} notification(s): "
+                    f"{result['sent']} digest(s) sent, {result['failed']} failed"
+                )
+                # Keep draining while there is a backlog
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
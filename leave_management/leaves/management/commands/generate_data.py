@@ -0,0 +1,83 @@
+"""
+Fill the database with synthetic users and leaves for performance work.
+
+    python manage.py generate_data --users 50000 --leaves 1000000 --seed 1
+    python manage.py generate_data --users 200 --leaves 5000 --prefix demo --from 2025-01-01 --to 2026-12-31
+
+Users are named <prefix>-0000001 and share one password (--password).
+The reporting lines are rebuilt afterwards; the monthly rollups and the
+daily absence index too, unless --skip-derived is given. Use a copy of
+the database (DATABASE_PATH=...).
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from authentication.hierarchy import rebuild_reporting_lines
+from authentication.models import CustomUser
+from leaves.absences import rebuild_absences
+from leaves.rollups import rebuild_rollups
+from leaves.synthetic import generate_leaves, generate_users
+from leaves.versions import bump_data_version
+
+
+def _date(value):
+    day = parse_date(value)
+    if day is None:
+        raise CommandError(f'Invalid date {value!r}, expected YYYY-MM-DD')
+    return day
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users and leave records'
+
+    def add_arguments(self, parser):
+        today = timezone.localdate()
+        parser.add_argument('--users', type=int, default=2000, help='Number of users')
+        parser.add_argument('--leaves', type=int, default=50000, help='Number of leave records')
+        parser.add_argument('--from', dest='first_day', default=str(date(today.year - 2, 1, 1)), help='First leave date')
+        parser.add_argument('--to', dest='last_day', default=str(date(today.year, 12, 31)), help='Last leave date')
+        parser.add_argument('--today', default=None, help='Date separating past and future statuses (default: today)')
+        parser.add_argument('--prefix', default='gen', help='Username prefix of the generated users')
+        parser.add_argument('--password', default='password', help='Password of every generated user')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+        parser.add_argument('--skip-derived', action='store_true', help='Do not rebuild rollups and the absence index')
+
+    def handle(self, *args, **options):
+        first_day, last_day = _date(options['first_day']), _date(options['last_day'])
+        today = _date(options['today']) if options['today'] else None
+        prefix = options['prefix']
+        if first_day > last_day:
+            raise CommandError('--from must not be after --to')
+        if options['users'] < 3 or options['leaves'] < 0:
+            raise CommandError('--users must be at least 3 and --leaves not negative')
+        if CustomUser.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f'Users named {prefix}-... already exist; choose another --prefix')
+
+        started = time.perf_counter()
+        employees = generate_users(options['users'], prefix=prefix, password=options['password'],
+                                   seed=options['seed'], batch_size=options['batch_size'])
+        rebuild_reporting_lines()
+        self.stdout.write(f"Created {options['users']} user(s) in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        written = generate_leaves(employees, options['leaves'], first_day, last_day, today=today,
+                                  seed=options['seed'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Created {written} leave(s) in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f}/s)')
+        if written < options['leaves']:
+            self.stdout.write(self.style.WARNING(
+                f"Only {written} of {options['leaves']} leaves fit in the date range without overlaps"
+            ))
+
+        if not options['skip_derived']:
+            started = time.perf_counter()
+            rebuild_rollups()
+            rebuild_absences()
+            self.stdout.write(f'Rebuilt rollups and the absence index in {time.perf_counter() - started:.1f}s')
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS('Done'))
@@ -0,0 +1,89 @@
+"""
+Drive the application in-process with concurrent readers and writers.
+
+    DATABASE_PATH=/tmp/load.sqlite3 python manage.py load_test --writers 8 --readers 8 --duration 30
+    python manage.py load_test --interface asgi --write-mix create=1,approve=1 --json results.json
+
+Writes go to the configured database - point DATABASE_PATH at a copy.
+See leaves.loadtest for the operations.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from leaves.loadtest import (
+    DEFAULT_READ_MIX, DEFAULT_WRITE_MIX, READ_OPERATIONS, WRITE_OPERATIONS,
+    LoadTest, cleanup, create_users, get_driver, parse_mix,
+)
+
+
+def _format_mix(mix):
+    return ','.join(f'{name}={weight:g}' for name, weight in mix.items())
+
+
+class Command(BaseCommand):
+    help = 'Load-test leave submissions, approvals, cancellations and dashboard reads concurrently'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interface', choices=['wsgi', 'asgi'], default='wsgi')
+        parser.add_argument('--writers', type=int, default=8, help='Writer threads')
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+        parser.add_argument('--requests', type=int, default=None, help='Stop each thread after this many requests')
+        parser.add_argument('--employees', type=int, default=50, help='Simulated employees')
+        parser.add_argument('--admins', type=int, default=5, help='Simulated approvers')
+        parser.add_argument('--write-mix', default=_format_mix(DEFAULT_WRITE_MIX), help=f"Weights of {', '.join(WRITE_OPERATIONS)}")
+        parser.add_argument('--read-mix', default=_format_mix(DEFAULT_READ_MIX), help=f"Weights of {', '.join(READ_OPERATIONS)}")
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for repeatable runs')
+        parser.add_argument('--keep', action='store_true', help='Keep the leaves created by the run')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file')
+
+    def handle(self, *args, **options):
+        try:
+            write_mix = parse_mix(options['write_mix'], WRITE_OPERATIONS)
+            read_mix = parse_mix(options['read_mix'], READ_OPERATIONS)
+        except ValueError as e:
+            raise CommandError(e)
+        if options['employees'] < 1 or options['admins'] < 1:
+            raise CommandError('--employees and --admins must be at least 1')
+
+        driver = get_driver(options['interface'])
+        employees, admins = create_users(options['employees'], options['admins'])
+        test = LoadTest(driver, employees, admins, write_mix=write_mix, read_mix=read_mix, seed=options['seed'])
+
+        self.stdout.write(
+            f"Running {options['writers']} writer(s) and {options['readers']} reader(s) "
+            f"over {options['interface'].upper()} for {options['duration']:g}s..."
+        )
+        try:
+            results = test.run(
+                writers=options['writers'], readers=options['readers'],
+                duration=options['duration'], requests_per_thread=options['requests'],
+            )
+        finally:
+            if not options['keep']:
+                deleted = cleanup(test.created)
+                self.stdout.write(f'Cleaned up {deleted} leave(s)')
+
+        header = f"{'operation':<12} {'req':>6} {'req/s':>8} {'ok':>6} {'4xx':>5} {'err':>5} {'locked':>6} {'p50ms':>8} {'p90ms':>8} {'p99ms':>8} {'maxms':>8}"
+        self.stdout.write(header)
+        for name, row in list(results['operations'].items()) + [('total', results['total'])]:
+            self.stdout.write(
+                f"{name:<12} {row['requests']:>6} {row['throughput']:>8.1f} {row['ok']:>6} {row['rejected']:>5} "
+                f"{row['errors']:>5} {row['lock_timeouts']:>6} "
+                + ' '.join(f"{row[key] if row[key] is not None else '-':>8}" for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'))
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as stream:
+                json.dump(results, stream, indent=2)
+
+        total = results['total']
+        message = (
+            f"{total['requests']} request(s) in {results['seconds']}s: "
+            f"error rate {total['error_rate']:.2%}, lock-timeout rate {total['lock_timeout_rate']:.2%}"
+        )
+        if total['errors']:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
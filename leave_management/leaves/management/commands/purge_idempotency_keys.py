@@ -0,0 +1,19 @@
+"""
+Delete idempotency keys whose replay window has passed.
+
+    python manage.py purge_idempotency_keys
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Delete expired idempotency keys (older than IDEMPOTENCY_KEY_TTL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency key(s)'))
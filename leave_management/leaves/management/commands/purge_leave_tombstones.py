@@ -0,0 +1,21 @@
+"""
+Delete change-feed tombstones of leaves deleted long ago.
+
+    python manage.py purge_leave_tombstones
+    python manage.py purge_leave_tombstones --days 30
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.changes import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete leave tombstones older than LEAVE_TOMBSTONE_TTL_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Age in days (default: LEAVE_TOMBSTONE_TTL_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = purge_tombstones(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} leave tombstone(s)'))
@@ -0,0 +1,19 @@
+"""
+Recompute the daily absence index from approved leaves.
+
+    python manage.py rebuild_absence_index
+
+The index is maintained on every write; run this after bulk imports or
+direct database edits.
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.absences import rebuild_absences
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Daily_Absence rows from APPROVED leave records'
+
+    def handle(self, *args, **options):
+        total = rebuild_absences()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total} daily absence row(s)'))
@@ -0,0 +1,50 @@
+"""
+Run a batch job over every employee on a process pool.
+
+    python manage.py run_batch_job annual_leave_summary --year 2025 --workers 4
+
+An interrupted run is resumed automatically the next time the same job
+is started with the same parameters; pass --fresh to start over.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from leaves.batch import JOBS, execute_run, get_job, start_or_resume_run
+
+
+class Command(BaseCommand):
+    help = 'Run a registered batch job over all users in parallel chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job', choices=sorted(JOBS))
+        parser.add_argument('--year', type=int, help='Year for yearly jobs (default: current year)')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Users per chunk')
+        parser.add_argument('--fresh', action='store_true', help='Start a new run instead of resuming')
+
+    def handle(self, *args, **options):
+        try:
+            job = get_job(options['job'])
+            params = job.clean_params({'year': options['year']})
+        except ValueError as e:
+            raise CommandError(e)
+
+        run, resumed = start_or_resume_run(job, params, options['chunk_size'], fresh=options['fresh'])
+        self.stdout.write(
+            f"{'Resuming' if resumed else 'Starting'} {job.name} run #{run.id} with {params}"
+        )
+
+        def progress(stats):
+            self.stdout.write(
+                f"  chunks {stats['chunks_done']}/{stats['chunks_total']}, "
+                f"{stats['users']} users, {stats['users_per_second']:.1f} users/s"
+            )
+
+        stats = execute_run(run, workers=options['workers'], progress=progress)
+
+        message = (
+            f"Run #{run.id}: {stats['users']} users in {stats['seconds']:.2f}s "
+            f"({stats['users_per_second']:.1f} users/s)"
+        )
+        if stats['failed']:
+            raise CommandError(f"{message}, {stats['failed']} chunk(s) failed - rerun to resume")
+        self.stdout.write(self.style.SUCCESS(message))
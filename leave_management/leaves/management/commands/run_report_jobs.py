@@ -0,0 +1,36 @@
+"""
+Background worker that builds queued leave reports and expires old ones.
+
+    python manage.py run_report_jobs            # run forever
+    python manage.py run_report_jobs --once     # build queued reports and exit
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from leaves.reports import purge_expired_reports, run_report_jobs
+
+
+class Command(BaseCommand):
+    help = 'Build queued leave reports in chunks and delete expired report files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Build queued reports and exit')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when idle')
+        parser.add_argument('--chunk-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            expired = purge_expired_reports()
+            if expired:
+                self.stdout.write(f'Expired {expired} report(s)')
+
+            result = run_report_jobs(limit=1, chunk_size=options['chunk_size'])
+            if result['built'] or result['failed']:
+                self.stdout.write(f"Built {result['built']} report(s), {result['failed']} failed")
+                # Keep going while jobs are queued
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
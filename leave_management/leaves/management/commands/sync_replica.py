@@ -0,0 +1,40 @@
+"""
+Copy the primary SQLite database into the replica file.
+
+Used to run the primary/replica setup locally, where the "replica" is a
+second SQLite file refreshed from the primary on demand:
+
+    DATABASE_REPLICA_PATH=db_replica.sqlite3 python manage.py sync_replica
+"""
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from leave_management.db import REPLICA_ALIAS, replica_configured
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica SQLite file'
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError('No replica configured; set DATABASE_REPLICA_PATH')
+
+        primary = connections['default']
+        replica = connections[REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('sync_replica only supports SQLite databases')
+
+        # Online backup: consistent snapshot without blocking writers for long
+        source = sqlite3.connect(str(primary.settings_dict['NAME']))
+        target = sqlite3.connect(str(replica.settings_dict['NAME']))
+        try:
+            source.backup(target, pages=1024)
+        finally:
+            target.close()
+            source.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Replica {replica.settings_dict['NAME']} synced from {primary.settings_dict['NAME']}"
+        ))
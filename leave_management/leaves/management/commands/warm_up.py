@@ -0,0 +1,24 @@
+"""
+Run the worker warm-up and print how long each step took.
+
+    python manage.py warm_up
+
+Run it in a fresh process to see the cold cost that WSGI/ASGI workers now
+pay at boot instead of on their first requests.
+"""
+from django.core.management.base import BaseCommand
+
+from leave_management.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Precompile templates, populate URL resolvers and build serializers, with timings'
+
+    def handle(self, *args, **options):
+        report = warm_up()
+        total = report.pop('total')
+        for name, result in report.items():
+            seconds = result.pop('seconds')
+            counts = ', '.join(f'{key}={value}' for key, value in result.items())
+            self.stdout.write(f'{name:<10} {seconds:8.3f}s  {counts}')
+        self.stdout.write(self.style.SUCCESS(f"Warm-up finished in {total['seconds']:.3f}s"))
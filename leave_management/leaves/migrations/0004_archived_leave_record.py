@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0003_leave_record_cancelled_by_leave_record_cancelled_on_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Archived_Leave_Record',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('Employee_Name', models.CharField(max_length=50)),
+                ('Leave_Type', models.CharField(choices=[('SICK', 'Sick Leave'), ('CASUAL', 'Casual Leave'), ('EARNED', 'Earned Leave')], max_length=6)),
+                ('Start_Date', models.DateField()),
+                ('End_Date', models.DateField(db_index=True)),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('Applied_On', models.DateTimeField()),
+                ('Cancelled_By', models.CharField(blank=True, max_length=50, null=True)),
+                ('Cancelled_On', models.DateTimeField(blank=True, null=True)),
+                ('Archived_On', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Employee_Name', 'Start_Date'], name='leaves_arch_Employe_62289d_idx'), models.Index(fields=['Start_Date'], name='leaves_arch_Start_D_dffaf1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0004_archived_leave_record'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification_Outbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Event', models.CharField(choices=[('SUBMITTED', 'Submitted'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('Recipient', models.EmailField(max_length=100)),
+                ('Leave_Id', models.BigIntegerField()),
+                ('Payload', models.JSONField(default=dict)),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('Attempts', models.PositiveSmallIntegerField(default=0)),
+                ('Next_Attempt_At', models.DateTimeField(default=django.utils.timezone.now)),
+                ('Claimed_By', models.CharField(blank=True, max_length=32, null=True)),
+                ('Claimed_At', models.DateTimeField(blank=True, null=True)),
+                ('Last_Error', models.TextField(blank=True, null=True)),
+                ('Created_On', models.DateTimeField(auto_now_add=True)),
+                ('Sent_On', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Status', 'Next_Attempt_At'], name='leaves_noti_Status_f276b4_idx'), models.Index(fields=['Claimed_By'], name='leaves_noti_Claimed_e111ac_idx')],
+            },
+        ),
+    ]
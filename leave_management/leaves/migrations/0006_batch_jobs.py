@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0005_notification_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Batch_Run',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Job_Name', models.CharField(max_length=50)),
+                ('Params', models.JSONField(default=dict)),
+                ('Status', models.CharField(choices=[('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='RUNNING', max_length=10)),
+                ('Started_On', models.DateTimeField(auto_now_add=True)),
+                ('Finished_On', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Job_Name', 'Status'], name='leaves_batc_Job_Nam_92629d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Annual_Leave_Summary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Year', models.PositiveSmallIntegerField()),
+                ('Sick_Days', models.PositiveIntegerField(default=0)),
+                ('Casual_Days', models.PositiveIntegerField(default=0)),
+                ('Earned_Days', models.PositiveIntegerField(default=0)),
+                ('Total_Days', models.PositiveIntegerField(default=0)),
+                ('Pending_Count', models.PositiveIntegerField(default=0)),
+                ('Approved_Count', models.PositiveIntegerField(default=0)),
+                ('Rejected_Count', models.PositiveIntegerField(default=0)),
+                ('Cancelled_Count', models.PositiveIntegerField(default=0)),
+                ('Generated_On', models.DateTimeField(auto_now=True)),
+                ('Employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='annual_leave_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Year'], name='leaves_annu_Year_7d5005_idx')],
+                'constraints': [models.UniqueConstraint(fields=('Employee', 'Year'), name='unique_annual_leave_summary')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Batch_Chunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('First_User_Id', models.BigIntegerField()),
+                ('Last_User_Id', models.BigIntegerField()),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('Processed', models.PositiveIntegerField(default=0)),
+                ('Seconds', models.FloatField(default=0)),
+                ('Error', models.TextField(blank=True, null=True)),
+                ('Finished_On', models.DateTimeField(blank=True, null=True)),
+                ('Run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='leaves.batch_run')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Run', 'Status'], name='leaves_batc_Run_id_7ef5f9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:41
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_no_of_days(apps, schema_editor):
+    """Count weekdays for existing leaves (no holidays exist yet)."""
+    for model_name in ('Leave_Record', 'Archived_Leave_Record'):
+        model = apps.get_model('leaves', model_name)
+        changed = []
+        for leave in model.objects.only('id', 'Start_Date', 'End_Date').iterator():
+            days = 0
+            day = leave.Start_Date
+            while day <= leave.End_Date:
+                if day.weekday() < 5:
+                    days += 1
+                day += timedelta(days=1)
+            leave.No_of_Days = days
+            changed.append(leave)
+        model.objects.bulk_update(changed, ['No_of_Days'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0006_batch_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Date', models.DateField(unique=True)),
+                ('Name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['Date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archived_leave_record',
+            name='No_of_Days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='leave_record',
+            name='No_of_Days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_no_of_days, migrations.RunPython.noop),
+    ]
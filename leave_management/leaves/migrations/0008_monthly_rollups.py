@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0007_leave_working_days'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Monthly_Employee_Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Month', models.DateField()),
+                ('Employee_Name', models.CharField(max_length=50)),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('Leave_Count', models.IntegerField(default=0)),
+                ('Leave_Days', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Status', 'Month'], name='leaves_mont_Status_b42e0e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('Month', 'Employee_Name', 'Status'), name='unique_monthly_employee_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Monthly_Leave_Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Month', models.DateField()),
+                ('Leave_Type', models.CharField(choices=[('SICK', 'Sick Leave'), ('CASUAL', 'Casual Leave'), ('EARNED', 'Earned Leave')], max_length=6)),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('Leave_Count', models.IntegerField(default=0)),
+                ('Leave_Days', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('Month', 'Leave_Type', 'Status'), name='unique_monthly_leave_rollup')],
+            },
+        ),
+    ]
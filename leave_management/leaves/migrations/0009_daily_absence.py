@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0008_monthly_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Daily_Absence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Date', models.DateField()),
+                ('Employee_Name', models.CharField(max_length=50)),
+                ('Leave_Type', models.CharField(choices=[('SICK', 'Sick Leave'), ('CASUAL', 'Casual Leave'), ('EARNED', 'Earned Leave')], max_length=6)),
+                ('Leave_Id', models.BigIntegerField(db_index=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('Date', 'Employee_Name', 'Leave_Id'), name='unique_daily_absence')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0009_daily_absence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leave_record',
+            name='Employee_Name',
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+    ]
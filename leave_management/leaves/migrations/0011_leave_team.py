@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_team'),
+        ('leaves', '0010_leave_employee_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archived_leave_record',
+            name='Team',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_leaves', to='authentication.team'),
+        ),
+        migrations.AddField(
+            model_name='leave_record',
+            name='Team',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leaves', to='authentication.team'),
+        ),
+        migrations.AddIndex(
+            model_name='archived_leave_record',
+            index=models.Index(fields=['Team', 'Start_Date'], name='leaves_arch_Team_id_cc06a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave_record',
+            index=models.Index(fields=['Team', 'Status', 'Start_Date'], name='leaves_leav_Team_id_0054b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave_record',
+            index=models.Index(fields=['Team', 'Start_Date'], name='leaves_leav_Team_id_b1f1a4_idx'),
+        ),
+    ]
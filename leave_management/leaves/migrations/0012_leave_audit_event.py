@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0011_leave_team'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leave_Audit_Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Leave_Id', models.BigIntegerField()),
+                ('Employee_Name', models.CharField(max_length=50)),
+                ('Action', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('STATUS_CHANGED', 'Status changed'), ('DELETED', 'Deleted')], max_length=14)),
+                ('Actor', models.CharField(blank=True, max_length=50, null=True)),
+                ('Old_Values', models.JSONField(default=dict)),
+                ('New_Values', models.JSONField(default=dict)),
+                ('Occurred_On', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Leave_Id', 'Occurred_On'], name='leaves_leav_Leave_I_fe2524_idx'), models.Index(fields=['Actor', 'Occurred_On'], name='leaves_leav_Actor_50d603_idx'), models.Index(fields=['Occurred_On'], name='leaves_leav_Occurre_9932f5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0012_leave_audit_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Idempotency_Key',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Key', models.CharField(max_length=64, unique=True)),
+                ('Request_Hash', models.CharField(max_length=64)),
+                ('Status_Code', models.PositiveSmallIntegerField()),
+                ('Content_Type', models.CharField(max_length=100)),
+                ('Body', models.TextField(blank=True)),
+                ('Created_On', models.DateTimeField(default=django.utils.timezone.now)),
+                ('Expires_On', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
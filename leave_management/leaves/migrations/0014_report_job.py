@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0013_idempotency_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Report_Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Job_Key', models.CharField(db_index=True, max_length=64)),
+                ('Scope_Key', models.CharField(max_length=100)),
+                ('Params', models.JSONField(default=dict)),
+                ('Format', models.CharField(choices=[('csv', 'CSV'), ('json', 'JSON')], max_length=4)),
+                ('Data_Version', models.BigIntegerField()),
+                ('Status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], default='PENDING', max_length=10)),
+                ('Rows_Total', models.PositiveIntegerField(blank=True, null=True)),
+                ('Rows_Done', models.PositiveIntegerField(default=0)),
+                ('File_Name', models.CharField(blank=True, max_length=255, null=True)),
+                ('File_Size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('Error', models.TextField(blank=True, null=True)),
+                ('Claimed_By', models.CharField(blank=True, max_length=32, null=True)),
+                ('Claimed_At', models.DateTimeField(blank=True, null=True)),
+                ('Created_On', models.DateTimeField(default=django.utils.timezone.now)),
+                ('Finished_On', models.DateTimeField(blank=True, null=True)),
+                ('Expires_On', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('Requested_By', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Status', 'Created_On'], name='leaves_repo_Status_3b2462_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0014_report_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leave_record',
+            name='Employee_Name',
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='leave_record',
+            index=models.Index(fields=['Employee_Name', 'Start_Date', 'End_Date'], name='leaves_leav_Employe_f6fc7c_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0015_leave_employee_interval_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave_record',
+            index=models.Index(fields=['Applied_On', 'id'], name='leaves_leav_Applied_b23cf6_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_counter(apps, schema_editor):
+    """Existing leaves keep change number 0; new writes start at 1."""
+    apps.get_model('leaves', 'Leave_Change_Counter').objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0016_leave_applied_on_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leave_Change_Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Last_Seq', models.BigIntegerField(default=0)),
+                ('Purged_Through', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Leave_Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Leave_Id', models.BigIntegerField()),
+                ('Employee_Name', models.CharField(max_length=50)),
+                ('Reason', models.CharField(choices=[('DELETED', 'Deleted'), ('ARCHIVED', 'Archived')], default='DELETED', max_length=8)),
+                ('Change_Seq', models.BigIntegerField()),
+                ('Deleted_On', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archived_leave_record',
+            name='Change_Seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archived_leave_record',
+            name='Updated_On',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='leave_record',
+            name='Change_Seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='leave_record',
+            name='Updated_On',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='leave_record',
+            index=models.Index(fields=['Change_Seq', 'id'], name='leaves_leav_Change__97e94d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave_tombstone',
+            index=models.Index(fields=['Change_Seq', 'Leave_Id'], name='leaves_leav_Change__22663b_idx'),
+        ),
+        migrations.RunPython(create_counter, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0017_leave_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave_tombstone',
+            index=models.Index(fields=['Employee_Name', 'Change_Seq'], name='leaves_leav_Employe_1e326d_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0018_tombstone_employee_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Data_Version',
+            fields=[
+                ('Key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('Version', models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -1,4 +1,121 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, router, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from leaves.versions import HOLIDAY_VERSION_KEY, bump_data_version
+from leaves.workdays import count_working_days, refresh_leave_days, working_days
+
+
+def employee_teams(usernames):
+    """
+    Current team of each employee.
+
+    Returns:
+        dict: username -> team id (employees without a team are left out)
+    """
+    from django.contrib.auth import get_user_model
+
+    if not usernames:
+        return {}
+    return dict(
+        get_user_model().objects
+        .filter(username__in=list(usernames), team__isnull=False)
+        .values_list('username', 'team_id')
+    )
+
+
+def next_change_seq(using=None):
+    """
+    Allocate the next leave change sequence number (see leaves.changes).
+
+    Call inside the transaction that writes the change: the counter row
+    stays locked until it commits, so changes commit in sequence order and
+    a reader never sees a number while a lower one is still in flight.
+
+    Args:
+        using: Database alias (default: the leave write database)
+
+    Returns:
+        int: The new sequence number
+    """
+    using = using or router.db_for_write(Leave_Record)
+    counters = Leave_Change_Counter.objects.using(using)
+    with transaction.atomic(using=using):
+        if not counters.filter(pk=1).update(Last_Seq=F('Last_Seq') + 1):
+            # Counter row missing (e.g. a flushed test database): continue
+            # after the highest number still stored
+            last_seq = max(
+                Leave_Record.objects.using(using).aggregate(seq=Max('Change_Seq'))['seq'] or 0,
+                Leave_Tombstone.objects.using(using).aggregate(seq=Max('Change_Seq'))['seq'] or 0,
+            )
+            counters.get_or_create(pk=1, defaults={'Last_Seq': last_seq})
+            counters.filter(pk=1).update(Last_Seq=F('Last_Seq') + 1)
+        return counters.values_list('Last_Seq', flat=True).get(pk=1)
+
+
+class LeaveRecordQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk writes advance the leave data version, stamp the
+    rows with a change sequence number, record tombstones for deleted rows
+    and keep No_of_Days in step with the dates.
+    """
+
+    def _write_db(self):
+        return self._db or router.db_for_write(self.model)
+
+    def update(self, **kwargs):
+        # Setting both dates in one UPDATE also refreshes the stored day count
+        if 'Start_Date' in kwargs and 'End_Date' in kwargs and 'No_of_Days' not in kwargs:
+            kwargs['No_of_Days'] = working_days(kwargs['Start_Date'], kwargs['End_Date'])
+        using = self._write_db()
+        with transaction.atomic(using=using):
+            # Callers that keep the stamp on an instance pass one they took
+            # from next_change_seq() in the same transaction
+            if 'Change_Seq' not in kwargs:
+                kwargs['Change_Seq'] = next_change_seq(using)
+            kwargs.setdefault('Updated_On', timezone.now())
+            rows = super().update(**kwargs)
+        if rows:
+            bump_data_version()
+        return rows
+
+    def delete(self, reason='DELETED'):
+        """
+        Delete the leaves, leaving a tombstone for each.
+
+        Args:
+            reason: Tombstone reason, 'DELETED' or 'ARCHIVED'
+        """
+        using = self._write_db()
+        with transaction.atomic(using=using):
+            deleted = list(self.values_list('id', 'Employee_Name'))
+            result = super().delete()
+            if deleted:
+                Leave_Tombstone.record(deleted, reason, using=using)
+        if result[0]:
+            bump_data_version()
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        teams = employee_teams({obj.Employee_Name for obj in objs if obj.Team_id is None})
+        days = count_working_days((n, obj.Start_Date, obj.End_Date) for n, obj in enumerate(objs))
+        using = self._write_db()
+        with transaction.atomic(using=using):
+            change_seq = next_change_seq(using)
+            now = timezone.now()
+            for n, obj in enumerate(objs):
+                obj.No_of_Days = days[n]
+                obj.Change_Seq = change_seq
+                obj.Updated_On = now
+                if obj.Team_id is None:
+                    obj.Team_id = teams.get(obj.Employee_Name)
+            created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            bump_data_version()
+        return created
+
 
 # Create your models here.
 class Leave_Record(models.Model):
@@ -14,7 +131,7 @@ class Leave_Record(models.Model):
         ('CANCELLED', 'Cancelled'),
     )
 
-    Employee_Name = models.CharField(max_length=50, null=False, blank=False)
+    Employee_Name = models.CharField(max_length=50, null=False, blank=False)  # indexed below
     Leave_Type = models.CharField(max_length=6, choices=LEAVE_TYPES)
     Start_Date = models.DateField(db_index=True)
     End_Date = models.DateField()
@@ -25,8 +142,63 @@ class Leave_Record(models.Model):
     Cancelled_By = models.CharField(max_length=50, blank=True, null=True)
     Cancelled_On = models.DateTimeField(blank=True, null=True)
 
+    # Working days in the leave (weekends and holidays excluded), kept up to date on write
+    No_of_Days = models.PositiveIntegerField(default=0)
+
+    # Employee's team, copied from CustomUser.team (see CustomUser.move_leaves_to_team)
+    Team = models.ForeignKey(
+        'authentication.Team', on_delete=models.SET_NULL, null=True, blank=True, related_name='leaves',
+        db_index=False,  # covered by the composite indexes below
+    )
+
+    # Change sequence number and time of the last write (see leaves.changes)
+    Change_Seq = models.BigIntegerField(default=0)
+    Updated_On = models.DateTimeField(blank=True, null=True)
+
+    objects = LeaveRecordQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-employee lookups and the overlap check (leaves.conflicts):
+            # one index range per employee, End_Date read from the index
+            models.Index(fields=['Employee_Name', 'Start_Date', 'End_Date']),
+            # Team-scoped admin views: one index range per team
+            models.Index(fields=['Team', 'Status', 'Start_Date']),
+            models.Index(fields=['Team', 'Start_Date']),
+            # Admin changelist: keyset pages and date hierarchy on Applied_On
+            models.Index(fields=['Applied_On', 'id']),
+            # Change feed: keyset pages in change order
+            models.Index(fields=['Change_Seq', 'id']),
+        ]
+
     def __str__(self):
         return f"{self.Employee_Name} - {self.Leave_Type} ({self.Status})"
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.Team_id is None:
+            self.Team_id = employee_teams([self.Employee_Name]).get(self.Employee_Name)
+        self.No_of_Days = working_days(self.Start_Date, self.End_Date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields) | {'Change_Seq', 'Updated_On'}
+            if {'Start_Date', 'End_Date'} & update_fields:
+                update_fields.add('No_of_Days')
+            kwargs['update_fields'] = update_fields
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self.Change_Seq = next_change_seq(using)
+            self.Updated_On = timezone.now()
+            super().save(*args, **kwargs)
+        bump_data_version()
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        leave_id = self.id
+        with transaction.atomic(using=using):
+            result = super().delete(*args, **kwargs)
+            Leave_Tombstone.record([(leave_id, self.Employee_Name)], 'DELETED', using=using)
+        bump_data_version()
+        return result
     
     @property
     def is_editable(self):
@@ -37,3 +209,511 @@ class Leave_Record(models.Model):
     def is_cancellable(self):
         """Check if leave can be cancelled (only PENDING or APPROVED)"""
         return self.Status in ['PENDING', 'APPROVED']
+
+
+class Archived_Leave_Record(models.Model):
+    """
+    Cold storage for closed leaves (approved, rejected or cancelled) whose
+    End_Date is past the archive cutoff. Rows are moved here from
+    Leave_Record by leaves.archive so the hot table and its indexes stay small.
+    """
+    # Keeps the original Leave_Record id so links and audit references stay valid
+    id = models.BigIntegerField(primary_key=True)
+    Employee_Name = models.CharField(max_length=50)
+    Leave_Type = models.CharField(max_length=6, choices=Leave_Record.LEAVE_TYPES)
+    Start_Date = models.DateField()
+    End_Date = models.DateField(db_index=True)
+    Status = models.CharField(max_length=10, choices=Leave_Record.STATUS_TYPES)
+    Applied_On = models.DateTimeField()
+    Cancelled_By = models.CharField(max_length=50, blank=True, null=True)
+    Cancelled_On = models.DateTimeField(blank=True, null=True)
+    No_of_Days = models.PositiveIntegerField(default=0)
+    Team = models.ForeignKey(
+        'authentication.Team', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_leaves',
+        db_index=False,
+    )
+    Change_Seq = models.BigIntegerField(default=0)
+    Updated_On = models.DateTimeField(blank=True, null=True)
+    Archived_On = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Employee_Name', 'Start_Date']),
+            models.Index(fields=['Start_Date']),
+            models.Index(fields=['Team', 'Start_Date']),
+        ]
+
+    def __str__(self):
+        return f"{self.Employee_Name} - {self.Leave_Type} ({self.Status}, archived)"
+
+
+class Leave_Tombstone(models.Model):
+    """
+    Marker left by a deleted (or archived) leave, so clients syncing
+    through the change feed (leaves.changes) learn that it is gone.
+
+    Stamped with the change sequence number of the delete, like a write to
+    Leave_Record. Removed after LEAVE_TOMBSTONE_TTL_DAYS by
+    purge_leave_tombstones; clients that last synced before that must
+    start over.
+    """
+    REASONS = (
+        ('DELETED', 'Deleted'),
+        ('ARCHIVED', 'Archived'),
+    )
+
+    Leave_Id = models.BigIntegerField()
+    Employee_Name = models.CharField(max_length=50)
+    Reason = models.CharField(max_length=8, choices=REASONS, default='DELETED')
+    Change_Seq = models.BigIntegerField()
+    Deleted_On = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Change_Seq', 'Leave_Id']),
+            # Per-employee feed versions (leaves.calendar)
+            models.Index(fields=['Employee_Name', 'Change_Seq']),
+        ]
+
+    def __str__(self):
+        return f"Leave {self.Leave_Id} {self.Reason.lower()} (change {self.Change_Seq})"
+
+    @classmethod
+    def record(cls, leaves, reason, using=None):
+        """
+        Write tombstones for deleted leaves, under one new change number.
+
+        Args:
+            leaves: (leave id, Employee_Name) pairs
+            reason: 'DELETED' or 'ARCHIVED'
+            using: Database alias
+        """
+        using = using or router.db_for_write(cls)
+        with transaction.atomic(using=using):
+            change_seq = next_change_seq(using)
+            now = timezone.now()
+            cls.objects.using(using).bulk_create([
+                cls(Leave_Id=leave_id, Employee_Name=employee, Reason=reason, Change_Seq=change_seq, Deleted_On=now)
+                for leave_id, employee in leaves
+            ], batch_size=1000)
+
+
+class Leave_Change_Counter(models.Model):
+    """
+    The single row (pk=1) handing out leave change sequence numbers
+    (see next_change_seq).
+
+    Purged_Through is the highest sequence number of a purged tombstone:
+    a change-feed position below it may have missed deletes.
+    """
+    Last_Seq = models.BigIntegerField(default=0)
+    Purged_Through = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Leave changes up to {self.Last_Seq}"
+
+
+class Data_Version(models.Model):
+    """
+    Version counter for one kind of data (see leaves.versions), stored in
+    the database so that every process sees the same value.
+    """
+    Key = models.CharField(max_length=64, primary_key=True)
+    Version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.Key} @ {self.Version}"
+
+
+class Notification_Outbox(models.Model):
+    """
+    Transactional outbox for leave notifications.
+
+    Rows are written in the same transaction as the Leave_Record change and
+    delivered later by the dispatch_notifications worker (leaves.notifications).
+    """
+    EVENT_TYPES = (
+        ('SUBMITTED', 'Submitted'),
+        ('APPROVED', 'Approved'),
+        ('REJECTED', 'Rejected'),
+        ('CANCELLED', 'Cancelled'),
+    )
+    STATUS_TYPES = (
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+
+    Event = models.CharField(max_length=10, choices=EVENT_TYPES)
+    Recipient = models.EmailField(max_length=100)
+    Leave_Id = models.BigIntegerField()
+    Payload = models.JSONField(default=dict)
+    Status = models.CharField(max_length=10, choices=STATUS_TYPES, default='PENDING')
+    Attempts = models.PositiveSmallIntegerField(default=0)
+    Next_Attempt_At = models.DateTimeField(default=timezone.now)
+    Claimed_By = models.CharField(max_length=32, blank=True, null=True)
+    Claimed_At = models.DateTimeField(blank=True, null=True)
+    Last_Error = models.TextField(blank=True, null=True)
+    Created_On = models.DateTimeField(auto_now_add=True)
+    Sent_On = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Status', 'Next_Attempt_At']),
+            models.Index(fields=['Claimed_By']),
+        ]
+
+    def __str__(self):
+        return f"{self.Event} leave #{self.Leave_Id} -> {self.Recipient} ({self.Status})"
+
+
+class Batch_Run(models.Model):
+    """A run of a batch job (see leaves.batch); its chunks are the checkpoints."""
+    STATUS_TYPES = (
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    Job_Name = models.CharField(max_length=50)
+    Params = models.JSONField(default=dict)
+    Status = models.CharField(max_length=10, choices=STATUS_TYPES, default='RUNNING')
+    Started_On = models.DateTimeField(auto_now_add=True)
+    Finished_On = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Job_Name', 'Status']),
+        ]
+
+    def __str__(self):
+        return f"{self.Job_Name} run #{self.id} ({self.Status})"
+
+
+class Batch_Chunk(models.Model):
+    """A contiguous range of user ids processed by one worker task."""
+    STATUS_TYPES = (
+        ('PENDING', 'Pending'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    Run = models.ForeignKey(Batch_Run, on_delete=models.CASCADE, related_name='chunks')
+    First_User_Id = models.BigIntegerField()
+    Last_User_Id = models.BigIntegerField()
+    Status = models.CharField(max_length=10, choices=STATUS_TYPES, default='PENDING')
+    Processed = models.PositiveIntegerField(default=0)
+    Seconds = models.FloatField(default=0)
+    Error = models.TextField(blank=True, null=True)
+    Finished_On = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Run', 'Status']),
+        ]
+
+    def __str__(self):
+        return f"Run #{self.Run_id} users {self.First_User_Id}-{self.Last_User_Id} ({self.Status})"
+
+
+class Annual_Leave_Summary(models.Model):
+    """Per-employee leave totals for a year, produced by the annual_leave_summary job."""
+    Employee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='annual_leave_summaries')
+    Year = models.PositiveSmallIntegerField()
+    Sick_Days = models.PositiveIntegerField(default=0)
+    Casual_Days = models.PositiveIntegerField(default=0)
+    Earned_Days = models.PositiveIntegerField(default=0)
+    Total_Days = models.PositiveIntegerField(default=0)
+    Pending_Count = models.PositiveIntegerField(default=0)
+    Approved_Count = models.PositiveIntegerField(default=0)
+    Rejected_Count = models.PositiveIntegerField(default=0)
+    Cancelled_Count = models.PositiveIntegerField(default=0)
+    Generated_On = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['Employee', 'Year'], name='unique_annual_leave_summary'),
+        ]
+        indexes = [
+            models.Index(fields=['Year']),
+        ]
+
+    def __str__(self):
+        return f"{self.Employee_id} {self.Year}: {self.Total_Days} day(s)"
+
+
+def _holidays_changed(added=(), removed=()):
+    """
+    Correct the rollup day counts now, then rebuild calendars and
+    recount leaves touching the changed dates after commit.
+    """
+    from leaves.rollups import record_holiday_change
+
+    dates = [day for day in (*added, *removed) if day]
+    if not dates:
+        return
+    record_holiday_change(added=added, removed=removed)
+    bump_data_version(HOLIDAY_VERSION_KEY)
+    transaction.on_commit(lambda: refresh_leave_days(min(dates), max(dates)))
+
+
+class HolidayQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk writes (e.g. the admin's "Delete selected") keep
+    leave day counts, rollups and calendars in step, like Holiday.save()
+    and Holiday.delete() do.
+    """
+
+    def _write_db(self):
+        return self._db or router.db_for_write(self.model)
+
+    def update(self, **kwargs):
+        if 'Date' not in kwargs:
+            return super().update(**kwargs)
+        using = self._write_db()
+        with transaction.atomic(using=using):
+            before = dict(self.values_list('pk', 'Date'))
+            rows = super().update(**kwargs)
+            added = list(self.model.objects.using(using).filter(pk__in=list(before)).values_list('Date', flat=True))
+            _holidays_changed(added=added, removed=list(before.values()))
+        return rows
+
+    def delete(self):
+        with transaction.atomic(using=self._write_db()):
+            removed = list(self.values_list('Date', flat=True))
+            result = super().delete()
+            _holidays_changed(removed=removed)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        using = self._write_db()
+        with transaction.atomic(using=using):
+            # With ignore_conflicts, dates that were already holidays change nothing
+            existing = set(self.model.objects.using(using).filter(
+                Date__in=[obj.Date for obj in objs],
+            ).values_list('Date', flat=True))
+            objs = super().bulk_create(objs, *args, **kwargs)
+            _holidays_changed(added={obj.Date for obj in objs} - existing)
+        return objs
+
+
+class Holiday(models.Model):
+    """Public holiday, excluded from working-day counts (see leaves.workdays)."""
+    Date = models.DateField(unique=True)
+    Name = models.CharField(max_length=100)
+
+    objects = HolidayQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['Date']
+
+    def __str__(self):
+        return f"{self.Name} ({self.Date})"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Holiday.objects.filter(pk=self.pk).values_list('Date', flat=True).first()
+            super().save(*args, **kwargs)
+            _holidays_changed(added=[self.Date], removed=[previous] if previous else [])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            _holidays_changed(removed=[self.Date])
+        return result
+
+
+class Monthly_Leave_Rollup(models.Model):
+    """
+    Leave counts and working days per month, leave type and status.
+
+    Maintained incrementally by leaves.rollups on every leave write; a
+    leave's days are split across the months it spans, its count goes to
+    the month it starts in.
+    """
+    Month = models.DateField()
+    Leave_Type = models.CharField(max_length=6, choices=Leave_Record.LEAVE_TYPES)
+    Status = models.CharField(max_length=10, choices=Leave_Record.STATUS_TYPES)
+    Leave_Count = models.IntegerField(default=0)
+    Leave_Days = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['Month', 'Leave_Type', 'Status'], name='unique_monthly_leave_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.Month:%Y-%m} {self.Leave_Type} {self.Status}: {self.Leave_Count}"
+
+
+class Monthly_Employee_Rollup(models.Model):
+    """Leave counts and working days per month, employee and status (see Monthly_Leave_Rollup)."""
+    Month = models.DateField()
+    Employee_Name = models.CharField(max_length=50)
+    Status = models.CharField(max_length=10, choices=Leave_Record.STATUS_TYPES)
+    Leave_Count = models.IntegerField(default=0)
+    Leave_Days = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['Month', 'Employee_Name', 'Status'], name='unique_monthly_employee_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['Status', 'Month']),
+        ]
+
+    def __str__(self):
+        return f"{self.Month:%Y-%m} {self.Employee_Name} {self.Status}: {self.Leave_Count}"
+
+
+class Daily_Absence(models.Model):
+    """
+    One row per employee per day of an APPROVED leave.
+
+    Materialized by leaves.absences so "who is out on day d" and "absence
+    count per day" are equality lookups on Date instead of range scans
+    over Start_Date/End_Date. Keyed by Leave_Id (not a foreign key) so
+    archiving a leave keeps its history.
+    """
+    Date = models.DateField()
+    Employee_Name = models.CharField(max_length=50)
+    Leave_Type = models.CharField(max_length=6, choices=Leave_Record.LEAVE_TYPES)
+    Leave_Id = models.BigIntegerField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['Date', 'Employee_Name', 'Leave_Id'], name='unique_daily_absence'),
+        ]
+
+    def __str__(self):
+        return f"{self.Employee_Name} out on {self.Date}"
+
+
+class AuditQuerySet(models.QuerySet):
+    """Audit events are append-only: bulk updates and deletes are refused."""
+
+    def update(self, **kwargs):
+        raise PermissionError('Leave audit events are append-only')
+
+    def delete(self):
+        raise PermissionError('Leave audit events are append-only')
+
+
+class Leave_Audit_Event(models.Model):
+    """
+    Append-only history of leave changes: who changed what, from which
+    values to which, and when.
+
+    Written by leaves.audit from every write path. Keyed by Leave_Id (not a
+    foreign key) so the history outlives deletion and archival.
+    """
+    ACTIONS = (
+        ('CREATED', 'Created'),
+        ('UPDATED', 'Updated'),
+        ('STATUS_CHANGED', 'Status changed'),
+        ('DELETED', 'Deleted'),
+    )
+
+    Leave_Id = models.BigIntegerField()
+    Employee_Name = models.CharField(max_length=50)
+    Action = models.CharField(max_length=14, choices=ACTIONS)
+    Actor = models.CharField(max_length=50, blank=True, null=True)
+    Old_Values = models.JSONField(default=dict)
+    New_Values = models.JSONField(default=dict)
+    Occurred_On = models.DateTimeField(default=timezone.now)
+
+    objects = AuditQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Leave_Id', 'Occurred_On']),
+            models.Index(fields=['Actor', 'Occurred_On']),
+            models.Index(fields=['Occurred_On']),
+        ]
+
+    def __str__(self):
+        return f"{self.Action} leave {self.Leave_Id} by {self.Actor or 'system'} at {self.Occurred_On}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise PermissionError('Leave audit events are append-only')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise PermissionError('Leave audit events are append-only')
+
+
+class Idempotency_Key(models.Model):
+    """
+    Responses of write requests sent with an ``Idempotency-Key`` header.
+
+    A row is inserted in the same transaction as the write it describes, so
+    a retry with the same key replays the stored response instead of
+    executing the write again (leaves.idempotency). Rows expire after
+    IDEMPOTENCY_KEY_TTL seconds and are removed by purge_idempotency_keys.
+    """
+    Key = models.CharField(max_length=64, unique=True)  # sha256 of user, method, path and header key
+    Request_Hash = models.CharField(max_length=64)  # sha256 of the request body
+    Status_Code = models.PositiveSmallIntegerField()
+    Content_Type = models.CharField(max_length=100)
+    Body = models.TextField(blank=True)
+    Created_On = models.DateTimeField(default=timezone.now)
+    Expires_On = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.Key[:12]}... -> {self.Status_Code} (expires {self.Expires_On})"
+
+
+class Report_Job(models.Model):
+    """
+    A leave report built in the background by the run_report_jobs worker.
+
+    Jobs are submitted with LeaveRecordViewSet filter parameters and an
+    output format, report their progress while the worker writes the file
+    in chunks, and expire (file deleted) REPORTS['TTL_SECONDS'] after they
+    finish. Job_Key identifies identical submissions (same visibility,
+    filters, format and data version) so they share one job.
+    """
+    FORMATS = (
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+    )
+    STATUS_TYPES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+        ('EXPIRED', 'Expired'),
+    )
+
+    Job_Key = models.CharField(max_length=64, db_index=True)
+    Requested_By = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='report_jobs',
+    )
+    Scope_Key = models.CharField(max_length=100)
+    Params = models.JSONField(default=dict)
+    Format = models.CharField(max_length=4, choices=FORMATS)
+    Data_Version = models.BigIntegerField()
+    Status = models.CharField(max_length=10, choices=STATUS_TYPES, default='PENDING')
+    Rows_Total = models.PositiveIntegerField(blank=True, null=True)
+    Rows_Done = models.PositiveIntegerField(default=0)
+    File_Name = models.CharField(max_length=255, blank=True, null=True)
+    File_Size = models.PositiveBigIntegerField(blank=True, null=True)
+    Error = models.TextField(blank=True, null=True)
+    Claimed_By = models.CharField(max_length=32, blank=True, null=True)
+    Claimed_At = models.DateTimeField(blank=True, null=True)
+    Created_On = models.DateTimeField(default=timezone.now)
+    Finished_On = models.DateTimeField(blank=True, null=True)
+    Expires_On = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['Status', 'Created_On']),
+        ]
+
+    def __str__(self):
+        return f"Report #{self.id} {self.Format} ({self.Status}, {self.Rows_Done}/{self.Rows_Total or '?'} rows)"
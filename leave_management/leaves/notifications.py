@@ -0,0 +1,338 @@
+"""
+Leave notifications for Leave Management.
+
+Write side: ``enqueue_leave_event`` adds outbox rows inside the caller's
+transaction, so a notification exists if and only if the leave change
+committed. Nothing is sent on the request path.
+
+Read side: ``dispatch_notifications`` (run by the dispatch_notifications
+management command) claims due rows in batches, merges them into one
+digest per recipient and hands each digest to the configured backend,
+retrying failures with exponential backoff.
+"""
+import json
+import sys
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from authentication.models import CustomUser, ReportingLine
+from leaves.models import Notification_Outbox
+
+
+DEFAULTS = {
+    'BACKEND': 'leaves.notifications.ConsoleBackend',
+    'FILE_PATH': 'notifications.log',
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 30,
+    'RETRY_MAX_SECONDS': 3600,
+    # Rows stuck in SENDING longer than this (crashed worker) are reclaimed
+    'CLAIM_TIMEOUT_SECONDS': 300,
+}
+
+EVENT_MESSAGES = {
+    'SUBMITTED': '{employee} submitted a {leave_type} leave for {start} to {end}',
+    'APPROVED': 'Your {leave_type} leave for {start} to {end} was approved by {actor}',
+    'REJECTED': 'Your {leave_type} leave for {start} to {end} was rejected by {actor}',
+    'CANCELLED': '{employee}\'s {leave_type} leave for {start} to {end} was cancelled by {actor}',
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'NOTIFICATIONS', {}).get(name, DEFAULTS[name])
+
+
+# Recipients ----------------------------------------------------------------
+
+def _manager_emails(usernames):
+    """
+    Who reviews each employee's leaves: admins, plus the managers above the
+    employee in their reporting line.
+
+    Returns:
+        dict: username -> set of emails
+    """
+    admins = set(
+        CustomUser.objects
+        .filter(Q(role='ADMIN') | Q(is_superuser=True), is_active=True)
+        .values_list('email', flat=True)
+    )
+    managers = {username: set(admins) for username in usernames}
+    for username, email in (
+        ReportingLine.objects
+        .filter(
+            descendant__username__in=usernames, depth__gt=0,
+            ancestor__role='MANAGER', ancestor__is_active=True,
+        )
+        .values_list('descendant__username', 'ancestor__email')
+    ):
+        managers[username].add(email)
+    return managers
+
+
+def _employee_emails(usernames):
+    return dict(
+        CustomUser.objects
+        .filter(username__in=usernames, is_active=True)
+        .values_list('username', 'email')
+    )
+
+
+def _recipients(event, employee_email, actor_email, manager_emails):
+    """
+    Who hears about an event:
+    - SUBMITTED: the employee's managers and admins
+    - APPROVED / REJECTED: the employee
+    - CANCELLED: the employee's managers and admins, plus the employee if
+      someone else cancelled
+    The actor is never notified about their own action.
+    """
+    if event == 'SUBMITTED':
+        recipients = set(manager_emails)
+    elif event in ('APPROVED', 'REJECTED'):
+        recipients = {employee_email}
+    else:
+        recipients = set(manager_emails) | {employee_email}
+    recipients.discard(None)
+    recipients.discard(actor_email)
+    return recipients
+
+
+def _payload(leave, actor):
+    return {
+        'employee': leave.Employee_Name,
+        'leave_type': leave.get_Leave_Type_display(),
+        'start': str(leave.Start_Date),
+        'end': str(leave.End_Date),
+        'actor': actor or '',
+    }
+
+
+def enqueue_leave_events(leaves, event, actor=None):
+    """
+    Add outbox rows for an event on several leaves.
+
+    Must be called inside the transaction that changes the leaves.
+
+    Args:
+        leaves: Iterable of Leave_Record instances
+        event: SUBMITTED, APPROVED, REJECTED or CANCELLED
+        actor: Username that performed the change
+
+    Returns:
+        int: Number of outbox rows written
+    """
+    leaves = list(leaves)
+    if not leaves:
+        return 0
+
+    employees = {leave.Employee_Name for leave in leaves}
+    managers = _manager_emails(employees) if event in ('SUBMITTED', 'CANCELLED') else {}
+    emails = _employee_emails(employees | {actor})
+    actor_email = emails.get(actor)
+
+    rows = [
+        Notification_Outbox(
+            Event=event,
+            Recipient=recipient,
+            Leave_Id=leave.id,
+            Payload=_payload(leave, actor),
+        )
+        for leave in leaves
+        for recipient in _recipients(
+            event, emails.get(leave.Employee_Name), actor_email, managers.get(leave.Employee_Name, ()),
+        )
+    ]
+    Notification_Outbox.objects.bulk_create(rows)
+    return len(rows)
+
+
+def enqueue_leave_event(leave, event, actor=None):
+    """Add outbox rows for an event on a single leave (see enqueue_leave_events)."""
+    return enqueue_leave_events([leave], event, actor=actor)
+
+
+# Backends ------------------------------------------------------------------
+
+def render_digest(recipient, notifications):
+    """Build the subject and body for one recipient's digest."""
+    lines = [
+        EVENT_MESSAGES[n.Event].format(**n.Payload)
+        for n in notifications
+    ]
+    if len(lines) == 1:
+        subject = f'Leave update: {lines[0]}'
+    else:
+        subject = f'{len(lines)} leave updates'
+    body = '\n'.join(f'- {line}' for line in lines)
+    return subject, body
+
+
+class BaseBackend:
+    """
+    Delivery backend interface.
+
+    ``send_digest`` delivers one digest and raises on failure; the
+    dispatcher takes care of retries.
+    """
+
+    def send_digest(self, recipient, notifications):
+        raise NotImplementedError
+
+
+class EmailBackend(BaseBackend):
+    """Send digests through Django's mail system (see EMAIL_BACKEND)."""
+
+    def send_digest(self, recipient, notifications):
+        subject, body = render_digest(recipient, notifications)
+        send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient])
+
+
+class ConsoleBackend(BaseBackend):
+    """Print digests to stdout, for local development."""
+
+    def send_digest(self, recipient, notifications):
+        subject, body = render_digest(recipient, notifications)
+        sys.stdout.write(f'To: {recipient}\nSubject: {subject}\n{body}\n\n')
+        sys.stdout.flush()
+
+
+class FileBackend(BaseBackend):
+    """Append digests as JSON lines to NOTIFICATIONS['FILE_PATH'], for testing."""
+
+    def send_digest(self, recipient, notifications):
+        subject, body = render_digest(recipient, notifications)
+        with open(get_setting('FILE_PATH'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'to': recipient,
+                'subject': subject,
+                'body': body,
+                'ids': [n.id for n in notifications],
+            }) + '\n')
+
+
+def get_backend():
+    return import_string(get_setting('BACKEND'))()
+
+
+# Dispatcher ----------------------------------------------------------------
+
+def retry_delay(attempts):
+    """Exponential backoff: base * 2^(attempts - 1), capped."""
+    delay = get_setting('RETRY_BASE_SECONDS') * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, get_setting('RETRY_MAX_SECONDS')))
+
+
+def release_stale_claims(now=None):
+    """
+    Put rows left in SENDING by a crashed worker back in the queue.
+
+    The interrupted delivery counts as an attempt, so a digest that keeps
+    crashing its worker ends up FAILED after MAX_ATTEMPTS instead of being
+    retried forever.
+
+    Returns:
+        int: Number of rows released
+    """
+    now = now or timezone.now()
+    stale = Notification_Outbox.objects.filter(
+        Status='SENDING', Claimed_At__lt=now - timedelta(seconds=get_setting('CLAIM_TIMEOUT_SECONDS')),
+    )
+    released = {
+        'Attempts': F('Attempts') + 1,
+        'Claimed_By': None,
+        'Claimed_At': None,
+        'Last_Error': 'Delivery did not finish before the claim timed out',
+    }
+    failed = stale.filter(Attempts__gte=get_setting('MAX_ATTEMPTS') - 1).update(Status='FAILED', **released)
+    return failed + stale.update(Status='PENDING', Next_Attempt_At=now, **released)
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to ``batch_size`` due notifications for this worker.
+
+    Claiming is a conditional UPDATE, so concurrent workers never deliver
+    the same row twice. Stale claims are released first.
+
+    Returns:
+        list: Claimed Notification_Outbox rows (all with the same Claimed_By)
+    """
+    now = timezone.now()
+    release_stale_claims(now)
+    due = Q(Status='PENDING', Next_Attempt_At__lte=now)
+
+    ids = list(
+        Notification_Outbox.objects.filter(due)
+        .order_by('id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    Notification_Outbox.objects.filter(due, id__in=ids).update(
+        Status='SENDING', Claimed_By=token, Claimed_At=now,
+    )
+    return list(Notification_Outbox.objects.filter(Claimed_By=token, Status='SENDING').order_by('id'))
+
+
+def dispatch_notifications(batch_size=None, backend=None):
+    """
+    Deliver one batch of due notifications, one digest per recipient.
+
+    Args:
+        batch_size: Maximum rows to claim (default NOTIFICATIONS['BATCH_SIZE'])
+        backend: Backend instance (default NOTIFICATIONS['BACKEND'])
+
+    Returns:
+        dict: Counts of claimed rows, digests sent and digests failed
+    """
+    batch_size = batch_size or get_setting('BATCH_SIZE')
+    backend = backend or get_backend()
+    max_attempts = get_setting('MAX_ATTEMPTS')
+
+    claimed = claim_batch(batch_size)
+    by_recipient = defaultdict(list)
+    for notification in claimed:
+        by_recipient[notification.Recipient].append(notification)
+
+    sent = failed = 0
+    for recipient, notifications in by_recipient.items():
+        # Only rows still under this worker's claim: if it took longer than
+        # CLAIM_TIMEOUT_SECONDS they may have been released and reclaimed
+        rows = Notification_Outbox.objects.filter(
+            id__in=[n.id for n in notifications], Claimed_By=notifications[0].Claimed_By,
+        )
+        try:
+            backend.send_digest(recipient, notifications)
+        except Exception as e:
+            failed += 1
+            # All rows of a digest share the same attempt count in practice;
+            # use the highest so the backoff never shrinks
+            attempts = max(n.Attempts for n in notifications) + 1
+            rows.update(
+                Status='FAILED' if attempts >= max_attempts else 'PENDING',
+                Attempts=attempts,
+                Next_Attempt_At=timezone.now() + retry_delay(attempts),
+                Claimed_By=None,
+                Claimed_At=None,
+                Last_Error=str(e)[:1000],
+            )
+        else:
+            sent += 1
+            rows.update(
+                Status='SENT',
+                Sent_On=timezone.now(),
+                Claimed_By=None,
+                Claimed_At=None,
+            )
+
+    return {'claimed': len(claimed), 'sent': sent, 'failed': failed}
@@ -0,0 +1,263 @@
+"""
+Leave policy rules for Leave Management.
+
+Policies are declared in settings.LEAVE_POLICIES as a list of dicts and
+compiled once, when the app is ready, into rule objects:
+
+    {'name': 'casual-max-3', 'rule': 'max_days', 'days': 3, 'leave_types': ['CASUAL']}
+    {'name': 'casual-max-5-calendar', 'rule': 'max_days', 'days': 5, 'unit': 'calendar'}
+    {'name': 'earned-notice', 'rule': 'notice', 'days': 14, 'leave_types': ['EARNED']}
+    {'name': 'year-end-freeze', 'rule': 'blackout', 'start': '2026-12-20', 'end': '2026-12-31'}
+    {'name': 'junior-sick', 'rule': 'max_days', 'days': 5, 'roles': ['EMPLOYEE'], 'leave_types': ['SICK']}
+
+Every rule may be limited to ``leave_types`` and employee ``roles``
+(default: all). ``max_days`` counts working days (the stored No_of_Days)
+unless ``unit`` is 'calendar'; ``notice`` is the number of days between
+the application date and the start of the leave.
+
+Single submissions are checked with ``check_leave_policy``: the rules that
+apply to a (leave type, role) pair are looked up once and cached, so a
+check is a dict lookup plus a few comparisons. ``find_violations``
+re-validates stored leaves in bulk, one narrowed query per rule.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from leaves.conflicts import ACTIVE_STATUSES, LeaveConflict
+from leaves.models import Leave_Record
+
+
+# The values a rule looks at
+LeaveFacts = namedtuple('LeaveFacts', 'leave_type start end days applied_on')
+
+
+class PolicyViolation(LeaveConflict):
+    """The leave breaks one or more leave policies."""
+
+    def __init__(self, violations):
+        self.violations = violations
+        super().__init__('; '.join(message for _, message in violations))
+
+
+class Rule:
+    """
+    A compiled policy rule.
+
+    Subclasses implement ``check`` (message or None for one leave) and may
+    narrow the rows ``find_violations`` has to look at with ``candidates``.
+    """
+    def __init__(self, name, leave_types=None, roles=None):
+        self.name = name
+        self.leave_types = frozenset(leave_types) if leave_types else None
+        self.roles = frozenset(roles) if roles else None
+
+    def applies_to(self, leave_type, role):
+        return (
+            (self.leave_types is None or leave_type in self.leave_types)
+            and (self.roles is None or role in self.roles)
+        )
+
+    def candidates(self):
+        """Q matching a superset of the leaves that can break this rule."""
+        return Q()
+
+    def check(self, facts):
+        raise NotImplementedError
+
+
+class MaxDaysRule(Rule):
+    def __init__(self, name, days, unit='working', **scope):
+        super().__init__(name, **scope)
+        if unit not in ('working', 'calendar'):
+            raise ValueError("unit must be 'working' or 'calendar'")
+        self.days = int(days)
+        self.unit = unit
+
+    def candidates(self):
+        return Q(No_of_Days__gt=self.days) if self.unit == 'working' else Q()
+
+    def check(self, facts):
+        days = facts.days if self.unit == 'working' else (facts.end - facts.start).days + 1
+        if days > self.days:
+            return f'At most {self.days} {self.unit} day(s) in a row are allowed'
+        return None
+
+
+class NoticeRule(Rule):
+    def __init__(self, name, days, **scope):
+        super().__init__(name, **scope)
+        self.days = int(days)
+
+    def check(self, facts):
+        if (facts.start - facts.applied_on).days < self.days:
+            return f'Must be requested at least {self.days} day(s) in advance'
+        return None
+
+
+class BlackoutRule(Rule):
+    def __init__(self, name, start, end, **scope):
+        super().__init__(name, **scope)
+        self.start = _as_date(start)
+        self.end = _as_date(end)
+        if self.start is None or self.end is None or self.start > self.end:
+            raise ValueError('start and end must be dates, start first')
+
+    def candidates(self):
+        return Q(Start_Date__lte=self.end, End_Date__gte=self.start)
+
+    def check(self, facts):
+        if facts.start <= self.end and facts.end >= self.start:
+            return f'No leave can be taken from {self.start} to {self.end} ({self.name})'
+        return None
+
+
+RULE_TYPES = {
+    'max_days': MaxDaysRule,
+    'notice': NoticeRule,
+    'blackout': BlackoutRule,
+}
+
+
+def _as_date(value):
+    return parse_date(value) if isinstance(value, str) else value
+
+
+class CompiledPolicy:
+    """The compiled rules, with their per-(leave type, role) dispatch cached."""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self.uses_roles = any(rule.roles is not None for rule in self.rules)
+        self._dispatch = {}
+
+    def rules_for(self, leave_type, role=None):
+        key = (leave_type, role)
+        try:
+            return self._dispatch[key]
+        except KeyError:
+            rules = tuple(rule for rule in self.rules if rule.applies_to(leave_type, role))
+            self._dispatch[key] = rules
+            return rules
+
+    def violations(self, facts, role=None):
+        """(rule name, message) pairs for every rule ``facts`` breaks."""
+        found = []
+        for rule in self.rules_for(facts.leave_type, role):
+            message = rule.check(facts)
+            if message:
+                found.append((rule.name, message))
+        return found
+
+
+def compile_policies(definitions):
+    """
+    Compile policy definitions into a CompiledPolicy.
+
+    Raises:
+        ImproperlyConfigured: If a definition is invalid
+    """
+    rules = []
+    names = set()
+    for index, definition in enumerate(definitions):
+        definition = dict(definition)
+        name = definition.pop('name', None) or f'policy-{index + 1}'
+        kind = definition.pop('rule', None)
+        if kind not in RULE_TYPES:
+            raise ImproperlyConfigured(
+                f"LEAVE_POLICIES[{index}]: rule must be one of {', '.join(RULE_TYPES)}"
+            )
+        if name in names:
+            raise ImproperlyConfigured(f'LEAVE_POLICIES[{index}]: duplicate name {name!r}')
+        try:
+            rules.append(RULE_TYPES[kind](name, **definition))
+        except (TypeError, ValueError) as e:
+            raise ImproperlyConfigured(f'LEAVE_POLICIES[{index}] ({name}): {e}')
+        names.add(name)
+    return CompiledPolicy(rules)
+
+
+_policy = None
+
+
+def get_policy():
+    """The policy compiled from settings.LEAVE_POLICIES (compiled on first use)."""
+    global _policy
+    if _policy is None:
+        _policy = compile_policies(getattr(settings, 'LEAVE_POLICIES', []))
+    return _policy
+
+
+def reload_policy():
+    """Recompile settings.LEAVE_POLICIES (e.g. after changing it in tests)."""
+    global _policy
+    _policy = None
+    return get_policy()
+
+
+def _role(employee):
+    return get_user_model().objects.filter(username=employee).values_list('role', flat=True).first()
+
+
+def check_leave_policy(employee, leave_type, start, end, days, applied_on=None):
+    """
+    Refuse a leave that breaks a policy.
+
+    Args:
+        employee: Employee_Name of the leave
+        leave_type: Leave_Type
+        start: Start date
+        end: End date
+        days: Working days of the leave
+        applied_on: When the leave was applied for (default: now)
+
+    Raises:
+        PolicyViolation: Listing every broken rule
+    """
+    policy = get_policy()
+    if not policy.rules:
+        return
+    applied_on = timezone.localdate(applied_on) if applied_on else timezone.localdate()
+    role = _role(employee) if policy.uses_roles else None
+    violations = policy.violations(LeaveFacts(leave_type, start, end, days, applied_on), role)
+    if violations:
+        raise PolicyViolation(violations)
+
+
+def find_violations(rule_names=None, statuses=ACTIVE_STATUSES, chunk_size=2000):
+    """
+    Re-validate stored leaves against the policy.
+
+    Each rule runs one query narrowed by its leave types, roles and
+    ``candidates()``; only the matching rows are checked in Python.
+
+    Args:
+        rule_names: Only check these rules (default: all)
+        statuses: Statuses of the leaves to check
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        dict: {'leave_id', 'employee', 'rule', 'message'}
+    """
+    columns = ('id', 'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date', 'No_of_Days', 'Applied_On')
+    for rule in get_policy().rules:
+        if rule_names and rule.name not in rule_names:
+            continue
+        leaves = Leave_Record.objects.filter(rule.candidates(), Status__in=statuses)
+        if rule.leave_types is not None:
+            leaves = leaves.filter(Leave_Type__in=rule.leave_types)
+        if rule.roles is not None:
+            leaves = leaves.filter(
+                Employee_Name__in=get_user_model().objects.filter(role__in=rule.roles).values('username'),
+            )
+        for leave_id, employee, leave_type, start, end, days, applied_on in (
+            leaves.order_by('id').values_list(*columns).iterator(chunk_size=chunk_size)
+        ):
+            message = rule.check(LeaveFacts(leave_type, start, end, days, timezone.localdate(applied_on)))
+            if message:
+                yield {'leave_id': leave_id, 'employee': employee, 'rule': rule.name, 'message': message}
@@ -0,0 +1,365 @@
+"""
+Background leave reports for Leave Management.
+
+Request side: ``submit_report`` validates LeaveRecordViewSet filter
+parameters and queues a Report_Job, or returns the existing job for the
+same visibility, filters, format and data version. Nothing is built on
+the request path; clients poll the job for progress and download the file
+once it is DONE.
+
+Worker side: ``run_report_jobs`` (run by the run_report_jobs management
+command) claims pending jobs, writes each report in id-ordered chunks -
+hot leaves, then archived ones when the date filters reach the archive -
+and records progress after every chunk. Finished files expire after
+REPORTS['TTL_SECONDS'] and are deleted by ``purge_expired_reports``.
+"""
+import csv
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+from itertools import chain
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+
+from authentication.hierarchy import scope_key, scope_leaves
+from leaves.archive import reaches_archive
+from leaves.models import Leave_Record, Archived_Leave_Record, Report_Job
+from leaves.versions import get_data_version
+
+
+DEFAULTS = {
+    'DIR': 'reports',
+    'CHUNK_SIZE': 2000,
+    'TTL_SECONDS': 86400,
+    # Jobs stuck in RUNNING longer than this (crashed worker) are reclaimed
+    'CLAIM_TIMEOUT_SECONDS': 900,
+}
+
+COLUMNS = (
+    'id', 'Employee_Name', 'Team', 'Department', 'Leave_Type', 'Status', 'Start_Date', 'End_Date',
+    'Calendar_Days', 'No_of_Days', 'Applied_On', 'Cancelled_By', 'Cancelled_On', 'Archived',
+)
+
+CONTENT_TYPES = {'csv': 'text/csv', 'json': 'application/json'}
+
+
+class ReportError(ValueError):
+    """Invalid report parameters."""
+
+
+def get_setting(name):
+    return getattr(settings, 'REPORTS', {}).get(name, DEFAULTS[name])
+
+
+def report_path(job):
+    return os.path.join(get_setting('DIR'), job.File_Name)
+
+
+# Request side --------------------------------------------------------------
+
+def report_filterset(params, queryset):
+    """FilterSet of LeaveRecordViewSet bound to ``params`` over ``queryset``."""
+    from leaves.filters import CachedDjangoFilterBackend
+    from leaves.views import LeaveRecordViewSet
+
+    filterset_class = CachedDjangoFilterBackend().get_filterset_class(LeaveRecordViewSet(), queryset)
+    return filterset_class(data=params, queryset=queryset)
+
+
+def clean_params(params):
+    """
+    Keep the known, non-empty filter parameters in a canonical order.
+
+    Raises:
+        ReportError: If a parameter is unknown or a value does not validate
+    """
+    params = {name: str(value) for name, value in (params or {}).items() if value not in (None, '')}
+    filterset = report_filterset(params, Leave_Record.objects.none())
+    unknown = sorted(set(params) - set(filterset.filters))
+    if unknown:
+        raise ReportError(f"Unknown filter(s): {', '.join(unknown)}")
+    if not filterset.is_valid():
+        raise ReportError(json.dumps(filterset.errors))
+    return dict(sorted(params.items()))
+
+
+def submit_report(user, params, report_format):
+    """
+    Queue a report, or reuse an identical one that is pending, running or
+    still downloadable.
+
+    Args:
+        user: Requesting user (the report covers what they may see)
+        params: LeaveRecordViewSet filter parameters
+        report_format: 'csv' or 'json'
+
+    Returns:
+        tuple: (Report_Job, created bool)
+
+    Raises:
+        ReportError: If the format or the parameters are invalid
+    """
+    if report_format not in CONTENT_TYPES:
+        raise ReportError(f"Format must be one of {', '.join(CONTENT_TYPES)}")
+    params = clean_params(params)
+    scope = scope_key(user)
+    version = get_data_version()
+    key = hashlib.sha256(
+        json.dumps([scope, params, report_format, version]).encode()
+    ).hexdigest()
+
+    existing = (
+        Report_Job.objects
+        .filter(Job_Key=key)
+        .filter(Q(Status__in=['PENDING', 'RUNNING']) | Q(Status='DONE', Expires_On__gt=timezone.now()))
+        .order_by('-id')
+        .first()
+    )
+    if existing:
+        return existing, False
+
+    job = Report_Job.objects.create(
+        Job_Key=key, Requested_By=user, Scope_Key=scope, Params=params,
+        Format=report_format, Data_Version=version,
+    )
+    return job, True
+
+
+def job_progress(job):
+    """Status of a job as returned by the API."""
+    percent = None
+    if job.Status == 'DONE':
+        percent = 100.0
+    elif job.Rows_Total:
+        percent = round(100.0 * job.Rows_Done / job.Rows_Total, 1)
+    elif job.Rows_Total == 0:
+        percent = 0.0
+    return {
+        'id': job.id,
+        'status': job.Status,
+        'format': job.Format,
+        'params': job.Params,
+        'rows_total': job.Rows_Total,
+        'rows_done': job.Rows_Done,
+        'percent': percent,
+        'file_size': job.File_Size,
+        'error': job.Error,
+        'created_on': job.Created_On,
+        'finished_on': job.Finished_On,
+        'expires_on': job.Expires_On,
+    }
+
+
+# Worker side ---------------------------------------------------------------
+
+def claim_job():
+    """
+    Claim the oldest pending job (or one abandoned by a crashed worker).
+
+    Claiming is a conditional UPDATE, so concurrent workers never build the
+    same job twice.
+
+    Returns:
+        Report_Job or None
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=get_setting('CLAIM_TIMEOUT_SECONDS'))
+    due = Q(Status='PENDING') | Q(Status='RUNNING', Claimed_At__lt=stale)
+
+    for job_id in Report_Job.objects.filter(due).order_by('id').values_list('id', flat=True)[:10]:
+        token = uuid.uuid4().hex
+        if Report_Job.objects.filter(due, id=job_id).update(Status='RUNNING', Claimed_By=token, Claimed_At=now):
+            return Report_Job.objects.get(id=job_id)
+    return None
+
+
+def _report_querysets(job):
+    """Scoped, filtered hot (and, if reached, archived) querysets of a job."""
+    user = job.Requested_By
+    models = [Leave_Record]
+    if reaches_archive(job.Params):
+        models.append(Archived_Leave_Record)
+    querysets = []
+    for model in models:
+        queryset = scope_leaves(model.objects.all(), user)
+        querysets.append(report_filterset(job.Params, queryset).qs.select_related('Team').order_by('id'))
+    return querysets
+
+
+def _row(leave):
+    team = leave.Team
+    return {
+        'id': leave.id,
+        'Employee_Name': leave.Employee_Name,
+        'Team': team.name if team else None,
+        'Department': team.department if team else None,
+        'Leave_Type': leave.Leave_Type,
+        'Status': leave.Status,
+        'Start_Date': leave.Start_Date,
+        'End_Date': leave.End_Date,
+        'Calendar_Days': (leave.End_Date - leave.Start_Date).days + 1,
+        'No_of_Days': leave.No_of_Days,
+        'Applied_On': leave.Applied_On,
+        'Cancelled_By': leave.Cancelled_By,
+        'Cancelled_On': leave.Cancelled_On,
+        'Archived': isinstance(leave, Archived_Leave_Record),
+    }
+
+
+def _chunks(queryset, chunk_size):
+    """Yield lists of rows in id order, one keyset query per chunk."""
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        yield chunk
+
+
+class _CsvWriter:
+    def __init__(self, stream):
+        self.writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        pass
+
+
+class _JsonWriter:
+    """Writes a JSON array one row at a time."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.first = True
+        stream.write('[')
+
+    def write(self, rows):
+        for row in rows:
+            self.stream.write(('\n' if self.first else ',\n') + json.dumps(row, cls=DjangoJSONEncoder))
+            self.first = False
+
+    def close(self):
+        self.stream.write('\n]\n')
+
+
+WRITERS = {'csv': _CsvWriter, 'json': _JsonWriter}
+
+
+def _claimed(job):
+    """The job's row, as long as this worker still holds its claim."""
+    return Report_Job.objects.filter(id=job.id, Status='RUNNING', Claimed_By=job.Claimed_By)
+
+
+def build_report(job, chunk_size=None):
+    """
+    Write the report file of a claimed job, updating Rows_Done after each chunk.
+
+    The file is written under a temporary name and renamed once complete,
+    so a download never sees a partial report. Every progress update also
+    renews the claim; if the job was reclaimed by another worker meanwhile
+    (this one took longer than CLAIM_TIMEOUT_SECONDS between chunks), the
+    build stops and its file is discarded.
+
+    Returns:
+        bool: True if the report was built, False if the claim was lost
+    """
+    chunk_size = chunk_size or get_setting('CHUNK_SIZE')
+    directory = get_setting('DIR')
+    os.makedirs(directory, exist_ok=True)
+
+    querysets = _report_querysets(job)
+    total = sum(queryset.count() for queryset in querysets)
+    if not _claimed(job).update(Rows_Total=total, Rows_Done=0, Claimed_At=timezone.now()):
+        return False
+
+    file_name = f'leave-report-{job.id}-{uuid.uuid4().hex[:8]}.{job.Format}'
+    path = os.path.join(directory, file_name)
+    done = 0
+    claimed = True
+    with open(path + '.part', 'w', newline='', encoding='utf-8') as stream:
+        writer = WRITERS[job.Format](stream)
+        for chunk in chain.from_iterable(_chunks(queryset, chunk_size) for queryset in querysets):
+            writer.write([_row(leave) for leave in chunk])
+            done += len(chunk)
+            claimed = _claimed(job).update(Rows_Done=done, Claimed_At=timezone.now())
+            if not claimed:
+                break
+        writer.close()
+    if not claimed:
+        os.remove(path + '.part')
+        return False
+    os.replace(path + '.part', path)
+
+    now = timezone.now()
+    if not _claimed(job).update(
+        Status='DONE', Rows_Total=max(total, done), Rows_Done=done, File_Name=file_name,
+        File_Size=os.path.getsize(path), Error=None, Finished_On=now,
+        Expires_On=now + timedelta(seconds=get_setting('TTL_SECONDS')),
+    ):
+        os.remove(path)
+        return False
+    return True
+
+
+def run_report_jobs(limit=None, chunk_size=None):
+    """
+    Build pending report jobs one after another.
+
+    Args:
+        limit: Maximum number of jobs to build (default: until none is pending)
+        chunk_size: Rows per chunk (default REPORTS['CHUNK_SIZE'])
+
+    Returns:
+        dict: Counts of jobs built and failed
+    """
+    result = {'built': 0, 'failed': 0}
+    while limit is None or result['built'] + result['failed'] < limit:
+        job = claim_job()
+        if job is None:
+            break
+        try:
+            built = build_report(job, chunk_size=chunk_size)
+        except Exception as e:
+            _claimed(job).update(
+                Status='FAILED', Error=str(e)[:1000], Finished_On=timezone.now(),
+                Expires_On=timezone.now() + timedelta(seconds=get_setting('TTL_SECONDS')),
+            )
+            result['failed'] += 1
+        else:
+            # A lost claim is reported by the worker that took it over
+            if built:
+                result['built'] += 1
+    return result
+
+
+def purge_expired_reports():
+    """
+    Delete the files of expired reports and mark them EXPIRED; expired
+    failed jobs are deleted.
+
+    Returns:
+        int: Number of jobs expired
+    """
+    now = timezone.now()
+    expired = 0
+    for job in Report_Job.objects.filter(Status__in=['DONE', 'FAILED'], Expires_On__lte=now).only('id', 'Status', 'File_Name'):
+        if job.File_Name:
+            try:
+                os.remove(report_path(job))
+            except FileNotFoundError:
+                pass
+        if job.Status == 'FAILED':
+            job.delete()
+        else:
+            Report_Job.objects.filter(id=job.id).update(Status='EXPIRED', File_Name=None, File_Size=None)
+        expired += 1
+    return expired
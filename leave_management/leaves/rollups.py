@@ -0,0 +1,336 @@
+"""
+Monthly leave rollups for Leave Management analytics.
+
+Monthly_Leave_Rollup (month x type x status) and Monthly_Employee_Rollup
+(month x employee x status) are kept up to date incrementally: every
+write path reports the leave's state before and after the change to
+``record_leave_change``, which applies the difference as in-place
+increments. The analytics API reads completed months from the rollups
+and aggregates only the current, partial month live.
+
+``rebuild_rollups`` recomputes everything from Leave_Record and the
+archive (used by the rebuild_leave_rollups command).
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from leaves.models import (
+    Leave_Record, Archived_Leave_Record, Monthly_Leave_Rollup, Monthly_Employee_Rollup,
+)
+from leaves.workdays import get_calendar
+
+
+def snapshot(leave):
+    """
+    The fields of a leave that rollups depend on.
+
+    Returns:
+        tuple: (Employee_Name, Leave_Type, Status, Start_Date, End_Date)
+    """
+    start, end = leave.Start_Date, leave.End_Date
+    if isinstance(start, str):
+        start = parse_date(start)
+    if isinstance(end, str):
+        end = parse_date(end)
+    return (leave.Employee_Name, leave.Leave_Type, leave.Status, start, end)
+
+
+def next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def month_segments(start, end, calendar=None):
+    """
+    Split a leave into per-month parts.
+
+    Returns:
+        list: (first day of month, working days in that month) tuples
+    """
+    calendar = calendar or get_calendar(start, end)
+    segments = []
+    cursor = start
+    while cursor <= end:
+        following = next_month(cursor)
+        segment_end = min(end, following - timedelta(days=1))
+        segments.append((cursor.replace(day=1), calendar.count(cursor, segment_end)))
+        cursor = following
+    return segments
+
+
+def _collect(snap, sign, type_deltas, employee_deltas, calendar=None):
+    """Add a leave's contribution (sign +1 or -1) to the delta maps."""
+    employee, leave_type, status, start, end = snap
+    for index, (month, days) in enumerate(month_segments(start, end, calendar)):
+        count = sign if index == 0 else 0
+        for deltas, key in (
+            (type_deltas, (month, leave_type, status)),
+            (employee_deltas, (month, employee, status)),
+        ):
+            deltas[key][0] += count
+            deltas[key][1] += sign * days
+
+
+def _increment(model, key, count, days):
+    """Add to a rollup row in place, creating it on first use."""
+    updated = model.objects.filter(**key).update(
+        Leave_Count=F('Leave_Count') + count,
+        Leave_Days=F('Leave_Days') + days,
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, Leave_Count=count, Leave_Days=days)
+    except IntegrityError:
+        # Created concurrently - add to it instead
+        model.objects.filter(**key).update(
+            Leave_Count=F('Leave_Count') + count,
+            Leave_Days=F('Leave_Days') + days,
+        )
+
+
+def record_leave_change(old=None, new=None):
+    """
+    Apply the difference between two leave states to the rollups.
+
+    Call inside the transaction that writes the leave.
+
+    Args:
+        old: snapshot() before the change, None for a new leave
+        new: snapshot() after the change, None for a deleted leave
+    """
+    if old == new:
+        return
+
+    type_deltas = defaultdict(lambda: [0, 0])
+    employee_deltas = defaultdict(lambda: [0, 0])
+    if old:
+        _collect(old, -1, type_deltas, employee_deltas)
+    if new:
+        _collect(new, 1, type_deltas, employee_deltas)
+
+    for (month, leave_type, status), (count, days) in type_deltas.items():
+        if count or days:
+            _increment(Monthly_Leave_Rollup, {'Month': month, 'Leave_Type': leave_type, 'Status': status}, count, days)
+    for (month, employee, status), (count, days) in employee_deltas.items():
+        if count or days:
+            _increment(Monthly_Employee_Rollup, {'Month': month, 'Employee_Name': employee, 'Status': status}, count, days)
+
+
+def record_holiday_change(added=(), removed=()):
+    """
+    Adjust rollup Leave_Days after holidays were added or removed.
+
+    A weekday that becomes a holiday takes one working day, in its month,
+    from every leave (hot or archived) that covers it; removing the holiday
+    gives the day back. Leave counts do not change.
+
+    Call inside the transaction that writes the holidays.
+
+    Args:
+        added: Dates that became holidays
+        removed: Dates that are no longer holidays
+    """
+    weekend_days = set(getattr(settings, 'LEAVE_WEEKEND_DAYS', (5, 6)))
+    type_deltas = defaultdict(int)
+    employee_deltas = defaultdict(int)
+    for days, sign in ((added, -1), (removed, 1)):
+        for day in days:
+            day = parse_date(day) if isinstance(day, str) else day
+            if day is None or day.weekday() in weekend_days:
+                continue
+            month = day.replace(day=1)
+            for model in (Leave_Record, Archived_Leave_Record):
+                covering = (
+                    model.objects.filter(Start_Date__lte=day, End_Date__gte=day)
+                    .values_list('Employee_Name', 'Leave_Type', 'Status')
+                )
+                for employee, leave_type, status in covering.iterator(chunk_size=2000):
+                    type_deltas[(month, leave_type, status)] += sign
+                    employee_deltas[(month, employee, status)] += sign
+
+    for (month, leave_type, status), days in type_deltas.items():
+        if days:
+            _increment(Monthly_Leave_Rollup, {'Month': month, 'Leave_Type': leave_type, 'Status': status}, 0, days)
+    for (month, employee, status), days in employee_deltas.items():
+        if days:
+            _increment(Monthly_Employee_Rollup, {'Month': month, 'Employee_Name': employee, 'Status': status}, 0, days)
+
+
+def rebuild_rollups():
+    """
+    Recompute all rollups from Leave_Record and Archived_Leave_Record.
+
+    Returns:
+        int: Number of leaves aggregated
+    """
+    type_deltas = defaultdict(lambda: [0, 0])
+    employee_deltas = defaultdict(lambda: [0, 0])
+    columns = ('Employee_Name', 'Leave_Type', 'Status', 'Start_Date', 'End_Date')
+    total = 0
+    calendar = None
+
+    for model in (Leave_Record, Archived_Leave_Record):
+        for snap in model.objects.values_list(*columns).iterator(chunk_size=5000):
+            if calendar is None or not (calendar.covers(snap[3]) and calendar.covers(snap[4])):
+                calendar = get_calendar(snap[3], snap[4])
+            _collect(snap, 1, type_deltas, employee_deltas, calendar)
+            total += 1
+
+    with transaction.atomic():
+        Monthly_Leave_Rollup.objects.all().delete()
+        Monthly_Employee_Rollup.objects.all().delete()
+        Monthly_Leave_Rollup.objects.bulk_create([
+            Monthly_Leave_Rollup(Month=month, Leave_Type=leave_type, Status=status, Leave_Count=count, Leave_Days=days)
+            for (month, leave_type, status), (count, days) in type_deltas.items()
+        ], batch_size=1000)
+        Monthly_Employee_Rollup.objects.bulk_create([
+            Monthly_Employee_Rollup(Month=month, Employee_Name=employee, Status=status, Leave_Count=count, Leave_Days=days)
+            for (month, employee, status), (count, days) in employee_deltas.items()
+        ], batch_size=1000)
+    return total
+
+
+# Analytics -----------------------------------------------------------------
+
+def _aggregate(first_month, last_month, models=(Leave_Record,), employees=None):
+    """
+    Aggregate months directly from the leave tables, as the rollups would.
+
+    Args:
+        first_month: First day of the first month
+        last_month: First day of the last month
+        models: Leave tables to read
+        employees: Usernames (or a values('username') subquery) to restrict
+            to, or None for everyone
+    """
+    type_deltas = defaultdict(lambda: [0, 0])
+    employee_deltas = defaultdict(lambda: [0, 0])
+    month_end = next_month(last_month) - timedelta(days=1)
+    calendar = get_calendar(first_month, month_end)
+
+    for model in models:
+        leaves = model.objects.filter(Start_Date__lte=month_end, End_Date__gte=first_month)
+        if employees is not None:
+            leaves = leaves.filter(Employee_Name__in=employees)
+        leaves = leaves.values_list('Employee_Name', 'Leave_Type', 'Status', 'Start_Date', 'End_Date')
+        for employee, leave_type, status, start, end in leaves.iterator(chunk_size=2000):
+            segments = month_segments(max(start, first_month), min(end, month_end), calendar)
+            for index, (month, days) in enumerate(segments):
+                # Counted in the month it starts, like the rollups
+                count = 1 if index == 0 and start >= first_month else 0
+                for deltas, key in (
+                    (type_deltas, (month, leave_type, status)),
+                    (employee_deltas, (month, employee, status)),
+                ):
+                    deltas[key][0] += count
+                    deltas[key][1] += days
+    return type_deltas, employee_deltas
+
+
+def _live_month(month):
+    """Aggregate one month directly from Leave_Record (current month only)."""
+    return _aggregate(month, month)
+
+
+def leave_analytics(first_month, last_month, top=10, employees=None):
+    """
+    Monthly trends, top absentees and approval rates for a month range.
+
+    Completed months come from the rollup tables; the current month, if in
+    range, is aggregated live. The rollups are company-wide, so a range
+    restricted to ``employees`` is aggregated from their leaves instead.
+
+    Args:
+        first_month: First month (any day in it)
+        last_month: Last month (any day in it)
+        top: Number of top absentees to return
+        employees: Usernames (or a values('username') subquery) to restrict
+            to, or None for everyone
+
+    Returns:
+        dict: {'months': [...], 'top_absentees': [...], 'approval_rate': float or None}
+    """
+    first_month = first_month.replace(day=1)
+    last_month = last_month.replace(day=1)
+    current_month = timezone.localdate().replace(day=1)
+
+    months = {}
+    cursor = first_month
+    while cursor <= last_month:
+        months[cursor] = {'by_type': defaultdict(dict), 'approved': 0, 'rejected': 0}
+        cursor = next_month(cursor)
+
+    rows = []
+    absentees = defaultdict(int)
+    if employees is not None:
+        type_deltas, employee_deltas = _aggregate(
+            first_month, last_month, (Leave_Record, Archived_Leave_Record), employees,
+        )
+    else:
+        rows.extend(
+            Monthly_Leave_Rollup.objects
+            .filter(Month__gte=first_month, Month__lte=last_month)
+            .exclude(Month=current_month)
+            .values_list('Month', 'Leave_Type', 'Status', 'Leave_Count', 'Leave_Days')
+        )
+        for employee, days in (
+            Monthly_Employee_Rollup.objects
+            .filter(Status='APPROVED', Month__gte=first_month, Month__lte=last_month)
+            .exclude(Month=current_month)
+            .values('Employee_Name')
+            .annotate(days=Sum('Leave_Days'))
+            .values_list('Employee_Name', 'days')
+        ):
+            absentees[employee] += days
+        type_deltas = employee_deltas = {}
+        if first_month <= current_month <= last_month:
+            type_deltas, employee_deltas = _live_month(current_month)
+
+    rows.extend(
+        (month, leave_type, status, count, days)
+        for (month, leave_type, status), (count, days) in type_deltas.items()
+    )
+    for (_, employee, status), (_, days) in employee_deltas.items():
+        if status == 'APPROVED':
+            absentees[employee] += days
+
+    for month, leave_type, status, count, days in rows:
+        if not count and not days:
+            # Emptied by later transitions
+            continue
+        entry = months[month]
+        entry['by_type'][leave_type][status] = {'count': count, 'days': days}
+        if status == 'APPROVED':
+            entry['approved'] += count
+        elif status == 'REJECTED':
+            entry['rejected'] += count
+
+    def rate(approved, rejected):
+        decided = approved + rejected
+        return round(approved / decided, 4) if decided else None
+
+    result_months = []
+    for month, entry in months.items():
+        result_months.append({
+            'month': f'{month:%Y-%m}',
+            'by_type': {leave_type: dict(statuses) for leave_type, statuses in entry['by_type'].items()},
+            'approval_rate': rate(entry['approved'], entry['rejected']),
+            'live': month == current_month,
+        })
+
+    total_approved = sum(entry['approved'] for entry in months.values())
+    total_rejected = sum(entry['rejected'] for entry in months.values())
+    top_absentees = sorted(absentees.items(), key=lambda item: (-item[1], item[0]))[:top]
+
+    return {
+        'months': result_months,
+        'top_absentees': [{'employee': name, 'days': days} for name, days in top_absentees if days > 0],
+        'approval_rate': rate(total_approved, total_rejected),
+    }
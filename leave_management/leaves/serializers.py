@@ -1,30 +1,50 @@
+import re
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Leave_Record
+from .workdays import check_supported
+
+# Django's username characters plus spaces
+EMPLOYEE_NAME_RE = re.compile(r'^[\w.@+\- ]+$')
+
 
 class LeaveRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model=Leave_Record
         fields='__all__'
+        read_only_fields=['No_of_Days','Team','Change_Seq','Updated_On']
+
+    def validate(self,data):
+        # Partial updates fall back to the stored dates
+        start=data.get('Start_Date',getattr(self.instance,'Start_Date',None))
+        end=data.get('End_Date',getattr(self.instance,'End_Date',None))
+        if start and end and start>end:
+            raise serializers.ValidationError("End Date must be after Start Date")
+        try:
+            check_supported(start,end)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        if self.instance is None and start and start<timezone.localdate():
+            raise serializers.ValidationError("Sorry!! You should have applied for the leave beforehand")
+        return data
+    def validate_Employee_Name(self,value):
+        if not EMPLOYEE_NAME_RE.match(value):
+            raise serializers.ValidationError("Employee Name may only contain letters, digits, spaces and @/./+/-/_")
+        return value
+    def validate_Leave_Type(self,value):
+        leave_types=[choice[0] for choice in Leave_Record.LEAVE_TYPES]
+        if value not in leave_types:
+            raise serializers.ValidationError(f"Leave Type must be one of {', '.join(leave_types)}")
+        return value
+    def validate_Status(self,value):
+        status_types=[choice[0] for choice in Leave_Record.STATUS_TYPES]
+        if value not in status_types:
+            raise serializers.ValidationError(f"Status must be one of {', '.join(status_types)}")
+        return value
+
 
-        def validate(self,data):
-            if data['Applied_On']>=data['Start_Date']:
-                raise serializers.ValidationError("Sorry!! You should have applied for the leave beforehand")
-            return data
-        def validate_date(self,data):
-            if data['Start_Date']>data['End_Date']:
-                raise serializers.ValidationError("End Date must be after Start Date")
-            return data
-        def validate_Employee_Name(self,value):
-            if not value.replace(" ","").isalpha():
-                raise serializers.ValidationError("Employee Name must contain only alphabetic characters and spaces")
-            return value
-        def validate_Leave_Type(self,value):
-            leave_types=[choice[0] for choice in Leave_Record.LEAVE_TYPES]
-            if value not in leave_types:
-                raise serializers.ValidationError(f"Leave Type must be one of {', '.join(leave_types)}")
-            return value
-        def validate_Status(self,value):
-            status_types=[choice[0] for choice in Leave_Record.STATUS_TYPES]
-            if value not in status_types:
-                raise serializers.ValidationError(f"Status must be one of {', '.join(status_types)}")
-            return value
+class BulkTransitionSerializer(serializers.Serializer):
+    """Body of POST /leaves/bulk-transition/ (Status is checked by the view)."""
+    # Bounded so the id list always fits in one IN (...) clause
+    ids=serializers.ListField(child=serializers.IntegerField(min_value=1),allow_empty=False,max_length=1000)
@@ -0,0 +1,201 @@
+"""
+Leave state machine for Leave Management.
+
+Every status change goes through this module. Each transition is one
+conditional ``UPDATE ... WHERE id = ? AND Status IN (...)`` that writes
+only the changed columns, so two racing actions (e.g. cancel vs. approve) can
+never overwrite each other: exactly one of them wins.
+
+Winning transitions enqueue their notifications, record audit events and
+update the derived tables (monthly rollups, daily absence index) in the
+same transaction; see ``leave_changed``.
+"""
+from django.utils import timezone
+
+from leaves.absences import sync_leave_absences, sync_many_absences
+from leaves.audit import audited_atomic, leave_values, record_transition, record_updated
+from leaves.conflicts import check_leave_conflicts
+from leaves.policy import check_leave_policy
+from leaves.models import Leave_Record, next_change_seq
+from leaves.notifications import enqueue_leave_event, enqueue_leave_events
+from leaves.rollups import record_leave_change, snapshot
+from leaves.workdays import working_days
+
+
+# Target status -> statuses it may be reached from
+TRANSITIONS = {
+    'APPROVED': ('PENDING',),
+    'REJECTED': ('PENDING',),
+    'CANCELLED': ('PENDING', 'APPROVED'),
+}
+
+
+class InvalidTransition(ValueError):
+    """Raised when asking for a status change the state machine does not define."""
+
+
+def _transition_fields(to_status, actor):
+    """Build the column values written by a transition to ``to_status``."""
+    if to_status not in TRANSITIONS:
+        raise InvalidTransition(f"Cannot move a leave to status: {to_status}")
+
+    fields = {'Status': to_status}
+    if to_status == 'CANCELLED':
+        fields['Cancelled_By'] = actor
+        fields['Cancelled_On'] = timezone.now()
+    return fields
+
+
+def leave_changed(before, leave, leave_id=None):
+    """
+    Bring the tables derived from a leave up to date after a write.
+
+    Call inside the writing transaction.
+
+    Args:
+        before: rollups.snapshot() of the leave before the write, None if new
+        leave: The leave after the write, None if it was deleted
+        leave_id: Id of a deleted leave (defaults to ``leave.id``)
+    """
+    after = snapshot(leave) if leave is not None else None
+    if before == after:
+        return
+    record_leave_change(before, after)
+
+    # The absence index only holds APPROVED leaves
+    before_status = before[2] if before else None
+    after_status = after[2] if after else None
+    if 'APPROVED' in (before_status, after_status):
+        sync_leave_absences(leave_id or leave.id, leave)
+
+
+def transition_leave(leave, to_status, actor=None):
+    """
+    Move a single leave to ``to_status`` if its current status allows it.
+
+    The row is read and locked first (the instance may be stale, e.g. from
+    leaves.leave_cache), which gives the source status and the state the
+    derived tables move from. The change itself is one conditional
+    ``UPDATE ... WHERE id = ? AND Status IN (...)`` of the status columns.
+
+    Args:
+        leave: Leave_Record instance; reloaded from the database
+        to_status: Target status (APPROVED, REJECTED or CANCELLED)
+        actor: Username performing the change (recorded on cancellation)
+
+    Returns:
+        bool: True if this call won the transition. Either way the instance
+        holds the leave as stored afterwards, so callers can report what its
+        status actually is.
+    """
+    fields = _transition_fields(to_status, actor)
+    with audited_atomic():
+        leave.refresh_from_db(from_queryset=Leave_Record.objects.select_for_update())
+        from_status = leave.Status
+        won = False
+        if from_status in TRANSITIONS[to_status]:
+            stamp = {'Change_Seq': next_change_seq(), 'Updated_On': timezone.now()}
+            won = Leave_Record.objects.filter(
+                id=leave.id, Status__in=TRANSITIONS[to_status],
+            ).update(**fields, **stamp) == 1
+
+        if won:
+            before = snapshot(leave)
+            record_transition(leave, from_status, fields, actor=actor)
+            for name, value in {**fields, **stamp}.items():
+                setattr(leave, name, value)
+            leave_changed(before, leave)
+            enqueue_leave_event(leave, to_status, actor=actor)
+    return won
+
+
+def transition_leaves(leave_ids, to_status, actor=None):
+    """
+    Move many leaves to ``to_status`` in one conditional UPDATE.
+
+    Leaves whose current status does not allow the transition are skipped.
+
+    Args:
+        leave_ids: List or queryset of Leave_Record IDs
+        to_status: Target status (APPROVED, REJECTED or CANCELLED)
+        actor: Username performing the change (recorded on cancellation)
+
+    Returns:
+        int: Number of leaves that were transitioned
+    """
+    fields = _transition_fields(to_status, actor)
+    with audited_atomic():
+        # Lock the eligible rows first so the notifications match exactly
+        # the leaves this UPDATE moves
+        leaves = list(
+            Leave_Record.objects.select_for_update()
+            .filter(id__in=leave_ids, Status__in=TRANSITIONS[to_status])
+            .only('id', 'Employee_Name', 'Leave_Type', 'Status', 'Start_Date', 'End_Date', 'Cancelled_By', 'Cancelled_On')
+        )
+        if not leaves:
+            return 0
+
+        updated = Leave_Record.objects.filter(
+            id__in=[leave.id for leave in leaves],
+            Status__in=TRANSITIONS[to_status],
+        ).update(**fields)
+        for leave in leaves:
+            before = snapshot(leave)
+            record_transition(leave, leave.Status, fields, actor=actor)
+            leave.Status = to_status
+            record_leave_change(before, snapshot(leave))
+        sync_many_absences(leaves)
+        enqueue_leave_events(leaves, to_status, actor=actor)
+    return updated
+
+
+def update_pending_leave(leave, actor=None, **fields):
+    """
+    Update fields of a leave only while it is still PENDING.
+
+    Runs as one conditional UPDATE, so an edit racing an approval or a
+    cancellation cannot resurrect or overwrite the other change. New dates
+    or types are checked against the leave policy, overlaps and team
+    staffing in the same transaction.
+
+    Args:
+        leave: Leave_Record instance
+        actor: Username making the edit (recorded in the audit log)
+        **fields: Column values to write
+
+    Returns:
+        bool: True if the leave was still PENDING and has been updated
+
+    Raises:
+        LeaveConflict: If the new values break a policy (PolicyViolation),
+            overlap another leave or understaff the team
+    """
+    with audited_atomic():
+        # Check and snapshot the row as stored, not a possibly stale instance
+        leave.refresh_from_db(from_queryset=Leave_Record.objects.select_for_update())
+        if {'Leave_Type', 'Start_Date', 'End_Date'} & set(fields):
+            start = fields.get('Start_Date', leave.Start_Date)
+            end = fields.get('End_Date', leave.End_Date)
+            check_leave_policy(
+                leave.Employee_Name, fields.get('Leave_Type', leave.Leave_Type), start, end,
+                working_days(start, end), applied_on=leave.Applied_On,
+            )
+            check_leave_conflicts(leave.Employee_Name, start, end, exclude_id=leave.id)
+        won = False
+        if leave.Status == 'PENDING':
+            stamp = {'Change_Seq': next_change_seq(), 'Updated_On': timezone.now()}
+            won = Leave_Record.objects.filter(
+                id=leave.id, Status='PENDING',
+            ).update(**fields, **stamp) == 1
+
+        if won:
+            before = snapshot(leave)
+            old_values = leave_values(leave)
+            for name, value in {**fields, **stamp}.items():
+                setattr(leave, name, value)
+            if 'Start_Date' in fields and 'End_Date' in fields:
+                # Recomputed by the UPDATE
+                leave.No_of_Days = working_days(leave.Start_Date, leave.End_Date)
+            record_updated(leave, old_values, leave_values(leave), actor=actor)
+            leave_changed(before, leave)
+    return won
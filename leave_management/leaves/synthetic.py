@@ -0,0 +1,309 @@
+"""
+Synthetic data for Leave Management performance work.
+
+``generate_users`` creates an organisation - admins, managers each
+leading a team, and employees spread over those teams - and
+``generate_leaves`` gives those employees leave records with realistic
+shapes:
+
+- leave types weighted CASUAL > SICK > EARNED, each with its own duration
+  mix and seasonality (sick leave peaks in winter, earned leave in summer
+  and at year end)
+- a few employees take much more leave than others
+- statuses follow the date: future leaves are mostly PENDING or
+  APPROVED, past ones APPROVED with some REJECTED and CANCELLED
+- Applied_On precedes the start by a type-specific notice period
+- no employee has two active leaves on the same day
+
+Everything is drawn from one ``random.Random(seed)``, so the same seed and
+``today`` produce the same rows. Users are written with batched
+``bulk_create`` and share one password hash computed up front; leaves,
+which are far more numerous, are inserted as pre-adapted rows with
+``executemany``. Both run in large transactions and bypass save(), so the
+callers rebuild the reporting lines and, optionally, the rollups and
+absence index afterwards.
+"""
+import random
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+
+from authentication.models import CustomUser, Role, Team
+from leaves.models import Leave_Record, next_change_seq
+from leaves.workdays import get_calendar
+
+
+DEPARTMENTS = ('Engineering', 'Sales', 'Support', 'Finance', 'Operations', 'Marketing', 'People', 'Legal')
+
+# Share of each leave type
+TYPE_WEIGHTS = {'CASUAL': 45, 'SICK': 35, 'EARNED': 20}
+
+# Calendar days of a leave -> weight, per type
+DURATIONS = {
+    'SICK': {1: 50, 2: 25, 3: 15, 5: 10},
+    'CASUAL': {1: 60, 2: 30, 3: 10},
+    'EARNED': {3: 15, 5: 30, 7: 20, 10: 20, 14: 15},
+}
+
+# Relative likelihood of a leave starting in each month (Jan..Dec), per type
+SEASONALITY = {
+    'SICK': (16, 14, 10, 7, 6, 5, 5, 5, 7, 9, 12, 14),
+    'CASUAL': (8, 8, 9, 9, 9, 8, 8, 8, 9, 9, 8, 7),
+    'EARNED': (4, 4, 6, 7, 8, 12, 18, 17, 7, 5, 4, 14),
+}
+
+# Days between applying and the start of the leave (min, max), per type
+NOTICE = {'SICK': (0, 2), 'CASUAL': (1, 21), 'EARNED': (14, 90)}
+
+# Status -> weight, for leaves starting after / on or before ``today``
+FUTURE_STATUSES = {'PENDING': 40, 'APPROVED': 50, 'REJECTED': 5, 'CANCELLED': 5}
+PAST_STATUSES = {'APPROVED': 82, 'REJECTED': 8, 'CANCELLED': 10}
+
+
+def _weighted(weights):
+    """(values, cumulative weights) for _Sampler.pick."""
+    return list(weights), list(accumulate(weights.values()))
+
+
+class _Sampler:
+    """
+    Draws leave types, durations, statuses and seasonal start dates.
+
+    Every draw is one rng.random() and a bisect, which is several times
+    cheaper than rng.choices() per value.
+    """
+
+    def __init__(self, rng, first_day, last_day):
+        self.rng = rng
+        self.types = _weighted(TYPE_WEIGHTS)
+        self.durations = {leave_type: _weighted(weights) for leave_type, weights in DURATIONS.items()}
+        self.statuses = {True: _weighted(FUTURE_STATUSES), False: _weighted(PAST_STATUSES)}
+        days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+        # Weekends are rarely the first day of a leave
+        self.starts = {
+            leave_type: (days, list(accumulate(
+                months[day.month - 1] * (1 if day.weekday() < 5 else 0.1) for day in days
+            )))
+            for leave_type, months in SEASONALITY.items()
+        }
+
+    def pick(self, weighted):
+        values, weights = weighted
+        return values[bisect_right(weights, self.rng.random() * weights[-1])]
+
+    def between(self, low, high):
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def leave_type(self):
+        return self.pick(self.types)
+
+    def start(self, leave_type):
+        return self.pick(self.starts[leave_type])
+
+    def duration(self, leave_type):
+        return self.pick(self.durations[leave_type])
+
+    def status(self, future):
+        return self.pick(self.statuses[future])
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_users(count, prefix='gen', password='password', seed=None, batch_size=5000):
+    """
+    Create ``count`` users: about 1% admins, 10% managers (each leading a
+    team of their own) and employees spread over the teams.
+
+    Args:
+        count: Number of users (at least 3: an admin, a manager, an employee)
+        prefix: Username, email and team name prefix; must not be in use
+        password: Password of every generated user
+        seed: Random seed
+        batch_size: Rows per INSERT
+
+    Returns:
+        list: Usernames of the generated employees and managers (the people
+        who take leave)
+    """
+    rng = random.Random(seed)
+    admins = max(1, count // 100)
+    managers = max(1, count // 10)
+    employees = count - admins - managers
+    if employees < 1:
+        raise ValueError('At least 3 users are needed')
+
+    # Hashing is deliberately slow; every generated user shares one hash
+    password_hash = make_password(password)
+    now = timezone.now()
+
+    def user(number, role, **fields):
+        username = f'{prefix}-{number:07d}'
+        return CustomUser(
+            username=username, email=f'{username}@example.com', password=password_hash, role=role,
+            is_verified=True, date_joined=now, created_at=now, updated_at=now, **fields,
+        )
+
+    with transaction.atomic():
+        teams = Team.objects.bulk_create([
+            Team(name=f'{prefix} team {n + 1}', department=DEPARTMENTS[n % len(DEPARTMENTS)])
+            for n in range(managers)
+        ], batch_size=batch_size)
+        if not all(team.pk for team in teams):
+            # Backends that do not return ids from bulk_create
+            teams = list(Team.objects.filter(name__startswith=f'{prefix} team ').order_by('id'))
+
+        CustomUser.objects.bulk_create(
+            [user(n, Role.ADMIN, is_staff=True) for n in range(admins)], batch_size=batch_size,
+        )
+        admin_ids = list(CustomUser.objects.filter(username__startswith=f'{prefix}-', role=Role.ADMIN).values_list('id', flat=True))
+
+        CustomUser.objects.bulk_create([
+            user(admins + n, Role.MANAGER, team_id=teams[n].pk, manager_id=rng.choice(admin_ids))
+            for n in range(managers)
+        ], batch_size=batch_size)
+        leads = dict(
+            CustomUser.objects.filter(username__startswith=f'{prefix}-', role=Role.MANAGER).values_list('team_id', 'id')
+        )
+
+        # Team sizes vary: some teams are much larger than others
+        team_weights = list(accumulate(rng.lognormvariate(0, 0.6) for _ in teams))
+        team_ids = [team.pk for team in teams]
+
+        def employee(n):
+            team_id = rng.choices(team_ids, cum_weights=team_weights)[0]
+            return user(admins + managers + n, Role.EMPLOYEE, team_id=team_id, manager_id=leads[team_id])
+
+        for batch in _batches((employee(n) for n in range(employees)), batch_size):
+            CustomUser.objects.bulk_create(batch, batch_size=batch_size)
+
+    return list(
+        CustomUser.objects.filter(username__startswith=f'{prefix}-').exclude(role=Role.ADMIN)
+        .order_by('id').values_list('username', flat=True)
+    )
+
+
+# Columns written by generate_leaves, in row order
+LEAVE_COLUMNS = (
+    'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date', 'Status', 'Applied_On',
+    'Cancelled_By', 'Cancelled_On', 'No_of_Days', 'Team', 'Updated_On', 'Change_Seq',
+)
+
+
+def _insert_sql(connection):
+    opts = Leave_Record._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(opts.get_field(name).column) for name in LEAVE_COLUMNS)
+    placeholders = ', '.join(['%s'] * len(LEAVE_COLUMNS))
+    return f'INSERT INTO {quote(opts.db_table)} ({columns}) VALUES ({placeholders})'
+
+
+def _employee_leaves(sampler, count, today, last_day):
+    """
+    Up to ``count`` non-overlapping (type, start, end, status, applied_on,
+    cancelled_on) tuples of one employee, in date order.
+    """
+    leaves = sorted((sampler.start(leave_type), leave_type) for leave_type in (sampler.leave_type() for _ in range(count)))
+    free_from = None
+    for start, leave_type in leaves:
+        if free_from is not None and start < free_from:
+            # Overlaps the previous leave: move it just after
+            start = free_from + timedelta(days=sampler.between(0, 3))
+        end = start + timedelta(days=sampler.duration(leave_type) - 1)
+        if end > last_day:
+            return
+        free_from = end + timedelta(days=1)
+
+        status = sampler.status(start > today)
+        applied_on = datetime.combine(
+            min(start - timedelta(days=sampler.between(*NOTICE[leave_type])), today),
+            time(sampler.between(8, 18), sampler.between(0, 59)),
+        )
+        cancelled_on = None
+        if status == 'CANCELLED':
+            cancelled_on = min(
+                applied_on + timedelta(hours=sampler.between(1, max(1, (start - applied_on.date()).days * 24))),
+                datetime.combine(today, time(18)),
+            )
+        yield leave_type, start, end, status, applied_on, cancelled_on
+
+
+def generate_leaves(employees, count, first_day, last_day, today=None, seed=None, batch_size=5000, commit_every=100000):
+    """
+    Create about ``count`` leave records for ``employees``.
+
+    Employees that run out of room in the date range (more leave than
+    days) pass their remaining leaves on, so fewer rows are only written
+    when the range cannot hold ``count`` leaves at all.
+
+    Args:
+        employees: Usernames taking leave
+        count: Number of leaves
+        first_day: Earliest start date
+        last_day: Latest end date
+        today: Date splitting past from future statuses (default: today)
+        seed: Random seed
+        batch_size: Rows per executemany call
+        commit_every: Rows per transaction
+
+    Returns:
+        int: Number of leaves written
+    """
+    rng = random.Random(seed)
+    today = today or timezone.localdate()
+    sampler = _Sampler(rng, first_day, last_day)
+    calendar = get_calendar(first_day, last_day)
+    teams = dict(CustomUser.objects.exclude(team=None).values_list('username', 'team_id'))
+
+    connection = connections[Leave_Record.objects.db]
+    adapt_date = connection.ops.adapt_datefield_value
+    adapt_datetime = connection.ops.adapt_datetimefield_value
+    current_tz = timezone.get_current_timezone()
+
+    def moment(value):
+        return adapt_datetime(timezone.make_aware(value, current_tz)) if value else None
+
+    # A few employees take much more leave than the rest
+    weights = list(accumulate(rng.lognormvariate(0, 0.5) for _ in employees))
+    per_employee = Counter(rng.choices(range(len(employees)), cum_weights=weights, k=count))
+
+    def rows():
+        carried = 0
+        for index, employee in enumerate(employees):
+            wanted = per_employee.get(index, 0) + carried
+            made = 0
+            team_id = teams.get(employee)
+            for leave_type, start, end, status, applied_on, cancelled_on in _employee_leaves(sampler, wanted, today, last_day):
+                made += 1
+                yield (
+                    employee, leave_type, adapt_date(start), adapt_date(end), status, moment(applied_on),
+                    employee if cancelled_on else None, moment(cancelled_on), calendar.count(start, end), team_id,
+                    moment(cancelled_on or applied_on),
+                )
+            carried = wanted - made
+
+    # Model instances and bulk_create would spend most of the time
+    # preparing values; the rows are already adapted for the backend
+    sql = _insert_sql(connection)
+    written = 0
+    for chunk in _batches(rows(), commit_every):
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            # Each transaction is one change in the change feed (leaves.changes)
+            change_seq = (next_change_seq(connection.alias),)
+            for batch in _batches(chunk, batch_size):
+                cursor.executemany(sql, [row + change_seq for row in batch])
+        written += len(chunk)
+    return written
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from leaves.absences import absence_counts, absent_on, rebuild_absences
+from leaves.models import Daily_Absence
+
+from .utils import LeaveTestCase
+
+
+class AbsenceIndexTests(LeaveTestCase):
+
+    def absent_days(self, employee='employee'):
+        return sorted(Daily_Absence.objects.filter(Employee_Name=employee).values_list('Date', flat=True))
+
+    def test_index_follows_the_approved_state(self):
+        end = self.day + timedelta(days=2)
+        leave_id = self.submit(self.employee_client, 'employee', self.day, end).json()['id']
+        self.assertEqual(self.absent_days(), [])
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        self.assertEqual(self.absent_days(), [self.day + timedelta(days=n) for n in range(3)])
+
+        self.admin_client.patch(f'/leaves/leaves/{leave_id}/', {'End_Date': self.day.isoformat()}, format='json')
+        self.assertEqual(self.absent_days(), [self.day])
+        self.assertEqual([row.Employee_Name for row in absent_on(self.day)], ['employee'])
+        counts = absence_counts(self.day - timedelta(days=1), self.day)
+        self.assertEqual(list(counts.values()), [0, 1])
+
+        self.set_status(self.employee_client, leave_id, 'CANCELLED')
+        self.assertEqual(self.absent_days(), [])
+
+    def test_rebuild(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        Daily_Absence.objects.all().delete()
+        self.assertEqual(rebuild_absences(), 1)
+        self.assertEqual(self.absent_days(), [self.day])
+
+
+class AbsenceWidgetTests(LeaveTestCase):
+
+    def widget(self, user, **params):
+        self.client.force_login(user)
+        return self.client.get('/htmx/absences/', params)
+
+    def test_reviewers_only(self):
+        self.assertContains(self.widget(self.employee), 'Only admins and managers')
+
+    def test_shows_who_is_out(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        self.assertContains(self.widget(self.manager, date=self.day.isoformat()), '>employee<')
+        self.assertContains(self.widget(self.manager, date=(self.day - timedelta(days=1)).isoformat()), 'Everyone is in.')
+
+    def test_bad_dates_show_today(self):
+        for value in ('2026-02-30', 'nonsense', '9999-12-31'):
+            response = self.widget(self.admin, date=value)
+            self.assertContains(response, f'Out on {timezone.localdate():%b %d, %Y}', msg_prefix=value)
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from authentication.models import CustomUser
+from leaves.admin import LeaveRecordAdmin
+from leaves.models import Daily_Absence, Leave_Record, Notification_Outbox
+from leaves.rollups import rebuild_rollups
+from leaves.services import transition_leave
+
+from .utils import make_user, rollup_rows
+
+
+CHANGELIST = '/admin-panel/leaves/leave_record/'
+
+
+class LeaveAdminTests(TestCase):
+    """Django admin edits keep the derived tables in step."""
+
+    def setUp(self):
+        self.superuser = CustomUser.objects.create_superuser(
+            username='root', email='root@example.com', password=None,
+        )
+        # Hears about new leaves (the acting superuser does not)
+        make_user('admin', role='ADMIN')
+        make_user('employee')
+        self.client.force_login(self.superuser)
+
+    def test_add_ignores_status_and_notifies(self):
+        response = self.client.post(f'{CHANGELIST}add/', {
+            'Employee_Name': 'employee', 'Leave_Type': 'SICK',
+            'Start_Date': '2031-03-03', 'End_Date': '2031-03-05', 'Status': 'APPROVED',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Leave_Record.objects.get().Status, 'PENDING')
+        self.assertTrue(Notification_Outbox.objects.filter(Event='SUBMITTED').exists())
+
+    def test_edit_and_delete_update_absences_and_rollups(self):
+        leave = Leave_Record.objects.create(
+            Employee_Name='employee', Leave_Type='SICK', Start_Date=date(2031, 3, 3), End_Date=date(2031, 3, 5),
+        )
+        rebuild_rollups()
+        self.assertTrue(transition_leave(leave, 'APPROVED', actor='root'))
+        self.assertEqual(Daily_Absence.objects.count(), 3)
+
+        response = self.client.post(f'{CHANGELIST}{leave.pk}/change/', {
+            'Employee_Name': 'employee', 'Leave_Type': 'SICK',
+            'Start_Date': '2031-03-03', 'End_Date': '2031-03-04', 'Status': 'REJECTED',
+        })
+        self.assertEqual(response.status_code, 302)
+        leave.refresh_from_db()
+        self.assertEqual(leave.Status, 'APPROVED')
+        self.assertEqual(Daily_Absence.objects.count(), 2)
+        rows = rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(rows, rollup_rows())
+
+        response = self.client.post(f'{CHANGELIST}{leave.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Daily_Absence.objects.count(), 0)
+
+
+class LeaveChangeListTests(TestCase):
+    """Keyset pages, capped counts, prefix search and the date hierarchy."""
+
+    def setUp(self):
+        self.superuser = CustomUser.objects.create_superuser(
+            username='root', email='root@example.com', password=None,
+        )
+        self.client.force_login(self.superuser)
+        # Seven leaves applied a day apart, over two months; two share a moment
+        start = timezone.make_aware(datetime(2030, 1, 29, 9))
+        self.leaves = []
+        for index, name in enumerate(['anna', 'anna', 'bob', 'bob', 'carl', 'dora', 'dora']):
+            leave = Leave_Record.objects.create(
+                Employee_Name=name, Leave_Type='SICK', Start_Date=date(2031, 3, 3 + index),
+                End_Date=date(2031, 3, 3 + index),
+            )
+            applied_on = start + timedelta(days=min(index, 5))
+            Leave_Record.objects.filter(pk=leave.pk).update(Applied_On=applied_on)
+            self.leaves.append(leave.pk)
+        # Newest first: the shared moment is ordered by id
+        self.newest_first = self.leaves[::-1]
+
+    def changelist(self, link='', **params):
+        response = self.client.get(CHANGELIST + link, params)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    @mock.patch.object(LeaveRecordAdmin, 'list_per_page', 3)
+    def test_keyset_pages(self):
+        seen = []
+        cl = self.changelist()
+        self.assertIsNone(cl.newer_link)
+        pages = []
+        while True:
+            page = [leave.pk for leave in cl.result_list]
+            pages.append((page, cl.newer_link))
+            seen += page
+            if not cl.older_link:
+                break
+            cl = self.changelist(cl.older_link)
+        self.assertEqual(seen, self.newest_first)
+        self.assertEqual(len(pages), 3)
+
+        # Back from the last page to the one before it
+        cl = self.changelist(pages[-1][1])
+        self.assertEqual([leave.pk for leave in cl.result_list], pages[-2][0])
+
+    def test_invalid_cursor_is_refused(self):
+        response = self.client.get(CHANGELIST, {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('e=1', response['Location'])
+
+    @mock.patch('leaves.admin.COUNT_CAP', 5)
+    def test_count_is_capped(self):
+        response = self.client.get(CHANGELIST)
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, 5)
+        self.assertTrue(cl.result_count_capped)
+        self.assertContains(response, '5+ leave')
+
+    def test_search_by_name_prefix_or_id(self):
+        cl = self.changelist(q='do')
+        self.assertEqual({leave.Employee_Name for leave in cl.result_list}, {'dora'})
+        cl = self.changelist(q=str(self.leaves[2]))
+        self.assertEqual([leave.pk for leave in cl.result_list], [self.leaves[2]])
+        # Prefix, not substring
+        self.assertEqual(list(self.changelist(q='ora').result_list), [])
+
+    def test_date_hierarchy(self):
+        cl = self.changelist()
+        # Only 2030: start at its months
+        self.assertEqual([choice['title'] for choice in cl.date_links['choices']], ['January 2030', 'February 2030'])
+        cl = self.changelist(Applied_On__year=2030, Applied_On__month=2)
+        self.assertEqual(
+            [choice['title'] for choice in cl.date_links['choices']],
+            ['February 1', 'February 2', 'February 3'],
+        )
+        self.assertEqual(len(cl.result_list), 4)
+
+    def test_bulk_action_moves_pending_leaves(self):
+        Leave_Record.objects.filter(pk=self.leaves[0]).update(Status='REJECTED')
+        response = self.client.post(CHANGELIST, {
+            'action': 'approve_leaves', '_selected_action': self.leaves[:3],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(Leave_Record.objects.filter(pk__in=self.leaves[:3]).order_by('id').values_list('Status', flat=True)),
+            ['REJECTED', 'APPROVED', 'APPROVED'],
+        )
@@ -0,0 +1,75 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+
+from leaves.models import Leave_Record
+
+from .utils import LeaveTestCase, make_user, rollup_rows
+
+
+class RollupUpkeepTests(LeaveTestCase):
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        approved = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, approved, 'APPROVED')
+        rejected = self.submit(self.employee_client, 'employee', self.day.replace(year=self.day.year + 1)).json()['id']
+        self.set_status(self.manager_client, rejected, 'REJECTED')
+        self.set_status(self.employee_client, approved, 'CANCELLED')
+        other = self.submit(self.manager_client, 'manager', self.day).json()['id']
+        self.admin_client.patch(f'/leaves/leaves/{other}/', {'End_Date': self.day.isoformat()}, format='json')
+        self.admin_client.delete(f'/leaves/leaves/{rejected}/')
+
+        incremental = rollup_rows()
+        self.assertTrue(incremental[0])
+        call_command('rebuild_leave_rollups', stdout=StringIO())
+        self.assertEqual(rollup_rows(), incremental)
+
+
+class AnalyticsTests(LeaveTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Mondays to Wednesdays of March 2025
+        Leave_Record.objects.bulk_create([
+            Leave_Record(Employee_Name='employee', Leave_Type='SICK', Status='APPROVED',
+                         Start_Date=date(2025, 3, 3), End_Date=date(2025, 3, 5)),
+            Leave_Record(Employee_Name='manager', Leave_Type='SICK', Status='APPROVED',
+                         Start_Date=date(2025, 3, 10), End_Date=date(2025, 3, 10)),
+            Leave_Record(Employee_Name='employee', Leave_Type='CASUAL', Status='REJECTED',
+                         Start_Date=date(2025, 3, 17), End_Date=date(2025, 3, 17)),
+        ])
+        call_command('rebuild_leave_rollups', stdout=StringIO())
+
+    def get(self, client, **params):
+        return client.get('/leaves/analytics/', params)
+
+    def test_reviewers_only(self):
+        self.assertEqual(self.get(self.employee_client).status_code, 403)
+
+    def test_bad_ranges(self):
+        self.assertEqual(self.get(self.admin_client, **{'from': '2025-04', 'to': '2025-03'}).status_code, 400)
+        self.assertEqual(self.get(self.admin_client, **{'from': '9999-01', 'to': '9999-02'}).status_code, 400)
+
+    def test_month_from_rollups(self):
+        data = self.get(self.admin_client, **{'from': '2025-03', 'to': '2025-04'}).json()
+        march, april = data['months']
+        self.assertEqual(march['month'], '2025-03')
+        self.assertEqual(march['by_type']['SICK']['APPROVED'], {'count': 2, 'days': 4})
+        self.assertEqual(march['by_type']['CASUAL']['REJECTED'], {'count': 1, 'days': 1})
+        self.assertEqual(march['approval_rate'], round(2 / 3, 4))
+        self.assertEqual(april['by_type'], {})
+        self.assertEqual(data['top_absentees'], [{'employee': 'employee', 'days': 3}, {'employee': 'manager', 'days': 1}])
+
+    def test_managers_see_their_reporting_line(self):
+        make_user('outsider', manager=self.admin)
+        Leave_Record.objects.create(
+            Employee_Name='outsider', Leave_Type='SICK', Status='APPROVED',
+            Start_Date=date(2025, 3, 24), End_Date=date(2025, 3, 28),
+        )
+        call_command('rebuild_leave_rollups', stdout=StringIO())
+        data = self.get(self.manager_client, **{'from': '2025-03', 'to': '2025-03'}).json()
+        self.assertEqual([row['employee'] for row in data['top_absentees']], ['employee', 'manager'])
+        self.assertEqual(data['months'][0]['by_type']['SICK']['APPROVED'], {'count': 2, 'days': 4})
+        everyone = self.get(self.admin_client, **{'from': '2025-03', 'to': '2025-03'}).json()
+        self.assertEqual(everyone['top_absentees'][0], {'employee': 'outsider', 'days': 5})
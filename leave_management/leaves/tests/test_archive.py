@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from leaves.archive import archive_closed_leaves
+from leaves.models import Archived_Leave_Record, Leave_Record
+
+from .utils import client_for, make_user
+
+
+class ArchiveReadThroughTests(TestCase):
+    """The leave list reads old leaves from the archive table too."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(make_user('admin', role='ADMIN'))
+        Leave_Record.objects.bulk_create([
+            Leave_Record(
+                Employee_Name=f'user{i % 5}', Leave_Type='SICK', Status='APPROVED',
+                Start_Date=date(2019, 1, 1) + timedelta(days=i * 3),
+                End_Date=date(2019, 1, 1) + timedelta(days=i * 3),
+            )
+            for i in range(60)
+        ])
+        archive_closed_leaves(cutoff=date(2019, 4, 1))
+        self.params = {'Start_Date__lte': '2030-01-01'}
+
+    def test_list_merges_hot_and_archived_leaves(self):
+        self.assertGreater(Archived_Leave_Record.objects.count(), 10)
+        leaves = self.client.get('/leaves/leaves/', self.params).json()
+        self.assertEqual(len(leaves), 60)
+        starts = [leave['Start_Date'] for leave in leaves]
+        self.assertEqual(starts, sorted(starts, reverse=True))
+
+        by_name = self.client.get('/leaves/leaves/', {**self.params, 'ordering': 'Employee_Name'}).json()
+        names = [leave['Employee_Name'] for leave in by_name]
+        self.assertEqual(names, sorted(names))
+
+    def test_pages_read_only_what_they_show(self):
+        leaves = self.client.get('/leaves/leaves/', self.params).json()
+        with CaptureQueriesContext(connection) as queries:
+            page = self.client.get('/leaves/leaves/', {**self.params, 'limit': 10, 'offset': 25}).json()
+        self.assertEqual(page['count'], 60)
+        self.assertEqual([leave['id'] for leave in page['results']], [leave['id'] for leave in leaves[25:35]])
+        self.assertTrue(all(
+            'LIMIT 35' in query['sql'] for query in queries.captured_queries if 'ORDER BY' in query['sql']
+        ))
+
+    def test_retrieve_archived_leave(self):
+        archived = Archived_Leave_Record.objects.first()
+        response = self.client.get(f'/leaves/leaves/{archived.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], archived.id)
@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.audit import audited_atomic, record_created
+from leaves.models import Leave_Audit_Event, Leave_Record
+
+from .utils import LeaveTestCase
+
+
+class AuditLogTests(LeaveTestCase):
+
+    def actions(self, leave_id):
+        return list(
+            Leave_Audit_Event.objects.filter(Leave_Id=leave_id).order_by('id')
+            .values_list('Action', 'Actor', 'Old_Values', 'New_Values')
+        )
+
+    def test_every_change_is_recorded(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.employee_client.patch(f'/leaves/leaves/{leave_id}/', {'Leave_Type': 'CASUAL'}, format='json')
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        self.admin_client.delete(f'/leaves/leaves/{leave_id}/')
+
+        created, updated, approved, deleted = self.actions(leave_id)
+        self.assertEqual((created[0], created[1], created[3]['Status']), ('CREATED', 'employee', 'PENDING'))
+        self.assertEqual(updated, ('UPDATED', 'employee', {'Leave_Type': 'SICK'}, {'Leave_Type': 'CASUAL'}))
+        self.assertEqual(approved[:2], ('STATUS_CHANGED', 'manager'))
+        self.assertEqual((approved[2]['Status'], approved[3]['Status']), ('PENDING', 'APPROVED'))
+        self.assertEqual((deleted[0], deleted[1], deleted[2]['Leave_Type']), ('DELETED', 'admin', 'CASUAL'))
+
+    def test_refused_changes_leave_no_events(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.employee_client, leave_id, 'APPROVED')
+        self.assertEqual([row[0] for row in self.actions(leave_id)], ['CREATED'])
+
+    def test_events_are_buffered_and_roll_back_with_the_change(self):
+        leaves = [
+            Leave_Record.objects.create(Employee_Name='employee', Leave_Type='SICK', Start_Date=self.day, End_Date=self.day)
+            for _ in range(3)
+        ]
+        with CaptureQueriesContext(connection) as queries, audited_atomic():
+            for leave in leaves:
+                record_created(leave)
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "leaves_leave_audit_event"')]
+        self.assertEqual(len(inserts), 1)
+
+        with self.assertRaises(RuntimeError), audited_atomic():
+            record_created(leaves[0])
+            raise RuntimeError
+        self.assertEqual(Leave_Audit_Event.objects.count(), 3)
+
+    def test_audit_endpoint(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.submit(self.admin_client, 'admin', self.day)
+        self.assertEqual(self.employee_client.get('/leaves/audit/').status_code, 403)
+        self.assertEqual(self.admin_client.get('/leaves/audit/', {'limit': 'x'}).status_code, 400)
+
+        # Managers only see their reporting line
+        events = self.manager_client.get('/leaves/audit/').json()['results']
+        self.assertEqual([event['Leave_Id'] for event in events], [leave_id])
+
+        page = self.admin_client.get('/leaves/audit/', {'limit': 1}).json()
+        self.assertEqual(len(page['results']), 1)
+        rest = self.admin_client.get('/leaves/audit/', {'limit': 1, 'before_id': page['next_before_id']}).json()
+        self.assertEqual([event['Leave_Id'] for event in rest['results']], [leave_id])
+        self.assertIsNone(rest['next_before_id'])
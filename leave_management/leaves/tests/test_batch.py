@@ -0,0 +1,78 @@
+from datetime import date
+
+from django.test import TestCase
+
+from leaves.batch import JOBS, BatchJob, execute_run, get_job, partition_users, start_or_resume_run
+from leaves.models import Annual_Leave_Summary, Batch_Chunk, Leave_Record
+
+from .utils import make_user
+
+
+class FlakyJob(BatchJob):
+    """Fails every chunk while ``failing`` is set."""
+    name = 'flaky_test_job'
+    failing = True
+    seen = []
+
+    def process_chunk(self, user_ids, params):
+        if FlakyJob.failing:
+            raise RuntimeError('boom')
+        FlakyJob.seen.extend(user_ids)
+        return len(user_ids)
+
+
+class BatchEngineTests(TestCase):
+
+    def setUp(self):
+        self.users = [make_user(f'user{i}') for i in range(5)]
+        JOBS[FlakyJob.name] = FlakyJob
+        self.addCleanup(JOBS.pop, FlakyJob.name)
+        FlakyJob.failing = True
+        FlakyJob.seen = []
+
+    def test_partition_users(self):
+        ids = [user.id for user in self.users]
+        self.assertEqual(partition_users(2), [(ids[0], ids[1]), (ids[2], ids[3]), (ids[4], ids[4])])
+
+    def test_unknown_job(self):
+        with self.assertRaises(ValueError):
+            get_job('nope')
+
+    def test_failed_chunks_resume(self):
+        job = get_job(FlakyJob.name)
+        run, resumed = start_or_resume_run(job, {}, chunk_size=2)
+        self.assertFalse(resumed)
+        stats = execute_run(run, workers=1)
+        self.assertEqual((stats['failed'], stats['users']), (3, 0))
+        self.assertEqual(set(run.chunks.values_list('Status', flat=True)), {'FAILED'})
+
+        # Mark one chunk done: a resumed run skips it
+        done = run.chunks.order_by('id').first()
+        Batch_Chunk.objects.filter(id=done.id).update(Status='DONE')
+        FlakyJob.failing = False
+        again, resumed = start_or_resume_run(job, {}, chunk_size=2)
+        self.assertEqual((again.id, resumed), (run.id, True))
+        stats = execute_run(again, workers=1)
+        self.assertEqual((stats['failed'], stats['users'], stats['chunks_done']), (0, 3, 3))
+        self.assertEqual(sorted(FlakyJob.seen), [user.id for user in self.users[2:]])
+
+        # Finished runs are not resumed
+        self.assertFalse(start_or_resume_run(job, {}, chunk_size=2)[1])
+
+    def test_annual_leave_summary(self):
+        Leave_Record.objects.bulk_create([
+            # Mon 2024-12-30 to Fri 2025-01-03: 3 working days fall in 2025
+            Leave_Record(Employee_Name='user0', Leave_Type='SICK', Status='APPROVED',
+                         Start_Date=date(2024, 12, 30), End_Date=date(2025, 1, 3)),
+            Leave_Record(Employee_Name='user0', Leave_Type='CASUAL', Status='PENDING',
+                         Start_Date=date(2025, 3, 3), End_Date=date(2025, 3, 3)),
+        ])
+        job = get_job('annual_leave_summary')
+        run, _ = start_or_resume_run(job, job.clean_params({'year': 2025}), chunk_size=2)
+        self.assertEqual(execute_run(run, workers=1)['users'], 5)
+        summary = Annual_Leave_Summary.objects.get(Employee=self.users[0], Year=2025)
+        self.assertEqual(
+            (summary.Sick_Days, summary.Total_Days, summary.Approved_Count, summary.Pending_Count),
+            (3, 3, 1, 1),
+        )
+        self.assertEqual(Annual_Leave_Summary.objects.filter(Year=2025).count(), 5)
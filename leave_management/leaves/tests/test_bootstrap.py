@@ -0,0 +1,42 @@
+from authentication.models import CustomUser
+from leaves.htmx_views.bootstrap import BOOTSTRAP_PAGE_SIZE
+
+from .utils import LeaveTestCase
+
+
+class DashboardBootstrapTests(LeaveTestCase):
+
+    def bootstrap(self, user=None, **params):
+        if user:
+            self.client.force_login(user)
+        return self.client.get('/api/bootstrap/', params)
+
+    def test_requires_login(self):
+        self.assertEqual(self.bootstrap().status_code, 401)
+
+    def test_admin_view(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        data = self.bootstrap(self.admin).json()
+        self.assertEqual(data['user']['username'], 'admin')
+        self.assertEqual(data['stats']['pending'], 1)
+        self.assertIn(f'quickApprove({leave_id})', data['leaves_html'])
+        self.assertFalse(data['leaves_has_more'])
+        self.assertEqual({user['username'] for user in data['users']}, {'admin', 'manager', 'employee'})
+        self.assertFalse(data['users_has_more'])
+
+    def test_users_first_page(self):
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'user{n}', email=f'user{n}@example.com') for n in range(BOOTSTRAP_PAGE_SIZE)
+        ])
+        data = self.bootstrap(self.admin).json()
+        self.assertEqual(len(data['users']), BOOTSTRAP_PAGE_SIZE)
+        self.assertTrue(data['users_has_more'])
+
+    def test_employee_view(self):
+        self.submit(self.employee_client, 'employee', self.day)
+        self.submit(self.manager_client, 'manager', self.day)
+        data = self.bootstrap(self.employee).json()
+        self.assertNotIn('users', data)
+        self.assertEqual(data['stats']['total'], 1)
+        # Admins and managers can ask for their own dashboard too
+        self.assertNotIn('users', self.bootstrap(self.manager, view='employee').json())
@@ -0,0 +1,88 @@
+from django.db.models import F
+from django.test import SimpleTestCase
+
+from leaves.calendar import fold_line, make_feed_token
+from leaves.models import Data_Version, Holiday
+from leaves.versions import DATA_VERSION_KEY, HOLIDAY_VERSION_KEY, get_data_version
+
+from .utils import LeaveTestCase
+
+
+class FoldLineTests(SimpleTestCase):
+
+    def test_short_lines_are_kept(self):
+        self.assertEqual(fold_line('SUMMARY:x'), 'SUMMARY:x\r\n')
+
+    def test_folds_on_octets_without_splitting_characters(self):
+        line = 'SUMMARY:' + 'é' * 40 + '日本' * 30
+        folded = fold_line(line)
+        physical = folded[:-2].split('\r\n')
+        self.assertGreater(len(physical), 2)
+        self.assertTrue(all(len(part.encode('utf-8')) <= 75 for part in physical))
+        self.assertTrue(all(part.startswith(' ') for part in physical[1:]))
+        self.assertEqual(physical[0] + ''.join(part[1:] for part in physical[1:]), line)
+
+
+class DataVersionTests(LeaveTestCase):
+    """Versions live in the database, so writes from any process invalidate."""
+
+    def test_writes_bump_their_version(self):
+        leaves = get_data_version()
+        holidays = get_data_version(HOLIDAY_VERSION_KEY)
+        self.submit(self.employee_client, 'employee', self.day)
+        self.assertGreater(get_data_version(), leaves)
+        self.assertEqual(get_data_version(HOLIDAY_VERSION_KEY), holidays)
+        Holiday.objects.create(Date=self.day, Name='Founders day')
+        self.assertGreater(get_data_version(HOLIDAY_VERSION_KEY), holidays)
+
+    def test_reads_the_stored_counter(self):
+        version = get_data_version()
+        # As another worker would
+        Data_Version.objects.filter(Key=DATA_VERSION_KEY).update(Version=F('Version') + 5)
+        self.assertEqual(get_data_version(), version + 5)
+
+
+class CalendarFeedTests(LeaveTestCase):
+
+    def feed_urls(self, client):
+        response = client.get('/leaves/calendar/feeds/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['feeds']
+
+    def get_feed(self, url, **headers):
+        response = self.client.get(url.replace('http://testserver', ''), headers=headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body.decode()
+
+    def test_feed_lists_approved_leaves_only(self):
+        approved = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, approved, 'APPROVED')
+        pending = self.submit(self.employee_client, 'employee', self.day.replace(year=self.day.year + 1)).json()['id']
+
+        response, body = self.get_feed(self.feed_urls(self.employee_client)['my_leaves'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'UID:leave-{approved}@', body)
+        self.assertNotIn(f'UID:leave-{pending}@', body)
+        self.assertNotIn('team', self.feed_urls(self.employee_client))
+
+        _, team = self.get_feed(self.feed_urls(self.manager_client)['team'])
+        self.assertIn(f'UID:leave-{approved}@', team)
+
+    def test_etag_changes_with_the_feed(self):
+        url = self.feed_urls(self.employee_client)['my_leaves']
+        response, _ = self.get_feed(url)
+        etag = response['ETag']
+        self.assertEqual(self.get_feed(url, if_none_match=etag)[0].status_code, 304)
+
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        response, body = self.get_feed(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'UID:leave-{leave_id}@', body)
+
+    def test_bad_and_revoked_tokens(self):
+        self.assertEqual(self.client.get('/leaves/calendar/nope.ics').status_code, 404)
+        token = make_feed_token('user', self.employee)
+        self.employee.set_unusable_password()
+        self.employee.save()
+        self.assertEqual(self.client.get(f'/leaves/calendar/{token}.ics').status_code, 404)
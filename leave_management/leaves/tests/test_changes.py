@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from leaves.changes import purge_tombstones
+from leaves.models import Leave_Record, Leave_Tombstone
+
+from .utils import LeaveTestCase, client_for, make_user
+
+
+class ChangeFeedTests(LeaveTestCase):
+    """GET /leaves/leaves/changes/ returns what changed since a token."""
+
+    def setUp(self):
+        super().setUp()
+        self.other = make_user('other')
+        Leave_Record.objects.bulk_create([
+            Leave_Record(
+                Employee_Name=('employee', 'other')[i % 2], Leave_Type='SICK',
+                Start_Date=date(2031, 1, 1) + timedelta(days=i), End_Date=date(2031, 1, 1) + timedelta(days=i),
+            )
+            for i in range(12)
+        ])
+
+    def sync(self, client, token=None, limit=5):
+        changed, deleted = [], []
+        while True:
+            params = {'limit': limit, **({'since': token} if token else {})}
+            response = client.get('/leaves/leaves/changes/', params)
+            self.assertEqual(response.status_code, 200, response.content)
+            page = response.json()
+            changed += page['changed']
+            deleted += page['deleted']
+            token = page['next']
+            if not page['has_more']:
+                return changed, deleted, token
+
+    def test_incremental_sync(self):
+        changed, deleted, token = self.sync(self.admin_client)
+        self.assertEqual(len({leave['id'] for leave in changed}), 12)
+        self.assertEqual(deleted, [])
+        self.assertEqual(self.sync(self.admin_client, token)[:2], ([], []))
+
+        ids = [leave['id'] for leave in changed]
+        leave = Leave_Record.objects.get(id=ids[0])
+        leave.Leave_Type = 'CASUAL'
+        leave.save()
+        Leave_Record.objects.get(id=ids[1]).delete()
+
+        changed, deleted, _ = self.sync(self.admin_client, token)
+        self.assertEqual([(leave['id'], leave['Leave_Type']) for leave in changed], [(ids[0], 'CASUAL')])
+        self.assertEqual([entry['id'] for entry in deleted], [ids[1]])
+
+    def test_transitions_are_changes(self):
+        _, _, token = self.sync(self.admin_client)
+        leave_id = Leave_Record.objects.filter(Employee_Name='employee').values_list('id', flat=True).first()
+        self.assertEqual(self.set_status(self.manager_client, leave_id, 'APPROVED').status_code, 200)
+
+        changed, _, token = self.sync(self.admin_client, token)
+        self.assertEqual([(leave['id'], leave['Status']) for leave in changed], [(leave_id, 'APPROVED')])
+        self.assertEqual(self.sync(self.admin_client, token)[:2], ([], []))
+
+    def test_scoped_to_visible_leaves(self):
+        changed, _, _ = self.sync(self.manager_client)
+        self.assertEqual({leave['Employee_Name'] for leave in changed}, {'employee'})
+        changed, _, _ = self.sync(client_for(self.other))
+        self.assertEqual({leave['Employee_Name'] for leave in changed}, {'other'})
+
+        # Another user's position cannot be continued
+        _, _, token = self.sync(self.admin_client)
+        response = client_for(self.other).get('/leaves/leaves/changes/', {'since': token})
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()['resync'])
+
+    def test_bad_and_expired_tokens(self):
+        _, _, token = self.sync(self.admin_client)
+        self.assertEqual(self.admin_client.get('/leaves/leaves/changes/', {'since': 'junk'}).status_code, 400)
+        self.assertEqual(self.admin_client.get('/leaves/leaves/changes/', {'limit': 'x'}).status_code, 400)
+
+        Leave_Record.objects.filter(Employee_Name='other').first().delete()
+        Leave_Tombstone.objects.update(Deleted_On=timezone.now() - timedelta(days=3650))
+        self.assertEqual(purge_tombstones(), 1)
+        self.assertEqual(self.admin_client.get('/leaves/leaves/changes/', {'since': token}).status_code, 410)
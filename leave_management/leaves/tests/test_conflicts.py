@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from authentication.models import Team
+from leaves.models import Daily_Absence
+
+from .utils import LeaveTestCase, client_for, make_user, weekday_after
+
+
+class ConflictTests(LeaveTestCase):
+    """Overlapping leaves and team minimum staffing."""
+
+    def test_overlapping_leave_is_refused(self):
+        end = self.day + timedelta(days=2)
+        self.assertEqual(self.submit(self.employee_client, 'employee', self.day, end).status_code, 201)
+        response = self.submit(self.employee_client, 'employee', end, leave_type='CASUAL')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Overlaps', str(response.json()))
+
+    def test_cancelled_leave_frees_its_days(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.employee_client, leave_id, 'CANCELLED')
+        self.assertEqual(self.submit(self.employee_client, 'employee', self.day).status_code, 201)
+
+    def test_minimum_staffing(self):
+        team = Team.objects.create(name='Support', min_staffing=1)
+        first = make_user('first', manager=self.manager, team=team)
+        second = make_user('second', manager=self.manager, team=team)
+
+        leave_id = self.submit(client_for(first), 'first', self.day).json()['id']
+        self.assertEqual(self.set_status(self.manager_client, leave_id, 'APPROVED').status_code, 200)
+        self.assertEqual(Daily_Absence.objects.filter(Employee_Name='first').count(), 1)
+
+        response = self.submit(client_for(second), 'second', self.day)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('minimum staffing', str(response.json()))
+        # Another day is fine
+        response = self.submit(
+            client_for(second), 'second', weekday_after(40),
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+
+
+    def test_editing_into_an_overlap_is_refused(self):
+        self.submit(self.employee_client, 'employee', self.day)
+        later = weekday_after(40)
+        leave_id = self.submit(self.employee_client, 'employee', later).json()['id']
+        response = self.employee_client.patch(
+            f'/leaves/leaves/{leave_id}/', {'Start_Date': self.day.isoformat()}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        # Moving within its own days is fine
+        response = self.employee_client.patch(
+            f'/leaves/leaves/{leave_id}/', {'End_Date': (later + timedelta(days=1)).isoformat()}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from leaves.idempotency import purge_expired_keys
+from leaves.models import Idempotency_Key, Leave_Record
+
+from .utils import LeaveTestCase, leave_body
+
+
+class IdempotencyTests(LeaveTestCase):
+    """Requests retried with the same Idempotency-Key header run once."""
+
+    def test_retried_create_is_replayed(self):
+        body = leave_body('employee', self.day)
+        first = self.employee_client.post('/leaves/leaves/', body, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        retry = self.employee_client.post('/leaves/leaves/', body, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(first.json(), retry.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Leave_Record.objects.count(), 1)
+
+    def test_reused_key_with_another_body_is_refused(self):
+        self.employee_client.post(
+            '/leaves/leaves/', leave_body('employee', self.day), format='json', HTTP_IDEMPOTENCY_KEY='k1',
+        )
+        response = self.employee_client.post(
+            '/leaves/leaves/', leave_body('employee', self.day + timedelta(days=7)), format='json',
+            HTTP_IDEMPOTENCY_KEY='k1',
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Leave_Record.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        self.employee_client.post(
+            '/leaves/leaves/', leave_body('employee', self.day), format='json', HTTP_IDEMPOTENCY_KEY='k1',
+        )
+        self.admin_client.post(
+            '/leaves/leaves/', leave_body('admin', self.day), format='json', HTTP_IDEMPOTENCY_KEY='k1',
+        )
+        self.assertEqual(Leave_Record.objects.count(), 2)
+        self.assertEqual(Idempotency_Key.objects.count(), 2)
+
+    def test_expired_keys_are_purged(self):
+        for weeks, key in enumerate(('k1', 'k2')):
+            self.employee_client.post(
+                '/leaves/leaves/', leave_body('employee', self.day + timedelta(weeks=weeks)), format='json',
+                HTTP_IDEMPOTENCY_KEY=key,
+            )
+        self.assertEqual(Idempotency_Key.objects.count(), 2)
+        Idempotency_Key.objects.filter(id=Idempotency_Key.objects.first().id).update(Expires_On=timezone.now())
+        self.assertEqual(purge_expired_keys(batch_size=1), 1)
+        self.assertEqual(Idempotency_Key.objects.count(), 1)
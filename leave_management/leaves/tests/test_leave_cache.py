@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from leaves import leave_cache
+from leaves.leave_cache import cache_info, clear_leave_cache, get_leave
+from leaves.models import Daily_Absence, Leave_Record
+from leaves.rollups import rebuild_rollups
+from leaves.services import transition_leave
+
+from .utils import client_for, leave_body, make_user, rollup_rows, weekday_after
+
+
+# The cache is bypassed inside transactions, so these tests run outside one
+class LeaveCacheTests(TransactionTestCase):
+    """Single leave rows are served from memory until the data version moves."""
+
+    def setUp(self):
+        cache.clear()
+        clear_leave_cache()
+        self.addCleanup(clear_leave_cache)
+        manager = make_user('manager', role='MANAGER')
+        self.employee_client = client_for(make_user('employee', manager=manager))
+        self.manager_client = client_for(manager)
+        self.day = weekday_after(30)
+        self.leave_id = self.submit(self.day)
+
+    def submit(self, start):
+        response = self.employee_client.post('/leaves/leaves/', leave_body('employee', start), format='json')
+        return response.json()['id']
+
+    def test_repeated_reads_are_hits(self):
+        first = get_leave(self.leave_id)
+        with self.assertNumQueries(1):
+            # Only the data version is read
+            second = get_leave(self.leave_id)
+        self.assertEqual(cache_info()['hits'], 1)
+        self.assertEqual(second.Leave_Type, 'SICK')
+        # Every call returns its own instance
+        self.assertIsNot(first, second)
+        second.Leave_Type = 'CASUAL'
+        self.assertEqual(get_leave(self.leave_id).Leave_Type, 'SICK')
+
+    def test_writes_invalidate(self):
+        get_leave(self.leave_id)
+        response = self.manager_client.patch(f'/leaves/leaves/{self.leave_id}/', {'Status': 'APPROVED'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(get_leave(self.leave_id).Status, 'APPROVED')
+
+        Leave_Record.objects.filter(id=self.leave_id).update(Leave_Type='CASUAL')
+        self.assertEqual(get_leave(self.leave_id).Leave_Type, 'CASUAL')
+
+        Leave_Record.objects.filter(id=self.leave_id).delete()
+        with self.assertRaises(Leave_Record.DoesNotExist):
+            get_leave(self.leave_id)
+
+    def test_bypassed_inside_transactions(self):
+        get_leave(self.leave_id)
+        with transaction.atomic():
+            get_leave(self.leave_id)
+        self.assertEqual(cache_info()['hits'], 0)
+
+    def test_least_recently_used_rows_are_dropped(self):
+        other_id = self.submit(weekday_after(60))
+        with mock.patch.object(leave_cache._cache, 'maxsize', 1):
+            get_leave(self.leave_id)
+            get_leave(other_id)
+            self.assertEqual(cache_info()['size'], 1)
+            get_leave(self.leave_id)
+        self.assertEqual(cache_info()['hits'], 0)
+
+    def test_transition_reads_the_stored_row(self):
+        # A stale cached instance must not be the before-state of the rollups
+        rebuild_rollups()
+        stale = get_leave(self.leave_id)
+        self.assertTrue(transition_leave(get_leave(self.leave_id), 'APPROVED', actor='manager'))
+        self.assertFalse(transition_leave(stale, 'APPROVED', actor='manager'))
+        self.assertTrue(transition_leave(stale, 'CANCELLED', actor='employee'))
+        self.assertEqual(Daily_Absence.objects.count(), 0)
+        rows = rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(rows, rollup_rows())
@@ -0,0 +1,57 @@
+from django.test import SimpleTestCase, TransactionTestCase
+
+from leaves.loadtest import (
+    DEFAULT_READ_MIX, WRITE_OPERATIONS, LoadTest, cleanup, create_users, get_driver, parse_mix, percentile,
+)
+from leaves.models import Leave_Record
+
+
+class ParseMixTests(SimpleTestCase):
+
+    def test_weights(self):
+        self.assertEqual(parse_mix('create=6, approve=3,cancel', WRITE_OPERATIONS), {'create': 6, 'approve': 3, 'cancel': 1})
+
+    def test_unknown_operation_or_empty_mix(self):
+        for value in ('create=1,delete=1', '', 'create=0'):
+            with self.assertRaises(ValueError):
+                parse_mix(value, WRITE_OPERATIONS)
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.5), 3)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.99), 5)
+
+
+class LoadTestRunTests(TransactionTestCase):
+    """
+    Short runs against the in-process WSGI app (threads need committed data).
+
+    The in-memory test database is shared-cache SQLite, which answers
+    concurrent access with "table is locked" instead of waiting, so writers
+    and readers run one thread at a time here.
+    """
+
+    def setUp(self):
+        self.employees, self.admins = create_users(3, 1)
+
+    def test_writers_then_cleanup(self):
+        test = LoadTest(get_driver('wsgi'), self.employees, self.admins, write_mix={'create': 2, 'approve': 1}, seed=1)
+        results = test.run(writers=1, readers=0, duration=60, requests_per_thread=6)
+
+        # Approvals with nothing pending yet are skipped, not sent
+        self.assertEqual(
+            sum(summary['requests'] + summary['skipped'] for summary in results['operations'].values()), 6,
+        )
+        self.assertEqual(results['total']['errors'], 0)
+        self.assertGreater(results['operations']['create']['ok'], 0)
+        self.assertIn('p99_ms', results['operations']['create'])
+        self.assertEqual(Leave_Record.objects.count(), len(test.created))
+
+        self.assertEqual(cleanup(), len(test.created))
+        self.assertFalse(Leave_Record.objects.exists())
+
+    def test_readers(self):
+        test = LoadTest(get_driver('wsgi'), self.employees, self.admins, read_mix=DEFAULT_READ_MIX, seed=1)
+        results = test.run(writers=0, readers=1, duration=60, requests_per_thread=4)
+        self.assertEqual(results['total']['requests'], 4)
+        self.assertEqual(results['total']['ok'], 4)
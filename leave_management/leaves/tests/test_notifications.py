@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from leaves.models import Notification_Outbox
+from leaves.notifications import BaseBackend, dispatch_notifications
+
+from .utils import LeaveTestCase
+
+
+class RecordingBackend(BaseBackend):
+
+    def __init__(self, fail=False, on_send=None):
+        self.fail = fail
+        self.on_send = on_send
+        self.digests = []
+
+    def send_digest(self, recipient, notifications):
+        if self.on_send:
+            self.on_send(notifications)
+        if self.fail:
+            raise RuntimeError('mail server down')
+        self.digests.append((recipient, sorted(n.Event for n in notifications)))
+
+
+@override_settings(NOTIFICATIONS={'MAX_ATTEMPTS': 3, 'CLAIM_TIMEOUT_SECONDS': 60})
+class OutboxTests(LeaveTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+
+    def test_events_are_queued_for_the_right_people(self):
+        submitted = set(Notification_Outbox.objects.filter(Event='SUBMITTED').values_list('Recipient', flat=True))
+        self.assertEqual(submitted, {'manager@example.com', 'admin@example.com'})
+        self.set_status(self.manager_client, self.leave_id, 'APPROVED')
+        approved = list(Notification_Outbox.objects.filter(Event='APPROVED').values_list('Recipient', flat=True))
+        self.assertEqual(approved, ['employee@example.com'])
+
+    def test_one_digest_per_recipient(self):
+        self.set_status(self.employee_client, self.leave_id, 'CANCELLED')
+        backend = RecordingBackend()
+        result = dispatch_notifications(backend=backend)
+        self.assertEqual(result, {'claimed': 4, 'sent': 2, 'failed': 0})
+        self.assertEqual(sorted(backend.digests), [
+            ('admin@example.com', ['CANCELLED', 'SUBMITTED']),
+            ('manager@example.com', ['CANCELLED', 'SUBMITTED']),
+        ])
+        self.assertFalse(Notification_Outbox.objects.exclude(Status='SENT').exists())
+        self.assertEqual(dispatch_notifications(backend=backend)['claimed'], 0)
+
+    def test_failures_back_off_then_give_up(self):
+        backend = RecordingBackend(fail=True)
+        self.assertEqual(dispatch_notifications(backend=backend)['failed'], 2)
+        row = Notification_Outbox.objects.first()
+        self.assertEqual((row.Status, row.Attempts), ('PENDING', 1))
+        self.assertGreater(row.Next_Attempt_At, timezone.now())
+        # Not due yet
+        self.assertEqual(dispatch_notifications(backend=backend)['claimed'], 0)
+        for _ in range(2):
+            Notification_Outbox.objects.update(Next_Attempt_At=timezone.now())
+            dispatch_notifications(backend=backend)
+        self.assertEqual(set(Notification_Outbox.objects.values_list('Status', 'Attempts')), {('FAILED', 3)})
+
+    def test_stale_claims_count_as_attempts(self):
+        long_ago = timezone.now() - timedelta(minutes=5)
+        Notification_Outbox.objects.update(Status='SENDING', Claimed_By='crashed', Claimed_At=long_ago, Attempts=1)
+        backend = RecordingBackend()
+        self.assertEqual(dispatch_notifications(backend=backend)['sent'], 2)
+        self.assertEqual(set(Notification_Outbox.objects.values_list('Status', 'Attempts')), {('SENT', 2)})
+
+        # A digest that keeps crashing its worker is eventually given up
+        Notification_Outbox.objects.update(Status='SENDING', Claimed_By='crashed', Claimed_At=long_ago, Attempts=2)
+        self.assertEqual(dispatch_notifications(backend=backend)['claimed'], 0)
+        self.assertEqual(set(Notification_Outbox.objects.values_list('Status', 'Attempts')), {('FAILED', 3)})
+
+    def test_results_only_touch_rows_still_claimed(self):
+        def reclaimed(notifications):
+            Notification_Outbox.objects.filter(id__in=[n.id for n in notifications]).update(Claimed_By='other')
+
+        dispatch_notifications(backend=RecordingBackend(on_send=reclaimed))
+        self.assertEqual(set(Notification_Outbox.objects.values_list('Status', 'Claimed_By')), {('SENDING', 'other')})
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from leaves.models import Leave_Record
+from leaves.policy import (
+    LeaveFacts, PolicyViolation, check_leave_policy, compile_policies, find_violations, reload_policy,
+)
+
+from .utils import LeaveTestCase, weekday_after
+
+
+POLICIES = [
+    {'name': 'casual-max-2', 'rule': 'max_days', 'days': 2, 'leave_types': ['CASUAL']},
+    {'name': 'earned-notice', 'rule': 'notice', 'days': 14, 'leave_types': ['EARNED']},
+    {'name': 'employee-sick-max', 'rule': 'max_days', 'days': 3, 'roles': ['EMPLOYEE'], 'leave_types': ['SICK']},
+]
+
+
+class CompilePoliciesTests(SimpleTestCase):
+    """Compiling LEAVE_POLICIES and checking single leaves."""
+
+    def test_invalid_definitions_are_refused(self):
+        for definitions in (
+            [{'name': 'x', 'rule': 'unknown'}],
+            [{'name': 'x', 'rule': 'max_days'}],
+            [{'name': 'x', 'rule': 'max_days', 'days': 3, 'unit': 'hours'}],
+            [{'name': 'x', 'rule': 'blackout', 'start': '2026-12-31', 'end': '2026-12-01'}],
+            [{'name': 'x', 'rule': 'notice', 'days': 1}, {'name': 'x', 'rule': 'notice', 'days': 2}],
+        ):
+            with self.subTest(definitions=definitions), self.assertRaises(ImproperlyConfigured):
+                compile_policies(definitions)
+
+    def test_rules_are_dispatched_by_leave_type_and_role(self):
+        policy = compile_policies(POLICIES)
+        self.assertTrue(policy.uses_roles)
+        self.assertEqual([rule.name for rule in policy.rules_for('CASUAL', 'MANAGER')], ['casual-max-2'])
+        self.assertEqual([rule.name for rule in policy.rules_for('SICK', 'EMPLOYEE')], ['employee-sick-max'])
+        self.assertEqual(policy.rules_for('SICK', 'MANAGER'), ())
+
+    def test_violations(self):
+        policy = compile_policies(POLICIES + [
+            {'name': 'freeze', 'rule': 'blackout', 'start': '2026-12-24', 'end': '2026-12-31'},
+            {'name': 'week', 'rule': 'max_days', 'days': 5, 'unit': 'calendar'},
+        ])
+        start = date(2026, 12, 21)
+        facts = LeaveFacts('EARNED', start, start + timedelta(days=6), 5, start - timedelta(days=3))
+        self.assertEqual(
+            [name for name, _ in policy.violations(facts, 'EMPLOYEE')], ['earned-notice', 'freeze', 'week'],
+        )
+        facts = LeaveFacts('CASUAL', date(2026, 11, 2), date(2026, 11, 3), 2, date(2026, 10, 1))
+        self.assertEqual(policy.violations(facts, 'EMPLOYEE'), [])
+
+
+@override_settings(LEAVE_POLICIES=POLICIES)
+class LeavePolicyTests(LeaveTestCase):
+    """Policies applied to submissions and to stored leaves."""
+
+    def setUp(self):
+        super().setUp()
+        reload_policy()
+        self.addCleanup(reload_policy)
+
+    def test_check_leave_policy_uses_the_employee_role(self):
+        end = self.day + timedelta(days=6)
+        with self.assertRaises(PolicyViolation) as raised:
+            check_leave_policy('employee', 'SICK', self.day, end, 5)
+        self.assertEqual([name for name, _ in raised.exception.violations], ['employee-sick-max'])
+        check_leave_policy('manager', 'SICK', self.day, end, 5)
+
+    def test_violating_submission_is_refused(self):
+        # Five calendar days hold at least three working days
+        response = self.submit(
+            self.employee_client, 'employee', self.day, self.day + timedelta(days=4), leave_type='CASUAL',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('At most 2 working day(s)', str(response.json()))
+
+        response = self.submit(self.employee_client, 'employee', weekday_after(3), leave_type='EARNED')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('at least 14 day(s) in advance', str(response.json()))
+
+        self.assertEqual(self.submit(self.employee_client, 'employee', self.day, leave_type='EARNED').status_code, 201)
+
+    def test_find_violations_and_command(self):
+        start = weekday_after(2)
+        late = Leave_Record.objects.create(
+            Employee_Name='employee', Leave_Type='EARNED', Start_Date=start, End_Date=start,
+            No_of_Days=1, Status='PENDING',
+        )
+        Leave_Record.objects.create(
+            Employee_Name='employee', Leave_Type='EARNED', Start_Date=start + timedelta(days=7),
+            End_Date=start + timedelta(days=7), No_of_Days=1, Status='CANCELLED',
+        )
+
+        found = list(find_violations())
+        self.assertEqual([(v['leave_id'], v['rule']) for v in found], [(late.id, 'earned-notice')])
+        self.assertEqual(list(find_violations(rule_names=['casual-max-2'])), [])
+        self.assertEqual(len(list(find_violations(statuses=['PENDING', 'CANCELLED']))), 2)
+
+        out = StringIO()
+        call_command('check_leave_policies', stdout=out)
+        self.assertIn(f'#{late.id} employee: earned-notice', out.getvalue())
+        self.assertIn('earned-notice: 1 violation(s)', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('check_leave_policies', rule=['unknown'], stdout=StringIO())
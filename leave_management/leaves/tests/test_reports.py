@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from leaves.models import Report_Job
+from leaves.reports import build_report, claim_job, purge_expired_reports, run_report_jobs
+
+from .utils import LeaveTestCase
+
+
+class ReportJobTests(LeaveTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(REPORTS={'DIR': self.directory, 'CHUNK_SIZE': 1})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for weeks in range(3):
+            self.submit(self.employee_client, 'employee', self.day + timedelta(weeks=weeks))
+        self.submit(self.admin_client, 'admin', self.day)
+
+    def request_report(self, client, report_format='csv', **filters):
+        return client.post('/leaves/reports/', {'format': report_format, 'filters': filters}, format='json')
+
+    def download(self, client, job_id):
+        response = client.get(f'/leaves/reports/{job_id}/download/')
+        return response, b''.join(response.streaming_content).decode() if response.status_code == 200 else None
+
+    def test_report_lifecycle(self):
+        response = self.request_report(self.employee_client)
+        self.assertEqual(response.status_code, 202, response.content)
+        job_id = response.json()['id']
+        # Identical requests share the job
+        self.assertEqual(self.request_report(self.employee_client).json()['id'], job_id)
+        self.assertEqual(self.download(self.employee_client, job_id)[0].status_code, 409)
+
+        self.assertEqual(run_report_jobs(), {'built': 1, 'failed': 0})
+        progress = self.employee_client.get(f'/leaves/reports/{job_id}/').json()
+        self.assertEqual((progress['status'], progress['rows_done'], progress['percent']), ('DONE', 3, 100.0))
+        response, body = self.download(self.employee_client, job_id)
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual({row['Employee_Name'] for row in rows}, {'employee'})
+        self.assertEqual(len(rows), 3)
+
+        # Other users with another visibility cannot see it
+        self.assertEqual(self.manager_client.get(f'/leaves/reports/{job_id}/').status_code, 404)
+
+        Report_Job.objects.filter(id=job_id).update(Expires_On=timezone.now())
+        self.assertEqual(purge_expired_reports(), 1)
+        self.assertEqual(self.download(self.employee_client, job_id)[0].status_code, 410)
+
+    def test_json_and_filters(self):
+        job_id = self.request_report(self.admin_client, 'json', Employee_Name='admin').json()['id']
+        run_report_jobs()
+        rows = json.loads(self.download(self.admin_client, job_id)[1])
+        self.assertEqual([row['Employee_Name'] for row in rows], ['admin'])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request_report(self.admin_client, 'xml').status_code, 400)
+        self.assertEqual(self.request_report(self.admin_client, nope='1').status_code, 400)
+
+    def test_lost_claim_stops_the_build(self):
+        job_id = self.request_report(self.admin_client).json()['id']
+        job = claim_job()
+        # Reclaimed by another worker after a stall
+        Report_Job.objects.filter(id=job_id).update(Claimed_By='other')
+        self.assertFalse(build_report(job))
+        self.assertEqual(Report_Job.objects.get(id=job_id).Status, 'RUNNING')
+        self.assertFalse(Report_Job.objects.get(id=job_id).File_Name)
+        self.assertEqual(os.listdir(self.directory), [])
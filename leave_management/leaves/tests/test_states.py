@@ -0,0 +1,124 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.models import Leave_Record
+from leaves.services import transition_leave
+
+from .utils import LeaveTestCase
+
+
+class StateMachineTests(LeaveTestCase):
+    """Who may move a leave between statuses, and which moves are allowed."""
+
+    def test_new_leaves_start_pending(self):
+        response = self.submit(
+            self.employee_client, 'employee', self.day, Status='APPROVED', Cancelled_By='someone',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['Status'], 'PENDING')
+        self.assertIsNone(response.json()['Cancelled_By'])
+        self.assertEqual(Leave_Record.objects.get().Status, 'PENDING')
+
+    def test_employee_cannot_approve(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.assertEqual(self.set_status(self.employee_client, leave_id, 'APPROVED').status_code, 403)
+        self.assertEqual(Leave_Record.objects.get(id=leave_id).Status, 'PENDING')
+
+    def test_manager_approves_and_transitions_are_one_way(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        response = self.set_status(self.manager_client, leave_id, 'APPROVED')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['Status'], 'APPROVED')
+        self.assertEqual(self.set_status(self.manager_client, leave_id, 'REJECTED').status_code, 409)
+        # The employee may still cancel an approved leave
+        self.assertEqual(self.set_status(self.employee_client, leave_id, 'CANCELLED').status_code, 200)
+        self.assertEqual(self.set_status(self.manager_client, leave_id, 'APPROVED').status_code, 409)
+
+    def test_reviewers_cannot_approve_their_own_leave(self):
+        leave_id = self.submit(self.manager_client, 'manager', self.day).json()['id']
+        self.assertEqual(self.set_status(self.manager_client, leave_id, 'APPROVED').status_code, 403)
+        response = self.manager_client.post(
+            '/leaves/leaves/bulk-transition/', {'ids': [leave_id], 'Status': 'APPROVED'}, format='json',
+        )
+        self.assertEqual(response.json()['updated'], 0)
+        self.assertEqual(self.set_status(self.admin_client, leave_id, 'APPROVED').status_code, 200)
+
+    def test_employees_only_edit_pending_leaves(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        url = f'/leaves/leaves/{leave_id}/'
+        self.assertEqual(self.employee_client.patch(url, {'Leave_Type': 'CASUAL'}, format='json').status_code, 200)
+        self.assertEqual(self.employee_client.patch(url, {'Employee_Name': 'manager'}, format='json').status_code, 400)
+        self.set_status(self.manager_client, leave_id, 'APPROVED')
+        self.assertEqual(self.employee_client.patch(url, {'Leave_Type': 'EARNED'}, format='json').status_code, 400)
+        self.assertEqual(Leave_Record.objects.get(id=leave_id).Leave_Type, 'CASUAL')
+
+    def test_reviewers_only_edit_their_own_leaves_while_pending(self):
+        leave_id = self.submit(self.manager_client, 'manager', self.day).json()['id']
+        url = f'/leaves/leaves/{leave_id}/'
+        self.set_status(self.admin_client, leave_id, 'APPROVED')
+        response = self.manager_client.patch(url, {'Leave_Type': 'EARNED'}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(Leave_Record.objects.get(id=leave_id).Leave_Type, 'SICK')
+        # Their reports' approved leaves stay editable
+        other_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.set_status(self.manager_client, other_id, 'APPROVED')
+        response = self.manager_client.patch(f'/leaves/leaves/{other_id}/', {'Leave_Type': 'CASUAL'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_edit_writes_only_the_changed_columns(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        before = Leave_Record.objects.get(id=leave_id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.employee_client.patch(
+                f'/leaves/leaves/{leave_id}/', {'Leave_Type': 'CASUAL', 'End_Date': self.day.isoformat()}, format='json',
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "leaves_leave_record"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"Leave_Type"', updates[0])
+        self.assertNotIn('"End_Date"', updates[0])
+        leave = Leave_Record.objects.get(id=leave_id)
+        self.assertEqual(leave.Leave_Type, 'CASUAL')
+        self.assertGreater(leave.Change_Seq, before.Change_Seq)
+
+    def test_transition_is_one_update_without_reading_back(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        leave = Leave_Record.objects.get(id=leave_id)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(transition_leave(leave, 'CANCELLED', actor='employee'))
+        leave_queries = [q['sql'] for q in queries if '"leaves_leave_record"' in q['sql']]
+        self.assertEqual(len([sql for sql in leave_queries if sql.startswith('UPDATE')]), 1)
+        self.assertEqual(len([sql for sql in leave_queries if sql.startswith('SELECT')]), 1)
+        stored = Leave_Record.objects.get(id=leave_id)
+        self.assertEqual(
+            (leave.Status, leave.Change_Seq, leave.Updated_On, leave.Cancelled_By),
+            (stored.Status, stored.Change_Seq, stored.Updated_On, stored.Cancelled_By),
+        )
+        # The source status comes from the row, so a second cancel loses
+        self.assertFalse(transition_leave(leave, 'CANCELLED', actor='employee'))
+        self.assertEqual(leave.Status, 'CANCELLED')
+
+    def test_htmx_edit_refuses_impossible_dates(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        self.client.force_login(self.employee)
+        response = self.client.post(
+            f'/htmx/my-leaves/{leave_id}/update/',
+            json.dumps({'Leave_Type': 'SICK', 'Start_Date': '2031-02-30', 'End_Date': '2031-03-01'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Invalid date format')
+
+    def test_bulk_transition_validates_ids(self):
+        leave_id = self.submit(self.employee_client, 'employee', self.day).json()['id']
+        for ids in ('abc', [], ['x'], None, list(range(1, 1002))):
+            response = self.manager_client.post(
+                '/leaves/leaves/bulk-transition/', {'ids': ids, 'Status': 'APPROVED'}, format='json',
+            )
+            self.assertEqual(response.status_code, 400, ids)
+        response = self.manager_client.post(
+            '/leaves/leaves/bulk-transition/', {'ids': [leave_id, 999999], 'Status': 'APPROVED'}, format='json',
+        )
+        self.assertEqual(response.json(), {'requested': 2, 'updated': 1})
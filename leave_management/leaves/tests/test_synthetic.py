@@ -0,0 +1,87 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from authentication.models import CustomUser
+from leaves.models import Leave_Record
+from leaves.synthetic import generate_leaves, generate_users
+from leaves.workdays import working_days
+
+
+FIRST_DAY, LAST_DAY, TODAY = date(2029, 1, 1), date(2030, 12, 31), date(2030, 3, 1)
+
+
+# The generator hashes one password per call; keep that cheap here
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SyntheticDataTests(TestCase):
+    """Generated users and leaves are realistic, consistent and repeatable."""
+
+    def generate(self, prefix, seed=7):
+        employees = generate_users(40, prefix=prefix, seed=seed, batch_size=16)
+        written = generate_leaves(employees, 300, FIRST_DAY, LAST_DAY, today=TODAY, seed=seed, batch_size=64)
+        leaves = Leave_Record.objects.filter(Employee_Name__startswith=f'{prefix}-').order_by('id')
+        return employees, written, leaves
+
+    def test_organisation(self):
+        employees, _, _ = self.generate('org')
+        users = CustomUser.objects.filter(username__startswith='org-')
+        self.assertEqual(users.count(), 40)
+        self.assertEqual(users.filter(role='ADMIN').count(), 1)
+        self.assertEqual(users.filter(role='MANAGER').count(), 4)
+        self.assertEqual(len(employees), 39)
+        # Every employee reports to the manager leading their team
+        for user in users.filter(role='EMPLOYEE').select_related('manager'):
+            self.assertEqual(user.manager.team_id, user.team_id)
+        # One shared hash, still a usable password
+        self.assertEqual(users.values('password').distinct().count(), 1)
+        self.assertTrue(users.first().check_password('password'))
+
+    def test_leaves(self):
+        _, written, leaves = self.generate('gen')
+        self.assertEqual(written, 300)
+        self.assertEqual(leaves.count(), 300)
+        self.assertEqual(leaves.values('Change_Seq').distinct().count(), 1)
+
+        active = {}
+        for leave in leaves:
+            self.assertTrue(FIRST_DAY <= leave.Start_Date <= leave.End_Date <= LAST_DAY)
+            self.assertEqual(leave.No_of_Days, working_days(leave.Start_Date, leave.End_Date))
+            self.assertLessEqual(leave.Applied_On.date(), min(leave.Start_Date, TODAY))
+            if leave.Start_Date > TODAY:
+                self.assertIn(leave.Status, ('PENDING', 'APPROVED', 'REJECTED', 'CANCELLED'))
+            else:
+                self.assertNotEqual(leave.Status, 'PENDING')
+            self.assertEqual(leave.Status == 'CANCELLED', leave.Cancelled_On is not None)
+            if leave.Status in ('PENDING', 'APPROVED'):
+                active.setdefault(leave.Employee_Name, []).append((leave.Start_Date, leave.End_Date))
+        # No employee has two active leaves on one day
+        for spans in active.values():
+            spans.sort()
+            for (_, end), (start, _) in zip(spans, spans[1:]):
+                self.assertLess(end, start)
+
+    def test_same_seed_same_rows(self):
+        columns = ('Leave_Type', 'Start_Date', 'End_Date', 'Status', 'Applied_On', 'No_of_Days')
+
+        def shape(leaves):
+            return [(name.split('-')[1], *row) for name, *row in leaves.values_list('Employee_Name', *columns)]
+
+        _, _, first = self.generate('one')
+        _, _, second = self.generate('two')
+        _, _, other = self.generate('three', seed=8)
+        self.assertEqual(shape(first), shape(second))
+        self.assertNotEqual(shape(first), shape(other))
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            'generate_data', users=20, leaves=50, prefix='cmd', first_day='2029-01-01', last_day='2029-12-31',
+            today='2029-06-01', skip_derived=True, stdout=out,
+        )
+        self.assertIn('Created 50 leave(s)', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('generate_data', users=20, leaves=5, prefix='cmd', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('generate_data', prefix='other', first_day='2029-02-01', last_day='2029-01-31', stdout=StringIO())
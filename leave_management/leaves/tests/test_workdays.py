@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from leaves.models import Holiday, Leave_Record
+from leaves.rollups import rebuild_rollups
+from leaves.workdays import BusinessCalendar, count_working_days, working_days
+
+from .utils import LeaveTestCase, rollup_rows
+
+
+class BusinessCalendarTests(SimpleTestCase):
+
+    def setUp(self):
+        self.holidays = {date(2025, 1, 1), date(2025, 12, 25), date(2026, 1, 3)}
+        self.calendar = BusinessCalendar(self.holidays, 2025, 2026)
+
+    def naive(self, start, end):
+        days = (start + timedelta(days=n) for n in range((end - start).days + 1))
+        return sum(1 for day in days if day.weekday() < 5 and day not in self.holidays)
+
+    def test_counts_match_a_day_by_day_loop(self):
+        pairs = [
+            (date(2025, 1, 1), date(2025, 1, 1)),
+            (date(2025, 1, 4), date(2025, 1, 5)),
+            (date(2025, 12, 20), date(2026, 1, 10)),
+            (date(2025, 1, 1), date(2026, 12, 31)),
+            (date(2025, 3, 10), date(2025, 3, 7)),
+        ]
+        for start, end in pairs:
+            self.assertEqual(self.calendar.count(start, end), self.naive(start, end) if end >= start else 0)
+        starts, ends = zip(*pairs)
+        self.assertEqual(
+            self.calendar.count_many(starts, ends).tolist(),
+            [self.calendar.count(start, end) for start, end in pairs],
+        )
+
+
+class WorkingDayTests(LeaveTestCase):
+
+    def test_count_working_days(self):
+        Holiday.objects.create(Date=date(2025, 3, 5), Name='Midweek')
+        counts = count_working_days([
+            ('week', date(2025, 3, 3), date(2025, 3, 9)),
+            ('weekend', '2025-03-08', '2025-03-09'),
+        ])
+        self.assertEqual(counts, {'week': 4, 'weekend': 0})
+        self.assertEqual(count_working_days([]), {})
+
+    def test_dates_outside_the_supported_years_are_refused(self):
+        response = self.submit(self.employee_client, 'employee', date(9999, 1, 4))
+        self.assertEqual(response.status_code, 400)
+
+
+class HolidayUpkeepTests(LeaveTestCase):
+    """Every kind of Holiday write keeps day counts and rollups correct."""
+
+    def setUp(self):
+        super().setUp()
+        # Monday to Friday
+        self.start = date(2025, 3, 3)
+        self.leave = Leave_Record.objects.create(
+            Employee_Name='employee', Leave_Type='SICK', Status='APPROVED',
+            Start_Date=self.start, End_Date=self.start + timedelta(days=4),
+        )
+        rebuild_rollups()
+
+    def assertInStep(self, days):
+        self.assertEqual(Leave_Record.objects.get(id=self.leave.id).No_of_Days, days)
+        self.assertEqual(working_days(self.start, self.start + timedelta(days=4)), days)
+        incremental = rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(incremental, rollup_rows())
+
+    def test_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday = Holiday.objects.create(Date=self.start, Name='One')
+        self.assertInStep(4)
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday.delete()
+        self.assertInStep(5)
+
+    def test_queryset_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Holiday.objects.bulk_create([
+                Holiday(Date=self.start, Name='One'),
+                Holiday(Date=self.start + timedelta(days=1), Name='Two'),
+            ])
+        self.assertInStep(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Holiday.objects.bulk_create([Holiday(Date=self.start, Name='Again')], ignore_conflicts=True)
+        self.assertInStep(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Moved to a Saturday
+            Holiday.objects.filter(Name='Two').update(Date=self.start + timedelta(days=5))
+        self.assertInStep(4)
+        with self.captureOnCommitCallbacks(execute=True):
+            # What the admin's "Delete selected" action does
+            Holiday.objects.all().delete()
+        self.assertInStep(5)
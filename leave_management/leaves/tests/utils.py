@@ -0,0 +1,77 @@
+"""Helpers shared by the leave test modules."""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import CustomUser
+from leaves.models import Monthly_Employee_Rollup, Monthly_Leave_Rollup
+
+
+def make_user(username, role='EMPLOYEE', manager=None, team=None, **extra):
+    # No password: tests authenticate with force_authenticate / force_login
+    return CustomUser.objects.create_user(
+        username=username, email=f'{username}@example.com', password=None,
+        role=role, manager=manager, team=team, **extra,
+    )
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def weekday_after(days):
+    """The first Monday-to-Friday date at least ``days`` days from today."""
+    day = date.today() + timedelta(days=days)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def leave_body(employee, start, end=None, leave_type='SICK', **extra):
+    return {
+        'Employee_Name': employee,
+        'Leave_Type': leave_type,
+        'Start_Date': start.isoformat(),
+        'End_Date': (end or start).isoformat(),
+        **extra,
+    }
+
+
+def rollup_rows():
+    """Non-empty rollup rows, to compare incremental upkeep with rebuild_rollups()."""
+    return (
+        sorted(
+            row for row in Monthly_Leave_Rollup.objects.values_list(
+                'Month', 'Leave_Type', 'Status', 'Leave_Count', 'Leave_Days',
+            ) if row[3] or row[4]
+        ),
+        sorted(
+            row for row in Monthly_Employee_Rollup.objects.values_list(
+                'Month', 'Employee_Name', 'Status', 'Leave_Count', 'Leave_Days',
+            ) if row[3] or row[4]
+        ),
+    )
+
+
+class LeaveTestCase(TestCase):
+    """An admin, a manager and the manager's report, with API clients."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = make_user('admin', role='ADMIN')
+        self.manager = make_user('manager', role='MANAGER', manager=self.admin)
+        self.employee = make_user('employee', manager=self.manager)
+        self.admin_client = client_for(self.admin)
+        self.manager_client = client_for(self.manager)
+        self.employee_client = client_for(self.employee)
+        self.day = weekday_after(30)
+
+    def submit(self, client, employee, start, end=None, **extra):
+        return client.post('/leaves/leaves/', leave_body(employee, start, end, **extra), format='json')
+
+    def set_status(self, client, leave_id, to_status):
+        return client.patch(f'/leaves/leaves/{leave_id}/', {'Status': to_status}, format='json')
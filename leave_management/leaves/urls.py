@@ -1,12 +1,23 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LeaveRecordViewSet  # Import from the main views.py file
+from .views import (  # Import from the main views.py file
+    LeaveRecordViewSet, CalendarFeedsView, CoalescingMetricsView, LeaveAnalyticsView, LeaveAuditView,
+    ReportDownloadView, ReportJobView, ReportJobsView, calendar_feed,
+)
 
 # Create a router and register the ViewSet
 router = DefaultRouter()
 router.register(r'leaves', LeaveRecordViewSet, basename='leave')
 
 urlpatterns = [
+    path('analytics/', LeaveAnalyticsView.as_view(), name='leave_analytics'),
+    path('reports/', ReportJobsView.as_view(), name='leave_reports'),
+    path('reports/<int:job_id>/', ReportJobView.as_view(), name='leave_report'),
+    path('reports/<int:job_id>/download/', ReportDownloadView.as_view(), name='leave_report_download'),
+    path('audit/', LeaveAuditView.as_view(), name='leave_audit'),
+    path('metrics/coalescing/', CoalescingMetricsView.as_view(), name='coalescing_metrics'),
+    path('calendar/feeds/', CalendarFeedsView.as_view(), name='leave_calendar_feeds'),
+    path('calendar/<str:token>.ics', calendar_feed, name='leave_calendar_feed'),
     path('', include(router.urls)),
 ]
 
@@ -0,0 +1,67 @@
+"""
+Data version stamps for Leave Management.
+
+Counters that move forward with every write to the data they cover (leave
+records, holidays, reporting lines). Cached views use them in their cache
+keys and ETags, so any write invalidates them without tracking individual
+entries.
+
+The counters are rows of the Data_Version table, bumped inside the
+writing transaction: every process (web workers, management commands,
+the notification worker) sees a new version exactly when the data it
+covers is committed, whatever cache backend is configured.
+"""
+import time
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+
+
+DATA_VERSION_KEY = 'leaves:data-version'
+HOLIDAY_VERSION_KEY = 'leaves:holiday-version'
+HIERARCHY_VERSION_KEY = 'leaves:hierarchy-version'
+
+
+def _versions():
+    from leaves.models import Data_Version
+
+    # Always the primary: a lagging replica would hand out an old version
+    # for data that has already changed
+    return Data_Version.objects.using(router.db_for_write(Data_Version))
+
+
+def _start(key):
+    """Create the counter for ``key`` at the current time in milliseconds."""
+    versions = _versions()
+    try:
+        with transaction.atomic(using=versions.db):
+            versions.create(Key=key, Version=int(time.time() * 1000))
+    except IntegrityError:
+        # Created concurrently
+        pass
+
+
+def get_data_version(key=DATA_VERSION_KEY):
+    """
+    Return the current version for ``key`` (leave records by default).
+
+    A missing counter (e.g. a flushed database) restarts from the current
+    time in milliseconds, so it never repeats a version that may still be
+    in a cache key.
+    """
+    version = _versions().filter(Key=key).values_list('Version', flat=True).first()
+    if version is None:
+        _start(key)
+        version = _versions().filter(Key=key).values_list('Version', flat=True).first()
+    return version
+
+
+def bump_data_version(key=DATA_VERSION_KEY):
+    """
+    Advance the version for ``key`` in the current transaction.
+
+    The new version commits (and becomes visible) together with the write
+    it covers, so a reader can never cache pre-commit data under it.
+    """
+    if not _versions().filter(Key=key).update(Version=F('Version') + 1):
+        _start(key)
@@ -1,7 +1,91 @@
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, permissions, filters
-from .models import Leave_Record
-from .serializers import LeaveRecordSerializer
+import os
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import condition, require_GET
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from authentication.hierarchy import can_see_employee, scope_key, scope_leaves, sees_everyone, team_usernames
+from leave_management.db import replica_reads
+from leave_management.singleflight import metrics as coalescing_metrics
+from .archive import merge_records, reaches_archive
+from .changes import DEFAULT_LIMIT as CHANGES_LIMIT, ResyncRequired, changes_since
+from .audit import (
+    audit_events, audited_atomic, leave_values, record_created, record_deleted, record_updated,
+)
+from .conflicts import ACTIVE_STATUSES, LeaveConflict, check_leave_conflicts
+from .calendar import (
+    feed_etag, feed_owner, get_cached_feed, iter_cached_feed, make_feed_token,
+)
+from .filters import CachedDjangoFilterBackend
+from .idempotency import idempotent
+from .leave_cache import get_leave
+from .models import Leave_Record, Archived_Leave_Record, Report_Job
+from .serializers import BulkTransitionSerializer, LeaveRecordSerializer
+from .notifications import enqueue_leave_event
+from .policy import check_leave_policy
+from .reports import CONTENT_TYPES as REPORT_CONTENT_TYPES, ReportError, job_progress, report_path, submit_report
+from .rollups import leave_analytics, snapshot
+from .services import TRANSITIONS, leave_changed, transition_leave, transition_leaves
+from .workdays import check_supported, working_days
+
+
+class TransitionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Leave status changed by another request.'
+    default_code = 'transition_conflict'
+
+
+class LeavePagination(LimitOffsetPagination):
+    """
+    Opt-in paging for the leave list: ?limit=&offset= (no limit, no paging).
+    """
+    max_limit = 1000
+
+    def paginate_merged(self, querysets, ordering, request):
+        """
+        One page of several querysets sorted the same way (hot and
+        archived leaves), reading at most offset + limit rows from each.
+
+        Returns:
+            list: The page, or None if the request is not paginated
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count = sum(queryset.count() for queryset in querysets)
+        end = self.offset + self.limit
+        return list(islice(merge_records([queryset[:end] for queryset in querysets], ordering), self.offset, end))
+
+
+def _check_leave(employee, leave_type, start, end, exclude_id=None, applied_on=None):
+    """Run the policy, overlap and staffing checks, answering 400 on a conflict."""
+    try:
+        check_leave_policy(employee, leave_type, start, end, working_days(start, end), applied_on=applied_on)
+        check_leave_conflicts(employee, start, end, exclude_id=exclude_id)
+    except LeaveConflict as e:
+        raise ValidationError({'non_field_errors': [str(e)]})
+
+
+def _can_review(user):
+    """Approving/rejecting is reserved for admins and managers."""
+    return user.is_superuser or getattr(user, 'role', None) in ['ADMIN', 'MANAGER']
+
+
+def _reviews_own_leave(user, employee):
+    """Reviewers cannot approve or reject their own leaves (superusers excepted)."""
+    return not user.is_superuser and employee == user.username
 
 class LeaveRecordViewSet(viewsets.ModelViewSet):
     """
@@ -21,18 +105,30 @@ class LeaveRecordViewSet(viewsets.ModelViewSet):
     - Status
     - Start_Date
     - End_Date
+    - Team (id), Team__department
 
     Search available by:
     - Employee_Name
+
+    Status changes (PATCH with Status, or POST /leaves/bulk-transition/)
+    go through leaves.services, one conditional UPDATE per change.
+
+    Create, update and bulk-transition accept an Idempotency-Key header;
+    retries with the same key replay the first response (leaves.idempotency).
+
+    GET /leaves/changes/?since=<token> returns only what changed since a
+    previous sync (leaves.changes).
     """
     queryset = Leave_Record.objects.all().order_by('-Start_Date')
+    archive_model = Archived_Leave_Record
     serializer_class = LeaveRecordSerializer
+    pagination_class = LeavePagination
 
     # Permissions: Allow read-only for anyone, write for authenticated users
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     # Filtering and search
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [CachedDjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
 
     # Fields to filter on
     filterset_fields = {
@@ -41,6 +137,8 @@ class LeaveRecordViewSet(viewsets.ModelViewSet):
         'Status': ['exact'],
         'Start_Date': ['exact', 'gte', 'lte'],
         'End_Date': ['exact', 'gte', 'lte'],
+        'Team': ['exact'],
+        'Team__department': ['exact'],
     }
 
     # Fields to search on
@@ -50,38 +148,490 @@ class LeaveRecordViewSet(viewsets.ModelViewSet):
     ordering_fields = ['Start_Date', 'End_Date', 'Employee_Name']
     ordering = ['-Start_Date']  # Default ordering
 
+    def list(self, request, *args, **kwargs):
+        """
+        List endpoint is read-only, so serve it from the replica.
+
+        When a date filter reaches back past the archive horizon, archived
+        leaves matching the same filters are merged into the results. Both
+        tables are read in the requested order (id breaking ties) and
+        merged as they stream, so a page (?limit=&offset=) reads at most
+        offset + limit rows from each.
+        """
+        with replica_reads():
+            if not reaches_archive(request.query_params):
+                return super().list(request, *args, **kwargs)
+
+            queryset = self.filter_queryset(self.get_queryset())
+            ordering = list(filters.OrderingFilter().get_ordering(request, queryset, self) or []) + ['-id']
+            sources = [
+                queryset.order_by(*ordering),
+                self.filter_queryset(self.get_archive_queryset()).order_by(*ordering),
+            ]
+
+            page = self.paginator.paginate_merged(sources, ordering, request)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+            records = merge_records([source.iterator(chunk_size=2000) for source in sources], ordering)
+            serializer = self.get_serializer(records, many=True)
+            return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the leave from the single-leave cache (no query while it is
+        current); fall back to the archive for leaves that have been moved
+        there.
+        """
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        try:
+            leave = get_leave(kwargs[lookup])
+        except ValueError:
+            raise Http404
+        except Leave_Record.DoesNotExist:
+            leave = None
+        if leave is not None and request.user.is_authenticated and can_see_employee(request.user, leave.Employee_Name):
+            self.check_object_permissions(request, leave)
+            return Response(self.get_serializer(leave).data)
+        leave = get_object_or_404(self.get_archive_queryset(), pk=kwargs[lookup])
+        return Response(self.get_serializer(leave).data)
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """
         Automatically assign leave record to logged-in user.
         Regular employees: Employee_Name set to their username
         Admin users: Can specify any Employee_Name
+
+        New leaves always start PENDING: a Status (or cancellation) sent
+        with the request is ignored, approval goes through perform_update.
+        """
+        # Leave, its audit event and its notifications commit together
+        with audited_atomic():
+            # If user is authenticated and is NOT admin
+            if self.request.user.is_authenticated and not (self.request.user.is_staff or self.request.user.is_superuser):
+                # Force Employee_Name to be the logged-in user's username
+                employee = self.request.user.username
+            else:
+                # Admin can specify any Employee_Name, or save as-is
+                employee = serializer.validated_data['Employee_Name']
+            data = serializer.validated_data
+            _check_leave(employee, data['Leave_Type'], data['Start_Date'], data['End_Date'])
+            leave = serializer.save(Employee_Name=employee, Status='PENDING', Cancelled_By=None, Cancelled_On=None)
+            leave_changed(None, leave)
+            record_created(leave, actor=getattr(self.request.user, 'username', None))
+            enqueue_leave_event(leave, 'SUBMITTED', actor=getattr(self.request.user, 'username', None))
+
+    def perform_destroy(self, instance):
+        with audited_atomic():
+            leave_id = instance.id
+            before = snapshot(instance)
+            old_values = leave_values(instance)
+            instance.delete()
+            leave_changed(before, None, leave_id=leave_id)
+            record_deleted(leave_id, old_values, actor=self.request.user.username)
+
+    def perform_update(self, serializer):
+        """
+        Apply a Status change through the state machine and save any other
+        changed fields, in one transaction.
+
+        The leave is re-read (and locked) inside the transaction and the
+        policy, overlap and staffing checks run before anything is
+        written, so a refused edit or a lost race (409 Conflict) leaves
+        the leave exactly as it was.
+
+        Employees may only edit leaves while they are PENDING (as on the
+        HTMX edit form), and cannot hand a leave to someone else. The same
+        PENDING-only rule applies to a reviewer editing their own leave.
         """
-        # If user is authenticated and is NOT admin
-        if self.request.user.is_authenticated and not (self.request.user.is_staff or self.request.user.is_superuser):
-            # Force Employee_Name to be the logged-in user's username
-            serializer.save(Employee_Name=self.request.user.username)
-        else:
-            # Admin can specify any Employee_Name, or save as-is
-            serializer.save()
+        leave = serializer.instance
+        new_status = serializer.validated_data.pop('Status', None)
+        data = serializer.validated_data
+
+        with audited_atomic():
+            # Decide on the current row, not the one read before the transaction
+            leave.refresh_from_db(from_queryset=Leave_Record.objects.select_for_update())
+            if new_status == leave.Status:
+                new_status = None
+            reviewer = _can_review(self.request.user)
+            if data and (not reviewer or _reviews_own_leave(self.request.user, leave.Employee_Name)):
+                if leave.Status != 'PENDING':
+                    raise ValidationError({'non_field_errors': ['Only PENDING leaves can be edited']})
+            if data and not reviewer:
+                if not self.request.user.is_staff and data.get('Employee_Name', leave.Employee_Name) != leave.Employee_Name:
+                    raise ValidationError({'Employee_Name': ['You cannot move a leave to another employee']})
+            if new_status:
+                if new_status in ('APPROVED', 'REJECTED') and not _can_review(self.request.user):
+                    raise PermissionDenied('Only admins and managers can approve or reject leaves')
+                if new_status in ('APPROVED', 'REJECTED') and _reviews_own_leave(self.request.user, leave.Employee_Name):
+                    raise PermissionDenied('You cannot approve or reject your own leave')
+                if new_status not in TRANSITIONS:
+                    raise TransitionConflict(f'Cannot move a leave to status: {new_status}')
+
+            if (new_status or leave.Status) in ACTIVE_STATUSES and {'Employee_Name', 'Leave_Type', 'Start_Date', 'End_Date'} & set(data):
+                _check_leave(
+                    data.get('Employee_Name', leave.Employee_Name),
+                    data.get('Leave_Type', leave.Leave_Type),
+                    data.get('Start_Date', leave.Start_Date),
+                    data.get('End_Date', leave.End_Date),
+                    exclude_id=leave.id,
+                    applied_on=leave.Applied_On,
+                )
+
+            if new_status and not transition_leave(leave, new_status, actor=self.request.user.username):
+                raise TransitionConflict(f'Cannot move leave from {leave.Status} to {new_status}')
+
+            # Only write the columns whose values actually change
+            changed = {name: value for name, value in data.items() if getattr(leave, name) != value}
+            if changed:
+                before = snapshot(leave)
+                old_values = leave_values(leave)
+                for name, value in changed.items():
+                    setattr(leave, name, value)
+                leave.save(update_fields=list(changed))
+                record_updated(leave, old_values, leave_values(leave), actor=self.request.user.username)
+                leave_changed(before, leave)
+
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    @idempotent
+    def bulk_transition(self, request):
+        """
+        POST /leaves/bulk-transition/
+        Body: {"ids": [1, 2, 3], "Status": "APPROVED"}
+        Transitions all eligible leaves in a single UPDATE.
+        ``ids`` must be a non-empty list of at most 1000 leave ids.
+        """
+        new_status = request.data.get('Status')
+
+        if new_status not in TRANSITIONS:
+            return Response({
+                'error': f'Status must be one of {", ".join(TRANSITIONS)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if new_status in ('APPROVED', 'REJECTED') and not _can_review(request.user):
+            raise PermissionDenied('Only admins and managers can approve or reject leaves')
+
+        body = BulkTransitionSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        ids = body.validated_data['ids']
+
+        # Restrict to leaves the caller can see (and may review)
+        visible = self.get_queryset().filter(id__in=ids)
+        if new_status in ('APPROVED', 'REJECTED') and not request.user.is_superuser:
+            visible = visible.exclude(Employee_Name=request.user.username)
+        visible_ids = visible.values_list('id', flat=True)
+        updated = transition_leaves(visible_ids, new_status, actor=request.user.username)
+        return Response({'requested': len(ids), 'updated': updated})
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def changes(self, request):
+        """
+        GET /leaves/changes/?since=<token>&limit=500
+        Leaves changed and deleted since ``since`` (omit it for a first sync)
+
+        Pages are in change order; keep requesting with ``next`` while
+        ``has_more`` is true, then store ``next`` for the following sync.
+        Answers 410 Gone when the client has to sync from the start again.
+        """
+        try:
+            limit = int(request.query_params.get('limit', CHANGES_LIMIT))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with replica_reads():
+            try:
+                page = changes_since(request.user, request.query_params.get('since') or None, limit=limit)
+            except ResyncRequired as e:
+                return Response({'error': str(e), 'resync': True}, status=status.HTTP_410_GONE)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            page['changed'] = self.get_serializer(page['changed'], many=True).data
+        return Response(page)
 
     def get_queryset(self):
         """
         Return leaves based on user role:
         - Admin users → All leave records
+        - Managers → Their own and their reports' leave records
         - Regular users → Only their own leave records
         """
-        queryset = super().get_queryset()
-        if not self.request.user.is_authenticated:
+        return self.scope_queryset(super().get_queryset())
+
+    def get_archive_queryset(self):
+        """Archived leaves, with the same visibility rules as get_queryset."""
+        return self.scope_queryset(self.archive_model.objects.all())
+
+    def scope_queryset(self, queryset):
+        """
+        Restrict a hot or archive queryset to what the user may see:
+        admins everything, managers their reporting line (via the closure
+        table), everyone else their own leaves, anonymous users nothing.
+        """
+        return scope_leaves(queryset, self.request.user)
+
+
+class CalendarFeedsView(APIView):
+    """
+    GET /leaves/calendar/feeds/
+    Return the calendar subscription URLs for the current user
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        feeds = {
+            'my_leaves': request.build_absolute_uri(
+                reverse('leave_calendar_feed', args=[make_feed_token('user', user)])
+            ),
+        }
+        if _can_review(user):
+            feeds['team'] = request.build_absolute_uri(
+                reverse('leave_calendar_feed', args=[make_feed_token('team', user)])
+            )
+        return Response({'feeds': feeds})
+
+
+def _calendar_feed_owner(request, token):
+    """feed_owner(token), looked up once per request (ETag, then body)."""
+    if not hasattr(request, '_calendar_feed_owner'):
+        request._calendar_feed_owner = feed_owner(token)
+    return request._calendar_feed_owner
+
+
+def _calendar_feed_etag(request, token):
+    owner = _calendar_feed_owner(request, token)
+    return feed_etag(*owner) if owner else None
+
+
+@require_GET
+@condition(etag_func=_calendar_feed_etag)
+def calendar_feed(request, token):
+    """
+    GET /leaves/calendar/<token>.ics
+    iCalendar feed of APPROVED leaves, addressed by a signed token.
+
+    The token's user must still be active. Unchanged feeds then answer
+    304 from the ETag; otherwise the cached body is served, or the feed is
+    streamed from the database.
+    """
+    owner = _calendar_feed_owner(request, token)
+    if not owner:
+        raise Http404('Unknown calendar feed')
+    kind, user = owner
+
+    cached = get_cached_feed(kind, user)
+    if cached is not None:
+        return HttpResponse(cached, content_type='text/calendar; charset=utf-8')
+
+    name = f'Leaves - {user.username}' if kind == 'user' else 'Team Leaves'
+    return StreamingHttpResponse(
+        iter_cached_feed(kind, user, name),
+        content_type='text/calendar; charset=utf-8',
+    )
+
+
+class LeaveAnalyticsView(APIView):
+    """
+    GET /leaves/analytics/?from=2026-01&to=2026-06&top=10
+    Monthly leave trends, top absentees and approval rates (admins and managers)
+
+    Served from the monthly rollup tables; only the current month is
+    aggregated live. Defaults to the last 12 months.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not _can_review(request.user):
+            raise PermissionDenied('Only admins and managers can view analytics')
+
+        today = timezone.localdate()
+        last_month = _parse_month(request.query_params.get('to')) or today
+        first_month = _parse_month(request.query_params.get('from'))
+        if first_month is None:
+            first_month = (last_month.replace(day=1) - timedelta(days=335)).replace(day=1)
+        if first_month > last_month:
+            return Response({'error': 'from must not be after to'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            check_supported(first_month, last_month)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            top = min(int(request.query_params.get('top', 10)), 100)
+        except ValueError:
+            top = 10
+
+        # Managers only see their reporting line
+        employees = None if sees_everyone(request.user) else team_usernames(request.user)
+        with replica_reads():
+            return Response(leave_analytics(first_month, last_month, top=top, employees=employees))
+
+
+class CoalescingMetricsView(APIView):
+    """
+    GET /leaves/metrics/coalescing/
+    Single-flight counters of this worker process (admins and managers)
+
+    For each coalesced endpoint: requests that computed a result (leaders),
+    requests that shared one (coalesced), and fallbacks after a failed or
+    slow leader (errors, timeouts).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not _can_review(request.user):
+            raise PermissionDenied('Only admins and managers can view metrics')
+
+        return Response({'pid': os.getpid(), **coalescing_metrics()})
+
+
+class LeaveAuditView(APIView):
+    """
+    GET /leaves/audit/?leave=12&actor=alice&from=2026-01-01&to=2026-02-01&limit=100&before_id=
+    Audit events of leave changes, newest first (admins and managers)
+
+    Managers only see events of their team's leaves. Pages are keyed on
+    the event id: pass the last id of a page as ``before_id`` for the next.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if not _can_review(user):
+            raise PermissionDenied('Only admins and managers can view the audit log')
+
+        params = request.query_params
+        try:
+            leave_id = int(params['leave']) if params.get('leave') else None
+            before_id = int(params['before_id']) if params.get('before_id') else None
+            limit = min(int(params.get('limit', 100)), 1000)
+        except ValueError:
+            return Response({'error': 'leave, before_id and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = _parse_moment(params.get('from'))
+        until = _parse_moment(params.get('to'))
+        if (params.get('from') and since is None) or (params.get('to') and until is None):
+            return Response({'error': 'from and to must be dates or datetimes'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with replica_reads():
+            events = audit_events(
+                leave_id=leave_id, actor=params.get('actor') or None, since=since, until=until,
+                employees=None if sees_everyone(user) else team_usernames(user),
+            )
+            if before_id is not None:
+                events = events.filter(id__lt=before_id)
+            rows = list(events.values(
+                'id', 'Leave_Id', 'Employee_Name', 'Action', 'Actor', 'Old_Values', 'New_Values', 'Occurred_On',
+            )[:limit + 1])
+
+        return Response({
+            'results': rows[:limit],
+            'next_before_id': rows[limit - 1]['id'] if len(rows) > limit else None,
+        })
+
+
+class ReportJobsView(APIView):
+    """
+    POST /leaves/reports/
+    Body: {"format": "csv", "filters": {"Start_Date__gte": "2025-01-01", "Status": "APPROVED"}}
+    Queue a leave report built in the background (see leaves.reports)
+
+    ``filters`` takes the LeaveRecordViewSet filter parameters; the report
+    covers the leaves the caller may see. An identical report (same
+    visibility, filters, format and data version) that is queued, running
+    or still downloadable is returned instead of a new one.
+
+    Poll the returned ``status_url`` for progress, then fetch ``download_url``.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        try:
+            job, created = submit_report(
+                request.user, request.data.get('filters') or {}, request.data.get('format', 'csv'),
+            )
+        except ReportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            _report_response(request, job),
+            status=status.HTTP_200_OK if job.Status == 'DONE' else status.HTTP_202_ACCEPTED,
+        )
+
+
+class ReportJobView(APIView):
+    """
+    GET /leaves/reports/<id>/
+    Progress of a report job; includes ``download_url`` once it is DONE
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        return Response(_report_response(request, _get_report_job(request, job_id)))
+
+
+class ReportDownloadView(APIView):
+    """
+    GET /leaves/reports/<id>/download/
+    The finished report file (409 while it is being built, 410 once expired)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _get_report_job(request, job_id)
+        if job.Status == 'EXPIRED':
+            return Response({'error': 'Report has expired'}, status=status.HTTP_410_GONE)
+        if job.Status != 'DONE':
+            return Response({'error': f'Report is {job.Status}'}, status=status.HTTP_409_CONFLICT)
+
+        return FileResponse(
+            open(report_path(job), 'rb'), as_attachment=True, filename=job.File_Name,
+            content_type=REPORT_CONTENT_TYPES[job.Format],
+        )
+
+
+def _get_report_job(request, job_id):
+    """A report job the user requested or shares the visibility of, else 404."""
+    job = get_object_or_404(Report_Job, id=job_id)
+    if job.Requested_By_id != request.user.pk and job.Scope_Key != scope_key(request.user):
+        raise Http404
+    return job
+
+
+def _report_response(request, job):
+    data = job_progress(job)
+    data['status_url'] = request.build_absolute_uri(reverse('leave_report', args=[job.id]))
+    if job.Status == 'DONE':
+        data['download_url'] = request.build_absolute_uri(reverse('leave_report_download', args=[job.id]))
+    return data
 
-        # Check if user is authenticated
-            # Anonymous users can  nothing
-            return queryset.none()  # Return empty queryset
 
-        # Check if user is admin (has is_staff or is_superuser flag)
-        if  self.request.user.is_superuser:
-            # Admin sees all records
-            return queryset
+def _parse_moment(value):
+    """Parse an ISO datetime, or a date (its midnight), into an aware datetime."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
-        # Regular employee - only see their own leaves
-        return queryset.filter(Employee_Name=self.request.user.username)
 
+def _parse_month(value):
+    """Parse 'YYYY-MM' (or a full date) into the first day of that month."""
+    if not value:
+        return None
+    day = parse_date(value if len(value) > 7 else f'{value}-01')
+    return day.replace(day=1) if day else None
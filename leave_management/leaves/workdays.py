@@ -0,0 +1,219 @@
+"""
+Working-day computation for Leave Management.
+
+A BusinessCalendar holds a precomputed cumulative count of working days
+(weekdays that are not holidays) for a span of whole years, as a NumPy
+array. Counting the working days between two dates is then two array
+lookups instead of a loop over every day, and whole querysets are
+counted with a few vectorized operations.
+
+The calendar is rebuilt when the holiday version changes (any Holiday
+write) and grows on demand when a date falls outside its years, up to
+settings.LEAVE_YEAR_RANGE.
+"""
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+from django.utils.dateparse import parse_date
+
+from leaves.versions import HOLIDAY_VERSION_KEY, get_data_version
+
+
+class BusinessCalendar:
+    """
+    Cumulative working-day lookup over [first_year, last_year].
+
+    ``working[i]`` tells whether the i-th day from Jan 1 of ``first_year``
+    is a working day, ``cumulative[i]`` how many working days there are
+    from Jan 1 of ``first_year`` up to and including it.
+    """
+
+    def __init__(self, holidays, first_year, last_year, weekend_days=(5, 6)):
+        self.holidays = frozenset(holidays)
+        self.weekend_days = frozenset(weekend_days)
+        self.first_year = first_year
+        self.last_year = last_year
+        self.origin = date(first_year, 1, 1).toordinal()
+
+        size = date(last_year, 12, 31).toordinal() + 1 - self.origin
+        weekdays = (date(first_year, 1, 1).weekday() + np.arange(size)) % 7
+        working = ~np.isin(weekdays, list(self.weekend_days))
+        offsets = [
+            day.toordinal() - self.origin for day in self.holidays
+            if first_year <= day.year <= last_year
+        ]
+        working[np.array(offsets, dtype=np.int64)] = False
+        self.working = working
+        self.cumulative = np.cumsum(working, dtype=np.int64)
+
+    def covers(self, day):
+        return self.first_year <= day.year <= self.last_year
+
+    def _upto(self, day):
+        """Working days from the calendar origin through ``day`` (inclusive)."""
+        return int(self.cumulative[day.toordinal() - self.origin])
+
+    def count(self, start, end):
+        """
+        Number of working days from ``start`` to ``end``, both inclusive.
+
+        Returns 0 when ``end`` is before ``start``.
+        """
+        if end < start:
+            return 0
+        before = self._upto(start) - (1 if self.is_working_day(start) else 0)
+        return self._upto(end) - before
+
+    def count_many(self, starts, ends):
+        """
+        Vectorized ``count`` over arrays of start and end dates.
+
+        Args:
+            starts: Sequence of start dates
+            ends: Sequence of end dates, same length
+
+        Returns:
+            numpy.ndarray: Working days per pair (0 where end < start)
+        """
+        origin = np.datetime64(date.fromordinal(self.origin), 'D')
+        first = (np.array(starts, dtype='datetime64[D]') - origin).astype(np.int64)
+        last = (np.array(ends, dtype='datetime64[D]') - origin).astype(np.int64)
+        counts = self.cumulative[last] - self.cumulative[first] + self.working[first]
+        return np.where(last < first, 0, counts)
+
+    def is_working_day(self, day):
+        return day.weekday() not in self.weekend_days and day not in self.holidays
+
+
+_calendar = None
+_calendar_version = None
+
+
+def supported_years():
+    """(first, last) year leaves may fall in, from settings.LEAVE_YEAR_RANGE."""
+    first, last = getattr(settings, 'LEAVE_YEAR_RANGE', (2000, 2100))
+    return first, last
+
+
+def check_supported(*days):
+    """
+    Raise ValueError if any date falls outside the supported years.
+
+    Args:
+        *days: Dates to check (None is ignored)
+    """
+    first, last = supported_years()
+    for day in days:
+        if day is not None and not first <= day.year <= last:
+            raise ValueError(f'Dates must fall between {first} and {last}')
+
+
+def get_calendar(*days):
+    """
+    Return the process-wide calendar, rebuilt if holidays changed or
+    extended so that it covers every date in ``days``.
+
+    Raises:
+        ValueError: If a date falls outside the supported years
+    """
+    global _calendar, _calendar_version
+    from leaves.models import Holiday
+
+    check_supported(*days)
+    version = get_data_version(HOLIDAY_VERSION_KEY)
+    years = [day.year for day in days]
+    if _calendar is not None and _calendar_version == version and all(_calendar.covers(day) for day in days):
+        return _calendar
+
+    today = date.today()
+    min_year, max_year = supported_years()
+    first_year = max(min_year, min(years + [today.year - 1] + ([_calendar.first_year] if _calendar else [])))
+    last_year = min(max_year, max(years + [today.year + 1] + ([_calendar.last_year] if _calendar else [])))
+
+    holidays = Holiday.objects.filter(
+        Date__gte=date(first_year, 1, 1), Date__lte=date(last_year, 12, 31),
+    ).values_list('Date', flat=True)
+
+    _calendar = BusinessCalendar(
+        holidays, first_year, last_year,
+        weekend_days=getattr(settings, 'LEAVE_WEEKEND_DAYS', (5, 6)),
+    )
+    _calendar_version = version
+    return _calendar
+
+
+def _as_date(value):
+    return parse_date(value) if isinstance(value, str) else value
+
+
+def working_days(start, end):
+    """
+    Working days in a leave, both ends inclusive.
+
+    Args:
+        start: Start date (date or 'YYYY-MM-DD')
+        end: End date (date or 'YYYY-MM-DD')
+
+    Returns:
+        int: Number of working days, 0 if either date is missing or invalid
+    """
+    start, end = _as_date(start), _as_date(end)
+    if not start or not end:
+        return 0
+    return get_calendar(start, end).count(start, end)
+
+
+def count_working_days(rows):
+    """
+    Working days for many (key, start, end) rows at once.
+
+    The calendar is resolved once for the whole batch and all rows are
+    counted in one vectorized pass.
+
+    Args:
+        rows: Iterable of (key, start_date, end_date), e.g.
+            ``queryset.values_list('id', 'Start_Date', 'End_Date')``
+
+    Returns:
+        dict: key -> working days
+    """
+    rows = [(key, _as_date(start), _as_date(end)) for key, start, end in rows]
+    if not rows:
+        return {}
+
+    keys, starts, ends = zip(*rows)
+    calendar = get_calendar(min(starts), max(ends))
+    return dict(zip(keys, calendar.count_many(starts, ends).tolist()))
+
+
+def refresh_leave_days(date_from, date_to):
+    """
+    Recompute the stored No_of_Days of leaves overlapping a date range.
+
+    Called after holidays change so stored counts stay correct.
+
+    Returns:
+        int: Number of leaves whose day count changed
+    """
+    from leaves.models import Leave_Record
+
+    leaves = (
+        Leave_Record.objects
+        .filter(Start_Date__lte=date_to, End_Date__gte=date_from)
+        .values_list('id', 'Start_Date', 'End_Date', 'No_of_Days')
+    )
+    current = {}
+    stored = {}
+    for leave_id, start, end, days in leaves.iterator(chunk_size=2000):
+        current[leave_id] = (start, end)
+        stored[leave_id] = days
+
+    counts = count_working_days((leave_id, start, end) for leave_id, (start, end) in current.items())
+    changed = [
+        Leave_Record(id=leave_id, No_of_Days=days)
+        for leave_id, days in counts.items()
+        if stored[leave_id] != days
+    ]
+    Leave_Record.objects.bulk_update(changed, ['No_of_Days'], batch_size=500)
+    return len(changed)